@@ -1,74 +1,171 @@
 import pandas as pd
 from blockchain_storage import Blockchain
+from ledger import LedgerLog
+from rule_engine import alert_messages
+from ingest import iter_frames
+from safe_io import write_json_atomic
+from itertools import chain
 import os
 import json
 
-# Initialize blockchain
-bc = Blockchain()
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_DIR = os.path.join(BASE_DIR, "outputs")
+
+# Shared alert chain: every domain appends blocks to the same ledger
+ALERT_LEDGER_DIR = os.path.join(OUTPUT_DIR, "alert_ledger")
+
+# Rows per block; also the CSV read chunk, so memory stays flat per domain
+BLOCK_SIZE = 1000
+
+# Sidecar next to the ledger: headers of the alert blocks it holds, so a
+# re-run only reads blocks appended since, never every transaction body
+BLOCK_INDEX_FILE = "alert_blocks.json"
 
 # List of retention files
 files = [
-    "outputs/retention_telecom.csv",
-    "outputs/retention_banking.csv",
-    "outputs/retention_ecommerce.csv"
+    os.path.join(OUTPUT_DIR, "retention_telecom.csv"),
+    os.path.join(OUTPUT_DIR, "retention_banking.csv"),
+    os.path.join(OUTPUT_DIR, "retention_ecommerce.csv")
 ]
 
 # Columns possible names for auto-detection
 possible_risk_cols = ["Risk_Level", "Risk", "Churn_Risk", "RiskCategory", "Risk_Category", "risk_level"]
 possible_retention_cols = ["Retention_Action", "RetentionStrategy", "Retention_Strategy", "Action", "retention_action"]
 
-for file in files:
+
+def _header(block):
+    return {k: v for k, v in block.items() if k != "transactions"}
+
+
+def recorded_blocks(ledger):
+    """(source file, Merkle root) -> header of the alert blocks already on the ledger.
+
+    Read from the ledger's block index; only blocks appended after the
+    index was saved (or all of them, if it no longer matches) are parsed.
+    """
+    path = os.path.join(ledger.directory, BLOCK_INDEX_FILE)
+    index = {"height": 0, "last_hash": None, "blocks": []}
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            index = json.load(f)
+
+    height = index["height"]
+    if height > len(ledger) or (height and ledger[height - 1].get("hash") != index["last_hash"]):
+        # The ledger was replaced or rolled back: rebuild from scratch
+        height, index["blocks"] = 0, []
+
+    recorded = {(block["source"], block["merkle_root"]): block for block in index["blocks"]}
+    for block in ledger.iter_range(height):
+        if "source" in block:
+            recorded[(block["source"], block["merkle_root"])] = _header(block)
+    return recorded
+
+
+def save_recorded_blocks(ledger, recorded):
+    """Write the block index for the ledger's current height."""
+    latest = ledger.latest()
+    write_json_atomic(os.path.join(ledger.directory, BLOCK_INDEX_FILE), {
+        "height": len(ledger),
+        "last_hash": latest.get("hash") if latest else None,
+        "blocks": list(recorded.values()),
+    })
+
+
+def log_domain_alerts(file, bc, block_size=BLOCK_SIZE, recorded=None):
+    """Stream one retention file into alerts CSV + one block per chunk of rows.
+
+    Chunks whose alerts are already on the ledger for this file (same
+    source, same Merkle root) reuse that block instead of adding another,
+    so re-running the pipeline does not duplicate the chain.
+    """
+    recorded = {} if recorded is None else recorded
+    source = os.path.basename(file)
+
     print(f"\n----------------------------------------")
     print(f"📌 Generating Alerts + Blockchain Logging for: {file}")
 
     # Extract domain name from filename
     domain = os.path.basename(file).split("_")[1].split(".")[0]  # telecom, banking, ecommerce
 
-    # Load retention file
-    df = pd.read_csv(file)
-    print(f"✅ Input file loaded successfully! Shape: {df.shape}")
+    alert_file = file.replace("retention", "alerts")
+    blockchain_file = os.path.join(os.path.dirname(file), f"blockchain_{domain}.jsonl")
+
+    rows = skipped = 0
 
-    # Auto-detect columns
-    risk_col = next((col for col in possible_risk_cols if col in df.columns), None)
-    retention_col = next((col for col in possible_retention_cols if col in df.columns), None)
+    # Auto-detect columns on the first chunk, before the old references
+    # file is replaced
+    frames = iter_frames(file, block_size)
+    first = next(frames, None)
+    columns = list(first.columns) if first is not None else []
+    risk_col = next((col for col in possible_risk_cols if col in columns), None)
+    retention_col = next((col for col in possible_retention_cols if col in columns), None)
 
     if not risk_col or not retention_col:
-        print(f"❌ ERROR: Required columns not found! Available columns: {list(df.columns)}")
-        continue
-
-    # Generate alerts
-    def alert_message(row):
-        risk_value = str(row[risk_col]).lower()
-        if risk_value in ["high", "critical"]:
-            return f"⚠️ ALERT: Customer at {row[risk_col]} risk. Suggested Action: {row[retention_col]}"
-        elif risk_value in ["medium"]:
-            return f"⚠️ CAUTION: Customer at {row[risk_col]} risk. Suggested Action: {row[retention_col]}"
-        else:
-            return f"✅ Customer at {row[risk_col]} risk. No immediate action needed."
-
-    df['Alert_Message'] = df.apply(alert_message, axis=1)
-
-    # Save alerts CSV
-    alert_file = file.replace("retention", "alerts")
-    df.to_csv(alert_file, index=False)
+        print(f"❌ ERROR: Required columns not found! Available columns: {columns}")
+        return None
+
+    with open(blockchain_file, "w") as refs:
+        for chunk_no, df in enumerate(chain([first], frames)):
+
+            # Generate alerts (vectorized over the chunk, see rule_engine.ALERT_RULES)
+            df['Alert_Message'] = alert_messages(df[risk_col], df[retention_col])
+
+            # Append alerts CSV chunk
+            df.to_csv(alert_file, mode="w" if chunk_no == 0 else "a", header=chunk_no == 0, index=False)
+
+            # Add each alert to blockchain (column-wise, no per-row Series)
+            id_col = next((col for col in ["RowNumber", "id"] if col in df.columns), None)
+            transactions = pd.DataFrame({
+                "Domain": domain,
+                "CustomerID": df[id_col] if id_col else "N/A",
+                "Risk_Level": df[risk_col],
+                "Retention_Action": df[retention_col],
+                "Alert_Message": df['Alert_Message']
+            })
+            bc.add_transactions(transactions.to_dict(orient="records"))
+
+            # One block per chunk, written straight to the shared ledger
+            block = recorded.get((source, bc.pending_root))
+            if block is not None:
+                bc.discard_pending()
+                skipped += 1
+            else:
+                block = bc.create_block(source=source)
+                recorded[(source, block["merkle_root"])] = _header(block)
+            refs.write(json.dumps({
+                "domain": domain,
+                "height": block["index"],
+                "hash": block["hash"],
+                "merkle_root": block["merkle_root"],
+                "transaction_count": block["transaction_count"]
+            }, separators=(",", ":")) + "\n")
+
+            rows += len(df)
+
+    print(f"✅ Input file processed successfully! Rows: {rows}")
+    if skipped:
+        print(f"📌 {skipped} block(s) already on the ledger, not appended again")
     print(f"✅ Alerts Saved Successfully: {alert_file}")
+    print(f"🎉 Blockchain Block References Saved Successfully: {blockchain_file}")
+    return blockchain_file
+
+
+def run_alert_pipeline(files=files, ledger_dir=ALERT_LEDGER_DIR, block_size=BLOCK_SIZE):
+
+    # Initialize blockchain on the shared append-only ledger
+    with LedgerLog(ledger_dir) as ledger:
+        bc = Blockchain(ledger)
+        recorded = recorded_blocks(ledger)
+
+        for file in files:
+            log_domain_alerts(file, bc, block_size=block_size, recorded=recorded)
+
+        ledger.flush()
+        save_recorded_blocks(ledger, recorded)
+
+    print("\n----------------------------------------\n")
+    print("✅ All Alerts + Blockchain Logging Completed Successfully!")
+
 
-    # Add each alert to blockchain
-    for _, row in df.iterrows():
-        transaction = {
-            "CustomerID": row.get("RowNumber", row.get("id", "N/A")),
-            "Risk_Level": row[risk_col],
-            "Retention_Action": row[retention_col],
-            "Alert_Message": row['Alert_Message']
-        }
-        bc.add_transaction(transaction)
-
-    # Create a new block for this domain
-    bc.create_block()
-    blockchain_file = f"outputs/blockchain_{domain}.json"
-    with open(blockchain_file, "w") as f:
-        json.dump(bc.chain, f, indent=4)
-    print(f"🎉 Blockchain Saved Successfully: {blockchain_file}")
-
-print("\n----------------------------------------\n")
-print("✅ All Alerts + Blockchain Logging Completed Successfully!")
+if __name__ == "__main__":
+    run_alert_pipeline()
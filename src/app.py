@@ -1,11 +1,36 @@
-import os
-import numpy as np
-import pandas as pd
+import time
+
+APP_IMPORT_START = time.perf_counter()
+
 import json
+import os
+import threading
 from datetime import datetime
-from flask import Flask, render_template, request, redirect, url_for, send_from_directory
-from tensorflow.keras.models import load_model
-import joblib
+from flask import (
+    Flask, Response, abort, g, jsonify, make_response, render_template, request, redirect,
+    send_from_directory, stream_with_context, url_for
+)
+
+import instrumentation
+from instrumentation import timed_iter, timer
+from startup import Warmup, lazy_import
+
+# Heavy modules (pandas, pyarrow, scikit-learn via the pickled scalers)
+# load on first use or during warm-up, not when app.py is imported
+pd = lazy_import("pandas")
+ingest = lazy_import("ingest")
+results_store = lazy_import("results_store")
+rule_engine = lazy_import("rule_engine")
+model_registry = lazy_import("model_registry")
+domain_router = lazy_import("domain_router")
+dataset_schema = lazy_import("dataset_schema")
+prediction_cache = lazy_import("prediction_cache")
+
+from ledger import open_ledger
+from blockchain_storage import append_record
+from job_queue import JobQueue, DONE
+from safe_io import atomic_path
+from dashboard_index import DashboardIndex
 
 # =====================================================
 # 🔥 PROJECT PATHS
@@ -13,29 +38,48 @@ import joblib
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-MODEL_PATH = os.path.join(BASE_DIR, "models", "combined_ann.keras")
-SCALER_PATH = os.path.join(BASE_DIR, "models", "combined_scaler.pkl")
-FEATURE_PATH = os.path.join(BASE_DIR, "models", "combined_features.pkl")
+MODEL_SET = "combined"
 BLOCKCHAIN_PATH = os.path.join(BASE_DIR, "blockchain", "ledger.json")
+LEDGER_DIR = os.path.join(BASE_DIR, "blockchain")
 UPLOAD_FOLDER = os.path.join(BASE_DIR, "uploads")
 
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-os.makedirs(os.path.dirname(BLOCKCHAIN_PATH), exist_ok=True)
+os.makedirs(LEDGER_DIR, exist_ok=True)
+
+BLOCKS_PER_PAGE = 50
+SCORE_CHUNK_ROWS = 5000
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+# ID of API results when the records carry no customer ID column
+ROW_COLUMN = "Row"
+
+# "lazy": import fast, warm up in the background once serving (default)
+# "eager": load everything while app.py is imported
+STARTUP_MODE = os.environ.get("CHURN_STARTUP", "lazy")
 
 # =====================================================
-# 🔥 LOAD MODEL SAFELY
+# 🔥 LOAD MODEL SAFELY (shared, hot-reloading registry)
 # =====================================================
 
-try:
-    model = load_model(MODEL_PATH)
-    scaler = joblib.load(SCALER_PATH)
-    features = joblib.load(FEATURE_PATH)
-    print("✅ Model Loaded Successfully")
-except Exception as e:
-    print("❌ Model Loading Failed:", e)
-    model = None
-    scaler = None
-    features = []
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router():
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = domain_router.DomainRouter(model_registry.get_registry(), fallback=MODEL_SET,
+                                                 cache=prediction_cache.get_prediction_cache())
+    return _router
+
+
+def load_artifacts():
+    try:
+        return model_registry.get_registry().get(MODEL_SET)
+    except Exception as e:
+        print("❌ Model Loading Failed:", e)
+        return None
 
 # =====================================================
 # 🔥 FLASK APP
@@ -44,50 +88,129 @@ except Exception as e:
 app = Flask(__name__)
 app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
 
+# Uploads are scored in the background, at most one job per CPU core
+jobs = JobQueue()
+
 # =====================================================
-# 🔥 RISK CLASSIFICATION
+# 🔥 BLOCKCHAIN FUNCTIONS
 # =====================================================
 
-def get_risk_level(prob):
-    if prob >= 0.7:
-        return "High"
-    elif prob >= 0.4:
-        return "Medium"
+def get_ledger():
+    # Append-only ledger; legacy ledger.json is migrated on first open
+    return open_ledger(LEDGER_DIR, legacy_json=BLOCKCHAIN_PATH)
+
+
+_dashboard_index = None
+
+
+def get_dashboard_index():
+    global _dashboard_index
+    if _dashboard_index is None:
+        _dashboard_index = DashboardIndex(get_ledger())
+    return _dashboard_index
+
+
+def get_summary():
+    # O(1) when nothing was appended since the last page view
+    return get_dashboard_index().refresh()
+
+
+def cached_page(etag, render):
+    """Answer 304 when the client already has ``etag``; otherwise render.
+
+    Validators come from the summary index, so a repeat poll skips
+    template rendering entirely.
+    """
+    last_modified = get_dashboard_index().last_modified()
+
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
     else:
-        return "Low"
+        response = make_response(render())
+
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response
 
 # =====================================================
-# 🔥 PERSONALIZED RETENTION STRATEGY
+# 🔥 WARM-UP + READINESS
 # =====================================================
 
-def get_retention_strategy(prob, row):
-    if prob >= 0.7:
-        if hasattr(row, "MonthlyCharges") and row.MonthlyCharges > 80:
-            return "Offer 25% Discount + Dedicated Support Call"
-        elif hasattr(row, "Contract") and row.Contract == "Month-to-month":
-            return "Offer 1-Year Contract Upgrade with Discount"
-        else:
-            return "Immediate Retention Team Intervention"
+def warm_modules():
+    # First attribute access executes a lazily imported module
+    for module in (pd, ingest, results_store, rule_engine, domain_router):
+        getattr(module, "__name__")
 
-    elif prob >= 0.4:
-        return "Send Loyalty Points + Targeted Promotion Email"
 
-    else:
-        return "Upsell Premium Plan + Appreciation Offer"
+def warm_model():
+    if load_artifacts() is None:
+        raise RuntimeError("Model not loaded properly.")
+    print("✅ Model Loaded Successfully")
+
+    # One forward pass so the first real request finds the engine hot
+    engine = model_registry.get_registry().engine(MODEL_SET)
+    engine.predict_proba([[0.0] * engine.n_features])
+
+
+def warm_domain_models():
+    router = get_router()
+    for domain in router.domain_models:
+        router.artifacts(domain)
+
+
+warmup = Warmup([
+    ("modules", warm_modules),
+    ("model", warm_model),
+    ("domain_models", warm_domain_models),
+    ("dashboard", get_summary),
+], started=APP_IMPORT_START)
+
+
+@app.before_request
+def start_warmup():
+    # Servers that import app.py (e.g. WSGI) warm up on the first request
+    warmup.start()
+
 
 # =====================================================
-# 🔥 BLOCKCHAIN FUNCTIONS
+# 🔥 METRICS (CHURN_METRICS=1)
 # =====================================================
 
-def load_blockchain():
-    if os.path.exists(BLOCKCHAIN_PATH):
-        with open(BLOCKCHAIN_PATH, "r") as f:
-            return json.load(f)
-    return []
+@app.before_request
+def begin_request_trace():
+    if request.endpoint not in ("metrics", "static"):
+        g.trace = instrumentation.begin_trace("request", method=request.method, path=request.path)
+
+
+@app.after_request
+def end_request_trace(response):
+    trace = g.pop("trace", None)
+    if trace is not None:
+        instrumentation.end_trace(
+            trace,
+            {"endpoint": request.endpoint or "-", "status": response.status_code},
+            bytes=response.content_length
+        )
+    return response
+
+
+@app.route("/metrics")
+def metrics():
+    """Prometheus text exposition of the stage / request / job metrics."""
+    if not instrumentation.ENABLED:
+        return Response("# metrics disabled: set CHURN_METRICS=1\n", status=404, mimetype="text/plain")
+    return Response(instrumentation.metrics.render(), mimetype="text/plain; version=0.0.4")
 
-def save_blockchain(data):
-    with open(BLOCKCHAIN_PATH, "w") as f:
-        json.dump(data, f, indent=4)
+
+@app.route("/api/v1/ready")
+def readiness():
+    """200 once the model and domain models are loaded, 503 until then."""
+    status = warmup.status()
+    status["mode"] = STARTUP_MODE
+    status["import_seconds"] = IMPORT_SECONDS
+    return jsonify(status), 200 if warmup.ready else 503
 
 # =====================================================
 # 🔥 LANDING PAGE
@@ -103,27 +226,29 @@ def landing():
 
 @app.route("/dashboard")
 def dashboard():
-    blockchain = load_blockchain()
+    summary = get_summary()
+
+    latest = summary["latest"] or {
+        "total_customers": 0,
+        "high_risk": 0,
+        "medium_risk": 0,
+        "low_risk": 0,
+        "timestamp": "-"
+    }
 
-    if len(blockchain) > 0:
-        latest = blockchain[-1]
-    else:
-        latest = {
-            "total_customers": 0,
-            "high_risk": 0,
-            "medium_risk": 0,
-            "low_risk": 0,
-            "timestamp": "-"
-        }
-
-    return render_template(
-        "dashboard.html",
-        total_uploads=len(blockchain),
-        total_customers=latest["total_customers"],
-        high_risk=latest["high_risk"],
-        medium_risk=latest["medium_risk"],
-        low_risk=latest["low_risk"],
-        last_updated=latest["timestamp"]
+    return cached_page(
+        f'dashboard-{summary["height"]}',
+        lambda: render_template(
+            "dashboard.html",
+            total_uploads=summary["total_uploads"],
+            total_customers=latest["total_customers"],
+            high_risk=latest["high_risk"],
+            medium_risk=latest["medium_risk"],
+            low_risk=latest["low_risk"],
+            last_updated=latest["timestamp"],
+            cumulative=summary["cumulative"],
+            recent_days=sorted(summary["per_day"].items(), reverse=True)[:7]
+        )
     )
 
 # =====================================================
@@ -138,10 +263,105 @@ def upload_page():
 # 🔥 PREDICTION ENGINE
 # =====================================================
 
+def score_upload(df):
+    """Add Probability / Prediction / Risk / Strategy columns to an upload."""
+    # Each row is scored by its domain's model in one batch per domain;
+    # rows no domain model matches fall back to the combined model
+    probs, domains = get_router().predict_proba(df)
+
+    df["Probability"] = probs
+    df["Prediction"] = (probs >= 0.5).astype(int)
+    with timer("risk_rules", rows=len(df)):
+        df["Risk"] = rule_engine.risk_levels(probs)
+    with timer("retention_rules", rows=len(df)):
+        df["Strategy"] = rule_engine.retention_strategies(df, probs, domain=domains)
+    return df
+
+
+def run_scoring_job(job_id, progress, source, filename):
+    """Background job: score an upload chunk by chunk and log it to the ledger.
+
+    ``source`` is the spooled upload: raw bytes or a path inside the job folder.
+    """
+    trace = instrumentation.begin_trace("job", job_id=job_id, file=filename)
+    try:
+        summary = _score_job(job_id, progress, source, filename)
+    except Exception as e:
+        instrumentation.end_trace(trace, {"name": "score", "outcome": "failed"}, error=str(e))
+        raise
+    instrumentation.end_trace(trace, {"name": "score", "outcome": "done"},
+                              rows=summary["total_customers"])
+    return summary
+
+
+def _score_job(job_id, progress, source, filename):
+    if load_artifacts() is None:
+        raise RuntimeError("Model not loaded properly.")
+
+    writer = results_store.ResultWriter(job_id)
+    high_risk_ids = []
+
+    try:
+        for chunk in timed_iter("parse_csv", ingest.iter_frames(source, SCORE_CHUNK_ROWS)):
+            scored = score_upload(chunk)
+            with timer("write_result", rows=len(scored)):
+                writer.write(scored)
+            high_risk_ids.extend(scored.loc[scored["Risk"] == "High", writer.id_column].tolist())
+            progress(len(scored))
+    except Exception:
+        writer.abort()
+        raise
+
+    if writer.rows == 0:
+        writer.abort()
+        raise ValueError("Uploaded file has no rows.")
+
+    summary = writer.close(filename)
+
+    # Blockchain Logging
+    record = {
+        "file": filename,
+        "job_id": job_id,
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "total_customers": summary["total_customers"],
+        "high_risk": summary["high_risk"],
+        "medium_risk": summary["medium_risk"],
+        "low_risk": summary["low_risk"],
+        "high_risk_ids": high_risk_ids
+    }
+
+    with timer("ledger_append"):
+        append_record(get_ledger(), record)
+    with timer("dashboard_refresh"):
+        get_dashboard_index().refresh()
+    return summary
+
+
+def submit_upload(file):
+    """Spool an upload for a fresh job and queue it for scoring.
+
+    Small uploads are handed to the job in memory; larger ones are written
+    into the job's own folder (temp file + rename), never a shared path.
+    """
+    job_id = results_store.new_job_id()
+
+    if request.content_length is not None and request.content_length <= SPOOL_MAX_BYTES:
+        source = file.read()
+    else:
+        folder = results_store.job_dir(job_id)
+        os.makedirs(folder, exist_ok=True)
+        # CSV, gzip CSV or Parquet: ingest tells them apart by content
+        source = os.path.join(folder, "upload")
+        with atomic_path(source) as tmp_path:
+            file.save(tmp_path)
+
+    return jobs.submit(run_scoring_job, source, file.filename, job_id=job_id, file=file.filename)
+
+
 @app.route("/predict", methods=["POST"])
 def predict():
 
-    if model is None:
+    if load_artifacts() is None:
         return "Model not loaded properly."
 
     if "file" not in request.files:
@@ -152,85 +372,171 @@ def predict():
     if file.filename == "":
         return "No selected file."
 
-    filepath = os.path.join(app.config["UPLOAD_FOLDER"], file.filename)
-    file.save(filepath)
+    job_id = submit_upload(file)
 
-    df_original = pd.read_csv(filepath)
-    df = df_original.copy()
+    return redirect(url_for("job_page", job_id=job_id))
 
-    # Feature Engineering
-    df = df.fillna(0)
-    df = pd.get_dummies(df)
+# =====================================================
+# 🔥 JOB STATUS
+# =====================================================
 
-    # Align with training features
-    for col in features:
-        if col not in df.columns:
-            df[col] = 0
+def _job_or_404(job_id):
+    status = jobs.status(job_id)
+    if status is None:
+        abort(404)
+    return status
 
-    df = df[features]
 
-    # Scale
-    X_scaled = scaler.transform(df)
+@app.route("/jobs/<job_id>")
+def job_page(job_id):
+    status = _job_or_404(job_id)
+    if status["state"] == DONE:
+        return redirect(url_for("results_page", job_id=job_id))
+    return render_template("job_status.html", job=status)
 
-    # Predict
-    probs = model.predict(X_scaled).flatten()
-    predictions = (probs >= 0.5).astype(int)
 
-    # Add Results
-    df_original["Probability"] = probs
-    df_original["Prediction"] = predictions
-    df_original["Risk"] = [get_risk_level(p) for p in probs]
-    df_original["Strategy"] = [
-        get_retention_strategy(p, row)
-        for p, row in zip(probs, df_original.itertuples())
-    ]
+@app.route("/api/v1/jobs", methods=["POST"])
+def api_submit_job():
+    if load_artifacts() is None:
+        return jsonify(error="Model not loaded properly."), 503
 
-    # Save Result File
-    result_file = "prediction_result.csv"
-    result_path = os.path.join(UPLOAD_FOLDER, result_file)
-    df_original.to_csv(result_path, index=False)
+    file = request.files.get("file")
+    if file is None or file.filename == "":
+        return jsonify(error="Send a CSV / gzip CSV / Parquet 'file'."), 400
 
-    # High Risk Customers
-    high_risk_df = df_original[df_original["Risk"] == "High"]
+    job_id = submit_upload(file)
+    return jsonify(
+        job_id=job_id,
+        status_url=url_for("api_job_status", job_id=job_id),
+        results_url=url_for("api_results", job_id=job_id)
+    ), 202
 
-    # Blockchain Logging
-    blockchain = load_blockchain()
 
-    record = {
-        "file": file.filename,
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "total_customers": len(df_original),
-        "high_risk": int(sum(df_original["Risk"] == "High")),
-        "medium_risk": int(sum(df_original["Risk"] == "Medium")),
-        "low_risk": int(sum(df_original["Risk"] == "Low")),
-        "high_risk_ids": high_risk_df.iloc[:, 0].tolist()
-    }
+@app.route("/api/v1/jobs/<job_id>")
+def api_job_status(job_id):
+    return jsonify(_job_or_404(job_id))
 
-    blockchain.append(record)
-    save_blockchain(blockchain)
+# =====================================================
+# 🔥 RESULT PAGES (paginated, read from the job's Parquet)
+# =====================================================
 
-    return render_template(
-        "results.html",
-        customers=df_original.to_dict(orient="records"),
-        high_risk=high_risk_df.to_dict(orient="records"),
-        result_file=result_file
+def _page_args():
+    return dict(
+        page=request.args.get("page", 1, type=int),
+        per_page=request.args.get("per_page", results_store.PAGE_SIZE, type=int),
+        risk=request.args.get("risk"),
+        sort=request.args.get("sort", "probability"),
+        order=request.args.get("order", "desc"),
     )
 
+
+def _load_page(job_id):
+    try:
+        return results_store.load_page(job_id, **_page_args())
+    except KeyError:
+        abort(404)
+
+
+@app.route("/results/<job_id>")
+def results_page(job_id):
+    status = jobs.status(job_id)
+    if status is not None and status["state"] != DONE:
+        return redirect(url_for("job_page", job_id=job_id))
+    return render_template("results.html", **_load_page(job_id))
+
+
+@app.route("/results/<job_id>/download")
+def download_result(job_id):
+    try:
+        summary = results_store.load_summary(job_id)
+    except KeyError:
+        abort(404)
+
+    name = os.path.splitext(summary["file"])[0] or "prediction"
+    return Response(
+        stream_with_context(results_store.iter_csv(job_id)),
+        mimetype="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={name}_result.csv"}
+    )
+
+# =====================================================
+# 🔥 JSON API
+# =====================================================
+
+def _wants_ndjson():
+    if request.args.get("format") == "ndjson":
+        return True
+    return request.accept_mimetypes.best == "application/x-ndjson"
+
+
+def _records(df):
+    # NaN is not valid JSON; emit null instead
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+@app.route("/api/v1/score", methods=["POST"])
+def api_score():
+    """Score a CSV upload (``file``) or a JSON list of records.
+
+    Returns JSON by default, or NDJSON (one result per line, streamed)
+    with ``?format=ndjson`` / ``Accept: application/x-ndjson``.
+    """
+    if load_artifacts() is None:
+        return jsonify(error="Model not loaded properly."), 503
+
+    if "file" in request.files:
+        with timer("parse_csv") as t:
+            df = ingest.read_table(request.files["file"])
+            t.rows = len(df)
+    else:
+        payload = request.get_json(silent=True)
+        if isinstance(payload, dict):
+            payload = payload.get("records")
+        if not isinstance(payload, list) or not payload:
+            return jsonify(error="Send a CSV 'file' or a JSON list of records."), 400
+        with timer("parse_json", rows=len(payload)):
+            df = pd.DataFrame(payload)
+
+    # JSON key order is up to the client: find the ID by name, else number the rows
+    id_column = dataset_schema.find_id_column(df.columns)
+    if id_column is None:
+        id_column = ROW_COLUMN
+        df.insert(0, ROW_COLUMN, range(1, len(df) + 1))
+    df = score_upload(df)
+    results = df[[id_column] + results_store.RESULT_COLUMNS]
+
+    if _wants_ndjson():
+        def generate(batch_rows=1000):
+            for start in range(0, len(results), batch_rows):
+                batch = _records(results.iloc[start:start + batch_rows])
+                yield "".join(json.dumps(row, default=str) + "\n" for row in batch)
+
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+    with timer("serialize", rows=len(results)):
+        return jsonify(
+            model=MODEL_SET,
+            count=len(results),
+            results=_records(results)
+        )
+
+
+@app.route("/api/v1/results/<job_id>")
+def api_results(job_id):
+    return jsonify(_load_page(job_id))
+
 # =====================================================
 # 🔥 ALERT PAGE
 # =====================================================
 
 @app.route("/alerts")
 def alerts_page():
-    blockchain = load_blockchain()
+    summary = get_summary()
 
-    if len(blockchain) > 0:
-        latest = blockchain[-1]
-        high_risk_ids = latest.get("high_risk_ids", [])
-    else:
-        high_risk_ids = []
-
-    return render_template("alerts.html", high_risk_ids=high_risk_ids)
+    return cached_page(
+        f'alerts-{summary["height"]}',
+        lambda: render_template("alerts.html", high_risk_ids=summary["latest_high_risk_ids"])
+    )
 
 # =====================================================
 # 🔥 BLOCKCHAIN PAGE
@@ -238,8 +544,24 @@ def alerts_page():
 
 @app.route("/blockchain")
 def blockchain_page():
-    blockchain = load_blockchain()
-    return render_template("blockchain.html", blockchain=blockchain)
+    ledger = get_ledger()
+    total = get_summary()["height"]
+
+    # Page 1 = newest blocks; only the requested window is read from disk
+    page = max(request.args.get("page", 1, type=int), 1)
+    stop = max(total - (page - 1) * BLOCKS_PER_PAGE, 0)
+    start = max(stop - BLOCKS_PER_PAGE, 0)
+
+    return cached_page(
+        f"blockchain-{total}-{page}",
+        lambda: render_template(
+            "blockchain.html",
+            blockchain=ledger[start:stop],
+            page=page,
+            has_newer=page > 1,
+            has_older=start > 0
+        )
+    )
 
 # =====================================================
 # 🔥 RETENTION PAGE
@@ -265,5 +587,14 @@ def download_file(filename):
 # 🔥 RUN SERVER
 # =====================================================
 
+IMPORT_SECONDS = round(time.perf_counter() - APP_IMPORT_START, 3)
+print(f"🚀 app.py imported in {IMPORT_SECONDS:.2f}s (startup mode: {STARTUP_MODE})")
+
+if STARTUP_MODE == "eager":
+    warmup.run()
+
 if __name__ == "__main__":
+    # The debug reloader runs the app in a child process; warm up only there
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        warmup.start()
     app.run(debug=True)
\ No newline at end of file
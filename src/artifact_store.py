@@ -0,0 +1,253 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from ingest import read_table
+
+
+# ==========================================================
+# 🔥 STAGE ARTIFACT STORE
+# ==========================================================
+#
+# Pipeline stages hand data to each other through typed columnar files
+# (Parquet / Feather, or memory-mapped .npy for dense float matrices)
+# instead of CSV, so downstream stages skip parsing and type inference.
+#
+# Each stage run lives under  <root>/<stage>/<key>/  where the key is a
+# content hash of the stage's input files plus its parameters. A stage
+# whose key already has a manifest is skipped and its outputs reused.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(BASE_DIR, "outputs", ".stage_cache")
+
+MANIFEST_FILE = "manifest.json"
+HASH_INDEX_FILE = "file_hashes.json"
+PARTITION_SCHEMA_FILE = "_schema.json"
+
+
+# ------------------------------------------------------
+# Typed frame I/O (dispatch on extension)
+# ------------------------------------------------------
+
+def _arrow_safe(df):
+    # Arrow needs one type per column: object columns mixing numbers and
+    # strings (e.g. "Yes"/"No" next to 0/1) are stored as strings, NaN kept
+    mixed = [
+        col for col in df.select_dtypes(include=["object"]).columns
+        if pd.api.types.infer_dtype(df[col], skipna=True).startswith("mixed")
+    ]
+    if not mixed:
+        return df
+    df = df.copy()
+    for col in mixed:
+        df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def write_frame(df, path):
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == ".parquet":
+        _arrow_safe(df).to_parquet(path, index=False)
+    elif ext == ".feather":
+        _arrow_safe(df).reset_index(drop=True).to_feather(path)
+    elif ext == ".npy":
+        np.save(path, df.to_numpy(dtype=np.float32))
+        with open(path + ".columns.json", "w") as f:
+            json.dump([str(c) for c in df.columns], f)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def write_partitions(parts, path, dtypes=None):
+    """Write {partition name: frame} as one Parquet file per partition.
+
+    Each partition keeps only its own columns, so sparse unions (one
+    domain's columns empty for the others) cost nothing on disk.
+    ``dtypes`` (column -> dtype) restores the union's types on read.
+    """
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+
+    columns = []
+    for name, df in parts.items():
+        _arrow_safe(df).to_parquet(os.path.join(path, f"{name}.parquet"), index=False)
+        columns += [c for c in df.columns if c not in columns]
+
+    with open(os.path.join(path, PARTITION_SCHEMA_FILE), "w") as f:
+        json.dump({
+            "partitions": list(parts),
+            "columns": columns,
+            "dtypes": {c: str(dtypes[c]) for c in columns if dtypes and c in dtypes},
+        }, f, indent=4)
+    return path
+
+
+def read_partitions(path, columns=None, partitions=None):
+    """Read a partitioned directory back as one frame (missing columns -> NaN)."""
+    with open(os.path.join(path, PARTITION_SCHEMA_FILE), "r") as f:
+        schema = json.load(f)
+
+    wanted = columns or schema["columns"]
+    frames = []
+    for name in partitions or schema["partitions"]:
+        part_path = os.path.join(path, f"{name}.parquet")
+        available = set(pq.read_schema(part_path).names)
+        frames.append(pd.read_parquet(part_path, columns=[c for c in wanted if c in available]))
+
+    df = pd.concat(frames, ignore_index=True).reindex(columns=wanted)
+
+    # Concatenating partitions widens categories / ints; restore declared types
+    for col, dtype in schema["dtypes"].items():
+        if col not in df.columns:
+            continue
+        if dtype == "category":
+            df[col] = df[col].astype("category")
+        elif dtype.startswith("int") and df[col].isna().any():
+            df[col] = df[col].astype("float32")
+        else:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def read_frame(path, columns=None):
+    if os.path.isdir(path):
+        return read_partitions(path, columns=columns)
+
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == ".parquet":
+        return pd.read_parquet(path, columns=columns)
+    if ext == ".feather":
+        return pd.read_feather(path, columns=columns)
+    if ext == ".npy":
+        matrix = np.load(path, mmap_mode="r")
+        with open(path + ".columns.json", "r") as f:
+            names = json.load(f)
+        df = pd.DataFrame(matrix, columns=names, copy=False)
+        return df[columns] if columns else df
+    # CSV / gzip CSV, any delimiter (pyarrow reader)
+    return read_table(path, columns=columns)
+
+
+# ------------------------------------------------------
+# Store
+# ------------------------------------------------------
+
+class ArtifactStore:
+    """Content-addressed cache of pipeline stage outputs."""
+
+    def __init__(self, root=CACHE_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._hash_index_path = os.path.join(root, HASH_INDEX_FILE)
+        self._hash_index = self._load_hash_index()
+        self._lock = threading.Lock()
+
+    def _load_hash_index(self):
+        if os.path.exists(self._hash_index_path):
+            with open(self._hash_index_path, "r") as f:
+                return json.load(f)
+        return {}
+
+    def _save_hash_index(self):
+        tmp_path = self._hash_index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._hash_index, f)
+        os.replace(tmp_path, self._hash_index_path)
+
+    def file_hash(self, path):
+        """SHA256 of a file, re-hashed only when its size or mtime changes.
+
+        A directory (partitioned dataset) hashes to the digest of its
+        files' names and hashes.
+        """
+        path = os.path.abspath(path)
+        if os.path.isdir(path):
+            listing = [
+                f"{name}:{self.file_hash(os.path.join(path, name))}"
+                for name in sorted(os.listdir(path))
+            ]
+            return hashlib.sha256("\n".join(listing).encode()).hexdigest()
+
+        stat = os.stat(path)
+        stamp = [stat.st_mtime_ns, stat.st_size]
+
+        with self._lock:
+            cached = self._hash_index.get(path)
+            if cached and cached["stamp"] == stamp:
+                return cached["sha256"]
+
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(block)
+        digest = sha.hexdigest()
+
+        with self._lock:
+            self._hash_index[path] = {"stamp": stamp, "sha256": digest}
+            self._save_hash_index()
+        return digest
+
+    def key(self, stage, inputs=(), params=None):
+        """Fingerprint of a stage: input file contents + parameters."""
+        payload = {
+            "stage": stage,
+            "inputs": [self.file_hash(p) for p in inputs],
+            "params": params or {},
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()[:16]
+
+    def stage_dir(self, stage, key):
+        return os.path.join(self.root, stage, key)
+
+    def lookup(self, stage, key):
+        """Return the cached outputs {name: path} for a key, or None."""
+        manifest_path = os.path.join(self.stage_dir(stage, key), MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return None
+
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+
+        outputs = {
+            name: os.path.join(self.stage_dir(stage, key), filename)
+            for name, filename in manifest["outputs"].items()
+        }
+        if not all(os.path.exists(p) for p in outputs.values()):
+            return None
+        return outputs
+
+    def run(self, stage, build, outputs, inputs=(), params=None, force=False):
+        """Run ``build(paths)`` unless a run with identical inputs/params is cached.
+
+        ``outputs`` maps output names to file names (their extension picks the
+        format). ``build`` receives {name: path} and must write every file.
+        """
+        key = self.key(stage, inputs, params)
+
+        cached = None if force else self.lookup(stage, key)
+        if cached is not None:
+            print(f"⏭ Stage '{stage}' unchanged — reusing cached outputs ({key})")
+            return cached
+
+        stage_dir = self.stage_dir(stage, key)
+        shutil.rmtree(stage_dir, ignore_errors=True)
+        os.makedirs(stage_dir)
+
+        paths = {name: os.path.join(stage_dir, filename) for name, filename in outputs.items()}
+        build(paths)
+
+        manifest = {"stage": stage, "key": key, "params": params or {}, "outputs": outputs}
+        with open(os.path.join(stage_dir, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=4, default=str)
+
+        return paths
@@ -0,0 +1,318 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from synthetic_data import SEED, generate_domain, write_datasets, write_domain
+
+
+# ==========================================================
+# 🔥 BENCHMARK SUITE
+# ==========================================================
+#
+# Times the hot paths on seeded synthetic data (synthetic_data.py) at one
+# or more sizes (rows per domain):
+#   combine          create_combined_dataset       (3 domain files -> partitions)
+#   preprocess       preprocess_combined           (encode + scale)
+#   select_features  select_features               (mutual information)
+#   align            build_model_input             (upload -> model matrix)
+#   predict          predict_churn                 (CSV in -> CSV out)
+#   rules            risk / retention / alert rules
+#   ledger_append    append_record                 (hash-chained ledger)
+#
+# Each run is written to outputs/benchmarks/<timestamp>.json. With a
+# baseline (--baseline, or baseline.json from --save-baseline) a case is a
+# regression when its best time exceeds the baseline's by more than
+# ``threshold`` (and by more than NOISE_FLOOR_SECONDS); the exit code is 1.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(BASE_DIR, "outputs", "benchmarks")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+CASES = ("combine", "preprocess", "select_features", "align", "predict", "rules", "ledger_append")
+
+REGRESSION_THRESHOLD = 0.20
+NOISE_FLOOR_SECONDS = 0.05
+
+# Ledger appends are per record, not per row: cap them so 10M stays sane
+MAX_LEDGER_RECORDS = 20_000
+PREDICT_CHUNK_ROWS = 100_000
+
+
+# ==========================================================
+# 🔥 CASES
+# ==========================================================
+#
+# Each case takes the run context and returns the number of rows it
+# processed. ``setup`` work done inside a case is not separated out;
+# inputs come from earlier cases or from the generated files.
+
+def case_combine(ctx):
+    from create_combined_dataset import create_combined_dataset
+
+    create_combined_dataset(dataset_dir=ctx["data_dir"], save_path=ctx["combined"])
+    return 3 * ctx["rows"]
+
+
+def case_preprocess(ctx):
+    from preprocess import preprocess_combined
+
+    df = preprocess_combined(ctx["combined"], ctx["preprocessed"],
+                             transformer_path=os.path.join(ctx["work"], "transformer.pkl"))
+    return len(df)
+
+
+def case_select_features(ctx):
+    from feature_selection import select_features
+
+    # No MI cache: repeated runs on the same seeded data would only measure lookups
+    select_features(ctx["preprocessed"], ctx["selected"], mi_mode=ctx["mi_mode"],
+                    error_budget=ctx["error_budget"], cache_path=None)
+    return 3 * ctx["rows"]
+
+
+def case_align(ctx):
+    from feature_transformer import build_model_input
+    from model_registry import get_registry
+
+    artifacts = get_registry().get("combined")
+    _, X = build_model_input(ctx["upload_frame"], artifacts)
+    return len(X)
+
+
+def case_predict(ctx):
+    from predict import predict_churn
+
+    # No prediction cache: repeats would time lookups, and synthetic rows
+    # do not belong in the real cache
+    predict_churn(ctx["upload"], os.path.join(ctx["work"], "predicted.csv"),
+                  chunksize=PREDICT_CHUNK_ROWS if ctx["rows"] > PREDICT_CHUNK_ROWS else None,
+                  use_cache=False)
+    return ctx["rows"]
+
+
+def case_rules(ctx):
+    from rule_engine import alert_messages, retention_strategies, risk_levels
+
+    df = ctx["upload_frame"]
+    probs = np.random.default_rng(SEED).random(len(df))
+    risk = risk_levels(probs)
+    strategies = retention_strategies(df, probs, domain="Telecom")
+    alert_messages(risk, strategies)
+    return len(df)
+
+
+def case_ledger_append(ctx):
+    from blockchain_storage import append_record
+    from ledger import LedgerLog
+
+    n = min(ctx["rows"], MAX_LEDGER_RECORDS)
+    ledger_dir = os.path.join(ctx["work"], "ledger")
+    shutil.rmtree(ledger_dir, ignore_errors=True)
+
+    with LedgerLog(ledger_dir) as ledger:
+        for i in range(n):
+            append_record(ledger, {"file": "bench.csv", "row": i, "high_risk": i % 7})
+    return n
+
+
+# Cases that read another case's output
+REQUIRES = {
+    "preprocess": "combine",
+    "select_features": "preprocess",
+}
+
+CASE_FUNCS = {
+    "combine": case_combine,
+    "preprocess": case_preprocess,
+    "select_features": case_select_features,
+    "align": case_align,
+    "predict": case_predict,
+    "rules": case_rules,
+    "ledger_append": case_ledger_append,
+}
+
+
+# ==========================================================
+# 🔥 RUNNER
+# ==========================================================
+
+def _timed(fn, ctx, repeat, verbose):
+    seconds, rows = [], 0
+    for _ in range(repeat):
+        sink = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        with sink:
+            start = time.perf_counter()
+            rows = fn(ctx)
+            seconds.append(time.perf_counter() - start)
+    best = min(seconds)
+    return {
+        "rows": int(rows),
+        "best_seconds": round(best, 4),
+        "median_seconds": round(statistics.median(seconds), 4),
+        "rows_per_sec": round(rows / best, 1) if best > 0 else None,
+        "repeat": repeat,
+    }
+
+
+def prepare(work, n_rows, seed=SEED):
+    """Generate the synthetic inputs for one size; returns the run context."""
+    data_dir = os.path.join(work, "datasets")
+    write_datasets(data_dir, n_rows, seed=seed)
+
+    # Uploads are comma-separated raw telecom rows, like uploads/sample.csv
+    upload = write_domain("Telecom", n_rows, os.path.join(work, "upload.csv"), seed=seed + 1, sep=",")
+
+    return {
+        "work": work,
+        "rows": n_rows,
+        "data_dir": data_dir,
+        "combined": os.path.join(work, "combined_data"),
+        "preprocessed": os.path.join(work, "preprocessed.parquet"),
+        "selected": os.path.join(work, "selected.parquet"),
+        "upload": upload,
+        "upload_frame": generate_domain("Telecom", min(n_rows, 1_000_000), seed + 1),
+    }
+
+
+def run_benchmarks(sizes=("10k",), cases=CASES, repeat=3, seed=SEED, mi_mode="auto",
+                   error_budget=None, verbose=False, keep=False):
+    results = {}
+
+    for size in sizes:
+        n_rows = SIZES[size] if size in SIZES else int(size)
+        work = tempfile.mkdtemp(prefix=f"churn-bench-{size}-")
+        print(f"\n📌 Benchmark size {size} ({n_rows:,} rows per domain) in {work}")
+
+        try:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                ctx = prepare(work, n_rows, seed)
+            print(f"   generated data in {time.perf_counter() - start:.2f}s")
+            ctx.update(mi_mode=mi_mode, error_budget=error_budget)
+
+            results[size] = {}
+            done = set()
+            for case in cases:
+                # Produce missing inputs untimed when a case runs without its producer
+                chain, needed = [], REQUIRES.get(case)
+                while needed and needed not in done:
+                    chain.insert(0, needed)
+                    needed = REQUIRES.get(needed)
+                for prerequisite in chain:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        CASE_FUNCS[prerequisite](ctx)
+                    done.add(prerequisite)
+
+                results[size][case] = result = _timed(CASE_FUNCS[case], ctx, repeat, verbose)
+                done.add(case)
+                print(f"   {case:<16} {result['best_seconds']:>9.3f}s  "
+                      f"{result['rows_per_sec'] or 0:>14,.0f} rows/sec")
+        finally:
+            if not keep:
+                shutil.rmtree(work, ignore_errors=True)
+
+    return {
+        "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "params": {"seed": seed, "repeat": repeat, "mi_mode": mi_mode, "error_budget": error_budget},
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=REGRESSION_THRESHOLD):
+    """List the (size, case, baseline s, current s) that got slower than allowed."""
+    regressions = []
+    for size, cases in current["results"].items():
+        for case, result in cases.items():
+            before = baseline.get("results", {}).get(size, {}).get(case)
+            if before is None:
+                continue
+            old, new = before["best_seconds"], result["best_seconds"]
+            if new > old * (1 + threshold) and new - old > NOISE_FLOOR_SECONDS:
+                regressions.append((size, case, old, new))
+    return regressions
+
+
+def save_run(run, bench_dir=BENCH_DIR):
+    os.makedirs(bench_dir, exist_ok=True)
+    path = os.path.join(bench_dir, datetime.now().strftime("bench-%Y%m%d-%H%M%S.json"))
+    with open(path, "w") as f:
+        json.dump(run, f, indent=2)
+    return path
+
+
+# ==========================================================
+# 🔥 RUN
+# ==========================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the churn pipeline hot paths on synthetic data")
+    parser.add_argument("--sizes", nargs="+", default=["10k"],
+                        help=f"Rows per domain: {', '.join(SIZES)} or a number")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case (best time is compared)")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--mi-mode", default="auto", help="MI estimator for select_features")
+    parser.add_argument("--mi-error-budget", type=float, default=None)
+    parser.add_argument("--baseline", default=None,
+                        help=f"Results JSON to compare against (default: {BASELINE_PATH} if present)")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Allowed slowdown vs the baseline (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated work directories")
+    parser.add_argument("--verbose", action="store_true", help="Show the timed functions' output")
+    args = parser.parse_args(argv)
+
+    run = run_benchmarks(
+        sizes=args.sizes, cases=args.cases, repeat=args.repeat, seed=args.seed,
+        mi_mode=args.mi_mode, error_budget=args.mi_error_budget,
+        verbose=args.verbose, keep=args.keep
+    )
+
+    path = save_run(run)
+    print("\n📁 Results Saved:", path)
+
+    if args.save_baseline:
+        shutil.copyfile(path, BASELINE_PATH)
+        print("📌 Baseline Updated:", BASELINE_PATH)
+        return 0
+
+    baseline_path = args.baseline or (BASELINE_PATH if os.path.exists(BASELINE_PATH) else None)
+    if baseline_path is None:
+        return 0
+
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+
+    regressions = compare(run, baseline, args.threshold)
+    if not regressions:
+        print(f"✅ No regressions vs {baseline_path} (threshold {args.threshold:.0%})")
+        return 0
+
+    print(f"❌ {len(regressions)} regression(s) vs {baseline_path}:")
+    for size, case, old, new in regressions:
+        print(f"   {size:<6} {case:<16} {old:.3f}s -> {new:.3f}s ({new / old - 1:+.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
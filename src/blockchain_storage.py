@@ -1,8 +1,12 @@
 import json
 import os
 import hashlib
+from contextlib import nullcontext
 from datetime import datetime
 
+from ledger import open_ledger
+from safe_io import write_json_atomic
+
 
 BLOCKCHAIN_FILE = os.path.join(
     os.path.dirname(os.path.abspath(__file__)),
@@ -10,38 +14,200 @@ BLOCKCHAIN_FILE = os.path.join(
 )
 
 
+GENESIS_HASH = "0" * 64
+
+
 def calculate_hash(data):
     """Generate SHA256 hash for blockchain integrity"""
-    data_string = json.dumps(data, sort_keys=True)
+    data_string = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
     return hashlib.sha256(data_string.encode()).hexdigest()
 
 
+def block_hash(block):
+    """Hash a block header: every field except the hash itself and the transaction body"""
+    header = {k: v for k, v in block.items() if k not in ("hash", "transactions")}
+    return calculate_hash(header)
+
+
+def merkle_root(leaf_hashes):
+    """Fold transaction hashes pairwise into a single Merkle root"""
+    if not leaf_hashes:
+        return hashlib.sha256(b"").hexdigest()
+
+    level = [bytes.fromhex(h) for h in leaf_hashes]
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [
+            hashlib.sha256(level[i] + level[i + 1]).digest()
+            for i in range(0, len(level), 2)
+        ]
+    return level[0].hex()
+
+
+def chain_lock(ledger):
+    """Writer lock of an on-disk ledger (no-op for in-memory lists)"""
+    return ledger.locked() if hasattr(ledger, "locked") else nullcontext()
+
+
+def append_record(ledger, record):
+    """Link a record to the current chain tip and append it to the ledger"""
+    # Tip read and append happen under one lock, so concurrent workers
+    # cannot both chain onto the same previous block
+    with chain_lock(ledger):
+        previous = ledger[-1] if len(ledger) else None
+
+        record = dict(record)
+        record["index"] = len(ledger)
+        record["previous_hash"] = previous.get("hash", GENESIS_HASH) if previous else GENESIS_HASH
+        record["hash"] = block_hash(record)
+
+        ledger.append(record)
+    return record
+
+
+# ==========================================================
+# 🔥 BLOCKCHAIN
+# ==========================================================
+
+class Blockchain:
+    """Hash-chained blocks whose transactions are batched under a Merkle root.
+
+    ``ledger`` may be any list-like store (a plain list by default, or a
+    ``LedgerLog`` for on-disk chains). Verification is incremental: only
+    blocks above the last verified height are re-hashed.
+    """
+
+    def __init__(self, ledger=None, checkpoint_path=None):
+        self.chain = ledger if ledger is not None else []
+        self.pending_transactions = []
+        self._pending_hashes = []
+
+        if checkpoint_path is None and hasattr(self.chain, "directory"):
+            checkpoint_path = os.path.join(self.chain.directory, "verified.json")
+        self.checkpoint_path = checkpoint_path
+
+        self.verified_height = 0
+        self.verified_hash = GENESIS_HASH
+        self._load_checkpoint()
+
+    @property
+    def last_block(self):
+        return self.chain[-1] if len(self.chain) else None
+
+    def add_transaction(self, transaction):
+        # Each leaf is hashed once, when it enters the pool
+        self.pending_transactions.append(transaction)
+        self._pending_hashes.append(calculate_hash(transaction))
+
+    def add_transactions(self, transactions):
+        for transaction in transactions:
+            self.add_transaction(transaction)
+
+    @property
+    def pending_root(self):
+        """Merkle root the pending transactions would get as a block"""
+        return merkle_root(self._pending_hashes)
+
+    def discard_pending(self):
+        self.pending_transactions = []
+        self._pending_hashes = []
+
+    def create_block(self, **header):
+        """Seal the pending transactions into a block; ``header`` adds hashed fields"""
+        with chain_lock(self.chain):
+            previous = self.last_block
+
+            block = {
+                "index": len(self.chain),
+                "timestamp": str(datetime.now()),
+                "previous_hash": previous.get("hash", GENESIS_HASH) if previous else GENESIS_HASH,
+                "merkle_root": merkle_root(self._pending_hashes),
+                "transaction_count": len(self.pending_transactions),
+                **header
+            }
+            block["hash"] = block_hash(block)
+            block["transactions"] = self.pending_transactions
+
+            self.chain.append(block)
+
+        self.discard_pending()
+        return block
+
+    # ------------------------------------------------------
+    # Verification
+    # ------------------------------------------------------
+
+    def verify(self, full=False):
+        """Check hashes, linkage and Merkle roots of blocks not yet verified"""
+        height = len(self.chain)
+        start = 0 if full else self.verified_height
+
+        # The checkpoint must still match the chain, otherwise start over
+        if start and (start > height or self.chain[start - 1].get("hash") != self.verified_hash):
+            start = 0
+
+        expected = self.chain[start - 1].get("hash", GENESIS_HASH) if start else GENESIS_HASH
+
+        for index in range(start, height):
+            block = self.chain[index]
+
+            # Legacy records written before hash linkage are not verifiable
+            if "previous_hash" not in block:
+                expected = block.get("hash", GENESIS_HASH)
+                continue
+
+            if block["previous_hash"] != expected or block_hash(block) != block["hash"]:
+                print(f"❌ Blockchain integrity check failed at block {index}")
+                return False
+
+            if "transactions" in block:
+                leaves = [calculate_hash(tx) for tx in block["transactions"]]
+                if merkle_root(leaves) != block["merkle_root"]:
+                    print(f"❌ Merkle root mismatch at block {index}")
+                    return False
+
+            expected = block["hash"]
+
+        self.verified_height = height
+        self.verified_hash = expected if height else GENESIS_HASH
+        self._save_checkpoint()
+        return True
+
+    def _load_checkpoint(self):
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, "r") as f:
+                checkpoint = json.load(f)
+            self.verified_height = checkpoint["height"]
+            self.verified_hash = checkpoint["hash"]
+
+    def _save_checkpoint(self):
+        if not self.checkpoint_path:
+            return
+        write_json_atomic(
+            self.checkpoint_path,
+            {"height": self.verified_height, "hash": self.verified_hash}
+        )
+
+
 def store_blockchain_record(data):
 
     print("🔗 Creating Blockchain Record...")
 
-    # Create blockchain folder if not exist
-    os.makedirs(os.path.dirname(BLOCKCHAIN_FILE), exist_ok=True)
+    # Open append-only ledger (migrates legacy ledger.json on first use)
+    ledger = open_ledger(
+        os.path.dirname(BLOCKCHAIN_FILE),
+        legacy_json=BLOCKCHAIN_FILE
+    )
 
-    # Load existing ledger
-    if os.path.exists(BLOCKCHAIN_FILE):
-        with open(BLOCKCHAIN_FILE, "r") as f:
-            ledger = json.load(f)
-    else:
-        ledger = []
-
-    # Create record
+    # Create record chained to the previous block (no full-ledger rewrite)
     record = {
         "timestamp": str(datetime.now()),
-        "data": data,
-        "hash": calculate_hash(data)
+        "data": data
     }
 
-    ledger.append(record)
-
-    # Save ledger
-    with open(BLOCKCHAIN_FILE, "w") as f:
-        json.dump(ledger, f, indent=4)
+    append_record(ledger, record)
+    ledger.flush()
 
     print("✅ Blockchain Record Saved")
-    print("📂 Location:", BLOCKCHAIN_FILE)
\ No newline at end of file
+    print("📂 Location:", ledger.directory)
\ No newline at end of file
@@ -1,11 +1,12 @@
-import pandas as pd
+from ingest import read_header
 
 print("📌 Checking dataset columns...\n")
 
-telecom = pd.read_csv("../datasets/telecom.csv")
-banking = pd.read_csv("../datasets/banking.csv")
-ecommerce = pd.read_csv("../datasets/ecommerce.csv")
+# Header only: no rows are parsed
+telecom = read_header("../datasets/telecom.csv")
+banking = read_header("../datasets/banking.csv")
+ecommerce = read_header("../datasets/ecommerce.csv")
 
-print("Telecom Columns:\n", telecom.columns.tolist(), "\n")
-print("Banking Columns:\n", banking.columns.tolist(), "\n")
-print("Ecommerce Columns:\n", ecommerce.columns.tolist(), "\n")
\ No newline at end of file
+print("Telecom Columns:\n", telecom, "\n")
+print("Banking Columns:\n", banking, "\n")
+print("Ecommerce Columns:\n", ecommerce, "\n")
@@ -1,53 +1,74 @@
 import pandas as pd
 import os
 
+from artifact_store import write_frame, write_partitions
+from ingest import read_table
+from dataset_schema import CANONICAL_DTYPES, DOMAIN_SCHEMAS, TARGET, apply_schema
 
-def load_dataset_correctly(path):
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET_DIR = os.path.join(BASE_DIR, "datasets")
 
-    # 🔥 Important: Your files are TAB separated
-    return pd.read_csv(path, sep="\t")
 
+def load_dataset_correctly(path, usecols=None, dtypes=None):
 
-def create_combined_dataset():
+    # 🔥 Delimiter (the raw files are TAB separated) is sniffed by ingest
+    return read_table(path, columns=usecols, dtypes=dtypes)
 
-    print("📌 Loading datasets correctly with TAB separator...")
 
-    telecom = load_dataset_correctly("../datasets/telecom.csv")
-    banking = load_dataset_correctly("../datasets/banking.csv")
-    ecommerce = load_dataset_correctly("../datasets/ecommerce.csv")
+def load_domain(dataset_dir, domain):
+    """Read one domain file (only its mapped columns) onto the canonical schema."""
+    schema = DOMAIN_SCHEMAS[domain]
 
-    # ---------------- Normalize Target Column ----------------
+    # Text columns are read as strings up front; numbers are parsed and
+    # then coerced by apply_schema (raw values like " " become NaN there)
+    text = {
+        raw: "string" for raw, canonical in schema["columns"].items()
+        if CANONICAL_DTYPES[canonical] in ("string", "category") and canonical != TARGET
+    }
+    raw = load_dataset_correctly(
+        os.path.join(dataset_dir, schema["file"]),
+        usecols=lambda col: col in schema["columns"],
+        dtypes=text
+    )
+    return apply_schema(raw, domain)
 
-    # Telecom
-    if "churn" in telecom.columns:
-        telecom.rename(columns={"churn": "Churn"}, inplace=True)
 
-    # Banking
-    if "Exited" in banking.columns:
-        banking.rename(columns={"Exited": "Churn"}, inplace=True)
+def create_combined_dataset(dataset_dir=DATASET_DIR, save_path=None):
+    """Build the combined dataset from the per-domain schema maps.
 
-    # Ecommerce
-    if "Churn" not in ecommerce.columns and "churn" in ecommerce.columns:
-        ecommerce.rename(columns={"churn": "Churn"}, inplace=True)
+    ``save_path`` without an extension (the default) is written as a
+    domain-partitioned directory: one Parquet file per domain holding only
+    that domain's columns. With an extension (.csv / .parquet / ...) the
+    partitions are unioned into a single file.
+    """
 
-    # Add domain column
-    telecom["Domain"] = "Telecom"
-    banking["Domain"] = "Banking"
-    ecommerce["Domain"] = "Ecommerce"
+    print("📌 Loading datasets with the canonical schema...")
 
-    # Combine
-    combined = pd.concat([telecom, banking, ecommerce], ignore_index=True)
+    parts = {domain: load_domain(dataset_dir, domain) for domain in DOMAIN_SCHEMAS}
 
-    if "Churn" not in combined.columns:
-        raise Exception("❌ Churn column STILL missing!")
+    for domain, df in parts.items():
+        if TARGET not in df.columns:
+            raise Exception(f"❌ Churn column missing for {domain}!")
+        print(f"   {domain:<10} {df.shape}  {df.memory_usage(deep=True).sum() / 1024:.0f} KB")
 
-    save_path = "../datasets/combined_data.csv"
-    combined.to_csv(save_path, index=False)
+    if save_path is None:
+        save_path = os.path.join(dataset_dir, "combined_data")
+
+    if os.path.splitext(save_path)[1]:
+        combined = pd.concat(parts.values(), ignore_index=True)
+        write_frame(combined, save_path)
+    else:
+        write_partitions(parts, save_path, dtypes=CANONICAL_DTYPES)
+
+    rows = sum(len(df) for df in parts.values())
+    columns = len({col for df in parts.values() for col in df.columns})
 
     print("✅ Combined Dataset Created Successfully!")
-    print("📊 Shape:", combined.shape)
+    print("📊 Shape:", (rows, columns))
     print("📁 Saved At:", save_path)
 
+    return save_path
+
 
 if __name__ == "__main__":
-    create_combined_dataset()
\ No newline at end of file
+    create_combined_dataset()
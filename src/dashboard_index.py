@@ -0,0 +1,127 @@
+import json
+import os
+from datetime import datetime
+
+from safe_io import write_json_atomic
+
+
+# ==========================================================
+# 🔥 MATERIALISED DASHBOARD SUMMARY
+# ==========================================================
+#
+# Running aggregates of the upload records in the ledger, kept in
+# <ledger dir>/dashboard_summary.json. Each refresh folds in only the
+# records appended since the stored height, so page views read one small
+# JSON file instead of walking the ledger.
+
+SUMMARY_FILE = "dashboard_summary.json"
+COUNT_FIELDS = ("total_customers", "high_risk", "medium_risk", "low_risk")
+
+# Bumped when folding changes; summaries of another version are rebuilt
+SUMMARY_VERSION = 2
+
+
+def _zero_counts():
+    return {field: 0 for field in COUNT_FIELDS}
+
+
+def _empty_summary():
+    return {
+        "version": SUMMARY_VERSION,
+        "height": 0,
+        "total_uploads": 0,
+        "latest": None,
+        "latest_high_risk_ids": [],
+        "cumulative": _zero_counts(),
+        "per_file": {},
+        "per_day": {},
+        "updated": None,
+    }
+
+
+def _add_counts(target, counts):
+    for field in COUNT_FIELDS:
+        target[field] = target.get(field, 0) + counts[field]
+    target["uploads"] = target.get("uploads", 0) + 1
+
+
+def fold_record(summary, record):
+    """Add one ledger record to the running aggregates (in place)."""
+    summary["height"] += 1
+
+    # Training / pipeline records ({"timestamp", "data"}) are not uploads
+    if not all(field in record for field in COUNT_FIELDS):
+        return summary
+
+    summary["total_uploads"] += 1
+
+    counts = {field: int(record[field]) for field in COUNT_FIELDS}
+    timestamp = str(record.get("timestamp", ""))
+
+    summary["latest"] = {
+        **counts,
+        "file": record.get("file"),
+        "job_id": record.get("job_id"),
+        "timestamp": timestamp,
+    }
+    summary["latest_high_risk_ids"] = record.get("high_risk_ids", [])
+
+    for field in COUNT_FIELDS:
+        summary["cumulative"][field] += counts[field]
+
+    _add_counts(summary["per_file"].setdefault(str(record.get("file")), {}), counts)
+    _add_counts(summary["per_day"].setdefault(timestamp[:10] or "-", {}), counts)
+    return summary
+
+
+class DashboardIndex:
+    """Incrementally maintained summary of a ``LedgerLog``."""
+
+    def __init__(self, ledger):
+        self.ledger = ledger
+        self.path = os.path.join(ledger.directory, SUMMARY_FILE)
+        self._summary = None
+        self._stamp = None
+
+    def _load(self):
+        # Re-read only when another writer (or worker) replaced the file
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return _empty_summary()
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp != self._stamp:
+            with open(self.path, "r") as f:
+                self._summary = json.load(f)
+            self._stamp = stamp
+        return self._summary
+
+    def refresh(self):
+        """Fold any records appended since the last refresh; returns the summary."""
+        summary = self._load()
+        if summary.get("version") == SUMMARY_VERSION and summary["height"] == len(self.ledger):
+            return summary
+
+        with self.ledger.locked():
+            summary = json.loads(json.dumps(self._load()))
+            height = len(self.ledger)
+
+            # A ledger shorter than the index means it was reset: rebuild
+            if summary.get("version") != SUMMARY_VERSION or summary["height"] > height:
+                summary = _empty_summary()
+
+            for record in self.ledger.iter_range(summary["height"], height):
+                fold_record(summary, record)
+
+            summary["updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            write_json_atomic(self.path, summary)
+
+        return self._load()
+
+    def last_modified(self):
+        """Modification time of the summary file (for HTTP caching)."""
+        try:
+            return datetime.fromtimestamp(os.path.getmtime(self.path))
+        except FileNotFoundError:
+            return None
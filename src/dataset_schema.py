@@ -0,0 +1,219 @@
+import numpy as np
+import pandas as pd
+
+
+# ==========================================================
+# 🔥 CANONICAL DATASET SCHEMA
+# ==========================================================
+#
+# Every domain file is mapped onto one canonical feature set with explicit
+# compact dtypes. Shared concepts (customer ID, gender, tenure, target)
+# get one column instead of one per spelling; columns a domain does not
+# list (row numbers, surnames) are dropped.
+
+TARGET = "Churn"
+DOMAIN = "Domain"
+ID_COLUMN = "CustomerID"
+
+DOMAINS = ["Telecom", "Banking", "Ecommerce"]
+
+# Canonical column -> dtype. Integer columns holding NaN fall back to float32.
+CANONICAL_DTYPES = {
+    ID_COLUMN: "string",
+    DOMAIN: "category",
+    TARGET: "int8",
+
+    # Shared
+    "Gender": "category",
+    "Tenure": "float32",
+
+    # Telecom
+    "SeniorCitizen": "int8",
+    "Partner": "category",
+    "Dependents": "category",
+    "PhoneService": "category",
+    "MultipleLines": "category",
+    "InternetService": "category",
+    "OnlineSecurity": "category",
+    "OnlineBackup": "category",
+    "DeviceProtection": "category",
+    "TechSupport": "category",
+    "StreamingTV": "category",
+    "StreamingMovies": "category",
+    "Contract": "category",
+    "PaperlessBilling": "category",
+    "PaymentMethod": "category",
+    "MonthlyCharges": "float32",
+    "TotalCharges": "float32",
+
+    # Banking
+    "CreditScore": "int16",
+    "Geography": "category",
+    "Age": "int8",
+    "Balance": "float32",
+    "NumOfProducts": "int8",
+    "HasCrCard": "int8",
+    "IsActiveMember": "int8",
+    "EstimatedSalary": "float32",
+
+    # Ecommerce
+    "PreferredLoginDevice": "category",
+    "CityTier": "int8",
+    "WarehouseToHome": "float32",
+    "PreferredPaymentMode": "category",
+    "HourSpendOnApp": "float32",
+    "NumberOfDeviceRegistered": "int8",
+    "PreferedOrderCat": "category",
+    "SatisfactionScore": "int8",
+    "MaritalStatus": "category",
+    "NumberOfAddress": "int8",
+    "Complain": "int8",
+    "OrderAmountHikeFromlastYear": "float32",
+    "CouponUsed": "float32",
+    "OrderCount": "float32",
+    "DaySinceLastOrder": "float32",
+    "CashbackAmount": "float32",
+}
+
+# Per domain: source file, raw column -> canonical column, target labels
+DOMAIN_SCHEMAS = {
+    "Telecom": {
+        "file": "telecom.csv",
+        "target_labels": {"Yes": 1, "No": 0},
+        "columns": {
+            "customerID": ID_COLUMN,
+            "gender": "Gender",
+            "SeniorCitizen": "SeniorCitizen",
+            "Partner": "Partner",
+            "Dependents": "Dependents",
+            "tenure": "Tenure",
+            "PhoneService": "PhoneService",
+            "MultipleLines": "MultipleLines",
+            "InternetService": "InternetService",
+            "OnlineSecurity": "OnlineSecurity",
+            "OnlineBackup": "OnlineBackup",
+            "DeviceProtection": "DeviceProtection",
+            "TechSupport": "TechSupport",
+            "StreamingTV": "StreamingTV",
+            "StreamingMovies": "StreamingMovies",
+            "Contract": "Contract",
+            "PaperlessBilling": "PaperlessBilling",
+            "PaymentMethod": "PaymentMethod",
+            "MonthlyCharges": "MonthlyCharges",
+            "TotalCharges": "TotalCharges",
+            "Churn": TARGET,
+        },
+    },
+    "Banking": {
+        "file": "banking.csv",
+        "target_labels": None,
+        "columns": {
+            "CustomerId": ID_COLUMN,
+            "CreditScore": "CreditScore",
+            "Geography": "Geography",
+            "Gender": "Gender",
+            "Age": "Age",
+            "Tenure": "Tenure",
+            "Balance": "Balance",
+            "NumOfProducts": "NumOfProducts",
+            "HasCrCard": "HasCrCard",
+            "IsActiveMember": "IsActiveMember",
+            "EstimatedSalary": "EstimatedSalary",
+            "Exited": TARGET,
+        },
+    },
+    "Ecommerce": {
+        "file": "ecommerce.csv",
+        "target_labels": None,
+        "columns": {
+            "CustomerID": ID_COLUMN,
+            "Churn": TARGET,
+            "Tenure": "Tenure",
+            "PreferredLoginDevice": "PreferredLoginDevice",
+            "CityTier": "CityTier",
+            "WarehouseToHome": "WarehouseToHome",
+            "PreferredPaymentMode": "PreferredPaymentMode",
+            "Gender": "Gender",
+            "HourSpendOnApp": "HourSpendOnApp",
+            "NumberOfDeviceRegistered": "NumberOfDeviceRegistered",
+            "PreferedOrderCat": "PreferedOrderCat",
+            "SatisfactionScore": "SatisfactionScore",
+            "MaritalStatus": "MaritalStatus",
+            "NumberOfAddress": "NumberOfAddress",
+            "Complain": "Complain",
+            "OrderAmountHikeFromlastYear": "OrderAmountHikeFromlastYear",
+            "CouponUsed": "CouponUsed",
+            "OrderCount": "OrderCount",
+            "DaySinceLastOrder": "DaySinceLastOrder",
+            "CashbackAmount": "CashbackAmount",
+        },
+    },
+}
+
+# Raw spelling -> canonical name, for columns that were renamed
+COLUMN_ALIASES = {
+    raw: canonical
+    for schema in DOMAIN_SCHEMAS.values()
+    for raw, canonical in schema["columns"].items()
+    if raw != canonical
+}
+
+
+# Every spelling of the customer ID (canonical first)
+ID_ALIASES = [ID_COLUMN] + [raw for raw, canonical in COLUMN_ALIASES.items() if canonical == ID_COLUMN]
+
+
+def find_id_column(columns):
+    """The customer ID column among ``columns`` (any known spelling), or None."""
+    present = set(columns)
+    return next((name for name in ID_ALIASES if name in present), None)
+
+
+def compact(series, dtype):
+    """Cast one column to its declared compact dtype."""
+    if dtype == "category":
+        return series.astype("category")
+    if dtype == "string":
+        return series.astype("string")
+
+    values = pd.to_numeric(series, errors="coerce")
+    if np.issubdtype(np.dtype(dtype), np.integer) and values.isna().any():
+        return values.astype("float32")
+    return values.astype(dtype)
+
+
+def apply_schema(df, domain):
+    """Rename, select and cast a raw domain frame onto the canonical schema."""
+    schema = DOMAIN_SCHEMAS[domain]
+    mapping = {raw: canonical for raw, canonical in schema["columns"].items() if raw in df.columns}
+
+    out = df[list(mapping)].rename(columns=mapping)
+
+    if schema["target_labels"] and TARGET in out.columns:
+        out[TARGET] = out[TARGET].map(schema["target_labels"])
+
+    out[DOMAIN] = domain
+
+    for col in out.columns:
+        out[col] = compact(out[col], CANONICAL_DTYPES[col])
+    return out
+
+
+def align_columns(df, expected):
+    """Rename raw/canonical spellings in ``df`` to the names in ``expected``.
+
+    A column is renamed only when the expected spelling is missing and its
+    other spelling is not expected itself, so feature lists that contain
+    both (models trained on the old column union) are left untouched.
+    """
+    expected = set(expected)
+    present = set(df.columns)
+    renames = {}
+
+    for raw, canonical in COLUMN_ALIASES.items():
+        if canonical in expected and raw not in expected and raw in present and canonical not in present:
+            renames[raw] = canonical
+        elif raw in expected and canonical not in expected and canonical in present and raw not in present:
+            renames[canonical] = raw
+
+    return df.rename(columns=renames) if renames else df
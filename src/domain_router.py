@@ -0,0 +1,139 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from dataset_schema import COLUMN_ALIASES, DOMAIN, DOMAIN_SCHEMAS
+from feature_transformer import FeatureTransformer, build_model_input
+from ingest import read_table
+from model_registry import get_registry
+from prediction_cache import get_prediction_cache, predict_cached
+
+
+# ==========================================================
+# 🔥 MULTI-DOMAIN MODEL ROUTER
+# ==========================================================
+#
+# Each row is scored by its own domain's model (telecom / banking /
+# ecommerce ANN + scaler). The domain comes from the ``Domain`` column when
+# present, otherwise from the upload's columns: the domain whose scaler
+# features (``feature_names_in_``) are best covered wins. Rows are grouped
+# per domain, each group runs through its model as one batch, and results
+# are written back in the original row order. Rows no domain matches fall
+# back to the combined model. With a prediction cache, rows a model
+# already scored (same features, same artifacts) skip the forward pass.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET_DIR = os.path.join(BASE_DIR, "datasets")
+
+DOMAIN_MODELS = {
+    "Telecom": "telecom",
+    "Banking": "banking",
+    "Ecommerce": "ecommerce",
+}
+FALLBACK_MODEL = "combined"
+
+# Share of a domain model's features an upload must carry to be routed to it
+MIN_COVERAGE = 0.6
+
+
+def _spellings(columns):
+    # Upload columns under both their raw and canonical names (build_model_input
+    # renames them to the model's own spelling before encoding)
+    names = set(columns)
+    names |= {COLUMN_ALIASES[c] for c in columns if c in COLUMN_ALIASES}
+    names |= {raw for raw, canonical in COLUMN_ALIASES.items() if canonical in columns}
+    return names
+
+
+@lru_cache(maxsize=None)
+def domain_transformer(domain, features):
+    """Encoder for a domain model, refitted from its raw dataset.
+
+    The domain models were trained on their own dataset LabelEncoded and
+    standardized (the ``cleaned_*`` step) before the model's scaler, so
+    fitting on the same file reproduces the training encoding.
+    """
+    path = os.path.join(DATASET_DIR, DOMAIN_SCHEMAS[domain]["file"])
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"❌ {domain} dataset needed to fit its encoder is missing: {path}")
+
+    raw = read_table(path, columns=lambda col: col in features)
+    return FeatureTransformer().fit(raw[[f for f in features if f in raw.columns]])
+
+
+class DomainRouter:
+
+    def __init__(self, registry=None, domain_models=DOMAIN_MODELS, fallback=FALLBACK_MODEL,
+                 cache=None):
+        self.registry = registry or get_registry()
+        self.domain_models = domain_models
+        self.fallback = fallback
+        self.cache = cache
+
+    def artifacts(self, domain):
+        """Artifacts of a domain model, with its features and category encoder filled in."""
+        artifacts = self.registry.get(self.domain_models[domain])
+        features = artifacts.features
+        if features is None:
+            features = list(artifacts.scaler.feature_names_in_)
+        transformer = artifacts.transformer or domain_transformer(domain, tuple(features))
+        return artifacts._replace(features=features, transformer=transformer)
+
+    def fingerprint(self, columns):
+        """Domain whose model features the given columns cover best (or None)."""
+        names = _spellings(columns)
+        best, best_coverage = None, 0.0
+        for domain in self.domain_models:
+            features = self.artifacts(domain).features
+            coverage = len(names & set(features)) / len(features)
+            if coverage > best_coverage:
+                best, best_coverage = domain, coverage
+        return best if best_coverage >= MIN_COVERAGE else None
+
+    def detect(self, df):
+        """Per-row domain labels (None where no domain model applies)."""
+        guess = self.fingerprint(df.columns)
+        domains = np.full(len(df), guess, dtype=object)
+
+        if DOMAIN in df.columns:
+            labels = df[DOMAIN].astype(str).str.strip().str.capitalize().to_numpy()
+            known = np.isin(labels, list(self.domain_models))
+            domains[known] = labels[known]
+        return domains
+
+    def predict_proba(self, df, domains=None):
+        """Score every row with its domain's model; returns (probs, domains)."""
+        if domains is None:
+            domains = self.detect(df)
+
+        probs = np.zeros(len(df), dtype=np.float32)
+
+        for domain in pd.unique(domains):
+            rows = np.flatnonzero(domains == domain) if domain is not None else \
+                np.flatnonzero(pd.isna(domains))
+            group = df.iloc[rows]
+
+            if domain is None:
+                artifacts = self.registry.get(self.fallback)
+                engine = self.registry.engine(self.fallback)
+            else:
+                artifacts = self.artifacts(domain)
+                engine = self.registry.engine(self.domain_models[domain])
+
+            X, X_scaled = build_model_input(group, artifacts)
+            probs[rows] = predict_cached(engine, X, X_scaled, artifacts.name,
+                                         artifacts.fingerprint, self.cache)
+
+        return probs, domains
+
+
+_router = None
+
+
+def get_router():
+    global _router
+    if _router is None:
+        _router = DomainRouter(cache=get_prediction_cache())
+    return _router
@@ -1,13 +1,217 @@
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
 from sklearn.feature_selection import mutual_info_classif
 
+from artifact_store import CACHE_DIR, read_frame, write_frame
+from safe_io import write_json_atomic
+
+
+# ==========================================================
+# 🔥 MUTUAL INFORMATION ENGINE
+# ==========================================================
+#
+# Columns are scored independently, so they can be
+#   - scored in parallel on a process pool (spawned, not forked: the
+#     pipeline runs this on a worker thread, possibly after TensorFlow
+#     was imported; one pool serves every sample size of a ``score`` call),
+#   - cached by a hash of (column data, target, settings): unchanged
+#     columns are never rescored,
+#   - estimated on stratified row subsamples, grown until the scores
+#     move less than ``error_budget`` between two sample sizes.
+#
+# Modes:
+#   "knn"     sklearn's kNN estimator for every column (original behaviour)
+#   "auto"    exact contingency-table MI for columns with few distinct
+#             levels (encoded categoricals), kNN for the rest
+#   "binned"  contingency MI everywhere, continuous columns quantile-binned
+
+MI_CACHE_PATH = os.path.join(CACHE_DIR, "mi_scores.json")
+
+MI_MODES = ("knn", "auto", "binned")
+N_NEIGHBORS = 3
+N_BINS = 16
+MAX_DISCRETE_LEVELS = 64
+MIN_SAMPLE_ROWS = 2000
+RANDOM_STATE = 0
+
+
+def _hash_array(values):
+    return hashlib.sha256(np.ascontiguousarray(values, dtype=np.float64).tobytes()).hexdigest()
+
+
+def _is_discrete(values):
+    # Encoded categoricals keep few distinct levels even after scaling
+    return len(np.unique(values)) <= MAX_DISCRETE_LEVELS
+
+
+def _bin(values, n_bins=N_BINS):
+    edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1]))
+    return np.searchsorted(edges, values, side="right")
+
+
+def discrete_mi(x, y):
+    """Exact MI (nats) of two discrete variables from their contingency table."""
+    _, x_codes = np.unique(x, return_inverse=True)
+    _, y_codes = np.unique(y, return_inverse=True)
+    kx, ky = x_codes.max() + 1, y_codes.max() + 1
+
+    joint = np.bincount(x_codes * ky + y_codes, minlength=kx * ky).reshape(kx, ky)
+    joint = joint / joint.sum()
+    outer = np.outer(joint.sum(axis=1), joint.sum(axis=0))
+
+    nonzero = joint > 0
+    return float(np.sum(joint[nonzero] * np.log(joint[nonzero] / outer[nonzero])))
+
+
+def _score_block(X, y, kinds, seed):
+    """Worker: MI of each column of ``X`` ("discrete", "binned" or "knn")."""
+    scores = np.empty(X.shape[1])
+    for j, kind in enumerate(kinds):
+        column = X[:, j]
+        if kind == "discrete":
+            scores[j] = discrete_mi(column, y)
+        elif kind == "binned":
+            scores[j] = discrete_mi(_bin(column), y)
+        else:
+            scores[j] = mutual_info_classif(
+                column.reshape(-1, 1), y, discrete_features=False,
+                n_neighbors=N_NEIGHBORS, random_state=seed
+            )[0]
+    return scores
+
+
+def _stratified_sample(y, n_rows, rng):
+    """Row indices of a class-proportional sample of ``n_rows``."""
+    picked = []
+    for label in np.unique(y):
+        members = np.flatnonzero(y == label)
+        take = max(1, int(round(n_rows * len(members) / len(y))))
+        picked.append(rng.choice(members, size=min(take, len(members)), replace=False))
+    return np.sort(np.concatenate(picked))
+
+
+class MutualInfoScorer:
+    """Parallel, cached and optionally subsampled per-column MI scores."""
+
+    def __init__(self, mode="knn", n_jobs=None, error_budget=None,
+                 cache_path=MI_CACHE_PATH, seed=RANDOM_STATE):
+        if mode not in MI_MODES:
+            raise ValueError(f"❌ Unknown MI mode: {mode} (expected one of {MI_MODES})")
+        self.mode = mode
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.error_budget = error_budget
+        self.cache_path = cache_path
+        self.seed = seed
+        self.cache = self._load_cache()
+
+    def _load_cache(self):
+        if self.cache_path and os.path.exists(self.cache_path):
+            with open(self.cache_path, "r") as f:
+                return json.load(f)
+        return {}
+
+    def _save_cache(self):
+        if self.cache_path:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            write_json_atomic(self.cache_path, self.cache)
+
+    def _kind(self, values):
+        if self.mode == "knn":
+            return "knn"
+        if _is_discrete(values):
+            return "discrete"
+        return "binned" if self.mode == "binned" else "knn"
+
+    def _score(self, X, y, kinds, pool=None):
+        blocks = [b for b in np.array_split(np.arange(X.shape[1]), self.n_jobs) if len(b)]
+        if pool is None or len(blocks) == 1:
+            return _score_block(X, y, kinds, self.seed)
+
+        parts = pool.map(
+            _score_block,
+            [X[:, b] for b in blocks], [y] * len(blocks),
+            [[kinds[i] for i in b] for b in blocks], [self.seed] * len(blocks)
+        )
+        return np.concatenate(list(parts))
+
+    def _estimate(self, X, y, kinds, pool=None):
+        n_rows = len(y)
+        if self.error_budget is None or n_rows <= MIN_SAMPLE_ROWS:
+            return self._score(X, y, kinds, pool)
+
+        # Double the stratified sample until scores settle within the budget
+        rng = np.random.default_rng(self.seed)
+        size = MIN_SAMPLE_ROWS
+        rows = _stratified_sample(y, size, rng)
+        previous = self._score(X[rows], y[rows], kinds, pool)
+
+        while size < n_rows:
+            size = min(size * 2, n_rows)
+            rows = _stratified_sample(y, size, rng) if size < n_rows else slice(None)
+            current = self._score(X[rows], y[rows], kinds, pool)
+            if np.max(np.abs(current - previous)) <= self.error_budget:
+                print(f"   Scores converged on {size} of {n_rows} rows")
+                return current
+            previous = current
+        return previous
+
+    def score(self, X, y):
+        """MI score of every column of DataFrame ``X`` against ``y``."""
+        values = X.to_numpy(dtype=np.float64)
+        y = np.asarray(y)
+        y_hash = _hash_array(y)
+
+        kinds, keys, scores = [], [], np.full(values.shape[1], np.nan)
+        for j in range(values.shape[1]):
+            kind = self._kind(values[:, j])
+            settings = f"{kind}|{N_NEIGHBORS}|{N_BINS}|{self.error_budget}|{self.seed}"
+            key = hashlib.sha256(
+                f"{_hash_array(values[:, j])}|{y_hash}|{settings}".encode()
+            ).hexdigest()
+            kinds.append(kind)
+            keys.append(key)
+            if key in self.cache:
+                scores[j] = self.cache[key]
+
+        todo = np.flatnonzero(np.isnan(scores))
+        workers = min(self.n_jobs, max(len(todo), 1))
+        print(f"   {values.shape[1] - len(todo)} column(s) cached, "
+              f"scoring {len(todo)} on {workers} process(es)")
+
+        if len(todo):
+            pool = None
+            if workers > 1:
+                pool = ProcessPoolExecutor(max_workers=workers,
+                                           mp_context=multiprocessing.get_context("spawn"))
+            try:
+                fresh = self._estimate(values[:, todo], y, [kinds[j] for j in todo], pool)
+            finally:
+                if pool is not None:
+                    pool.shutdown()
+            for j, score in zip(todo, fresh):
+                scores[j] = score
+                self.cache[keys[j]] = float(score)
+            self._save_cache()
+
+        return scores
+
+
+# ==========================================================
+# 🔥 FEATURE SELECTION
+# ==========================================================
 
-def select_features(file_path, output_path, top_k=25):
+def select_features(file_path, output_path, top_k=25, mi_mode="knn",
+                    n_jobs=None, error_budget=None, cache_path=MI_CACHE_PATH):
 
     print("\n🔍 Feature Selection Started...")
 
-    df = pd.read_csv(file_path, low_memory=False)
+    df = read_frame(file_path)
 
     print("📊 Dataset Shape:", df.shape)
 
@@ -23,16 +227,19 @@ def select_features(file_path, output_path, top_k=25):
     y = df["Churn"]
     X = df.drop(columns=["Churn"])
 
-    # ✅ Convert ALL columns to numeric (force safe conversion)
+    # ✅ Convert non-numeric columns to numeric (typed inputs skip this)
     for col in X.columns:
-        X[col] = pd.to_numeric(X[col], errors="coerce")
+        if not pd.api.types.is_numeric_dtype(X[col]):
+            X[col] = pd.to_numeric(X[col], errors="coerce")
 
     # Fill NaN created by conversion
     X = X.fillna(0)
 
-    print("⚡ Calculating Mutual Information...")
+    print(f"⚡ Calculating Mutual Information ({mi_mode})...")
 
-    mi_scores = mutual_info_classif(X, y)
+    scorer = MutualInfoScorer(mode=mi_mode, n_jobs=n_jobs, error_budget=error_budget,
+                              cache_path=cache_path)
+    mi_scores = scorer.score(X, y)
 
     mi_df = pd.DataFrame({
         "Feature": X.columns,
@@ -46,12 +253,12 @@ def select_features(file_path, output_path, top_k=25):
 
     selected_features = mi_df["Feature"].head(top_k).tolist()
 
-    X_selected = X[selected_features]
+    X_selected = X[selected_features].copy()
     X_selected["Churn"] = y.values
 
-    X_selected.to_csv(output_path, index=False)
+    write_frame(X_selected, output_path)
 
     print("✅ Selected Feature Dataset Saved:", output_path)
     print("------------------------------------")
 
-    return selected_features
\ No newline at end of file
+    return selected_features
@@ -0,0 +1,168 @@
+import joblib
+import numpy as np
+import pandas as pd
+
+from dataset_schema import align_columns
+from instrumentation import timer
+
+
+# ==========================================================
+# 🔥 FEATURE TRANSFORMER
+# ==========================================================
+#
+# One fitted encoder shared by preprocess.py (training) and the two
+# inference paths (app.py, predict.py). It reproduces the training
+# encoding exactly -- LabelEncoder-style codes for categoricals (NaN is
+# its own "nan" class, as with ``astype(str)``) followed by StandardScaler
+# statistics -- and writes straight into a preallocated float32 matrix.
+#
+# Missing or unseen values end up at 0 after standardization, matching the
+# ``fillna(0)`` applied after preprocessing.
+
+
+def _as_str(values):
+    # NaN -> "nan", like ``astype(str)`` before pandas' string dtype
+    return np.asarray(values, dtype=object).astype(str)
+
+
+class FeatureTransformer:
+    """Fitted categorical/numeric encoder producing float32 model matrices."""
+
+    def __init__(self):
+        self.columns = []          # fitted input columns, in order
+        self.category_codes = {}   # column -> {category: code}
+        self.stats = {}            # column -> (mean, scale); empty = passthrough
+        self._plans = {}
+
+    # ------------------------------------------------------
+    # Fitting
+    # ------------------------------------------------------
+
+    def fit(self, df, standardize=True):
+        self.columns = list(df.columns)
+        self.category_codes = {}
+        self.stats = {}
+        self._plans = {}
+
+        for col in df.select_dtypes(include=["object", "category", "string"]).columns:
+            classes = np.unique(_as_str(df[col]))
+            self.category_codes[col] = {c: i for i, c in enumerate(classes)}
+
+        if standardize:
+            for col in self.columns:
+                values = self._column_values(df, col)
+                mean = np.nanmean(values) if np.isfinite(values).any() else 0.0
+                std = np.nanstd(values) if np.isfinite(values).any() else 0.0
+                self.stats[col] = (float(mean), float(std) if std > 0 else 1.0)
+
+        return self
+
+    # ------------------------------------------------------
+    # Encoding
+    # ------------------------------------------------------
+
+    def _column_values(self, df, col):
+        values = df[col]
+        codes = self.category_codes.get(col)
+
+        if codes is not None and not pd.api.types.is_numeric_dtype(values):
+            # Category -> code through a fixed category order (unseen -> NaN)
+            cat = pd.Categorical(_as_str(values), categories=list(codes))
+            out = cat.codes.astype(np.float32)
+            out[cat.codes < 0] = np.nan
+            return out
+
+        return pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float32)
+
+    def _plan(self, features, columns):
+        """Precompute, per feature list and input schema, where each output column comes from."""
+        key = (tuple(features), tuple(columns))
+        plan = self._plans.get(key)
+        if plan is not None:
+            return plan
+
+        present = set(columns)
+        direct = []      # (out_idx, column)
+        onehot = {}      # source column -> {category: out_idx}
+
+        for idx, feature in enumerate(features):
+            if feature in present:
+                direct.append((idx, feature))
+                continue
+            # Dummy-style feature names ("Contract_Month-to-month")
+            for col in columns:
+                prefix = f"{col}_"
+                if feature.startswith(prefix):
+                    onehot.setdefault(col, {})[feature[len(prefix):]] = idx
+                    break
+
+        plan = (direct, onehot)
+        self._plans[key] = plan
+        return plan
+
+    def transform(self, df, features=None):
+        """Encode ``df`` into a float32 matrix with one column per feature."""
+        features = self.columns if features is None else list(features)
+        direct, onehot = self._plan(features, df.columns)
+
+        X = np.zeros((len(df), len(features)), dtype=np.float32)
+
+        for idx, col in direct:
+            values = self._column_values(df, col)
+            if col in self.stats:
+                mean, scale = self.stats[col]
+                values = (values - mean) / scale
+            X[:, idx] = values
+
+        for col, index_map in onehot.items():
+            categories = list(index_map)
+            codes = pd.Categorical(_as_str(df[col]), categories=categories).codes
+            rows = np.flatnonzero(codes >= 0)
+            targets = np.fromiter(index_map.values(), dtype=np.intp)[codes[rows]]
+            X[rows, targets] = 1.0
+
+        np.nan_to_num(X, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+        return X
+
+    def fit_transform(self, df, standardize=True):
+        return self.fit(df, standardize=standardize).transform(df)
+
+    # ------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_plans"] = {}
+        return state
+
+    def save(self, path):
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path):
+        return joblib.load(path)
+
+
+def apply_scaler(X, scaler):
+    """Apply a fitted StandardScaler to a float32 matrix in place."""
+    if getattr(scaler, "with_mean", True) and scaler.mean_ is not None:
+        X -= scaler.mean_.astype(np.float32)
+    if getattr(scaler, "with_std", True) and scaler.scale_ is not None:
+        X /= scaler.scale_.astype(np.float32)
+    return X
+
+
+def build_model_input(df, artifacts):
+    """Encode + scale ``df`` for an artifact set; returns (unscaled, scaled) float32 matrices."""
+    transformer = artifacts.transformer
+    if transformer is None:
+        # Guessing an encoding scores every row, just wrongly
+        raise ValueError(f"❌ No fitted feature transformer for model set: {artifacts.name}")
+    # Raw and canonical spellings (tenure / Tenure) -> the model's own names
+    df = align_columns(df, artifacts.features)
+    with timer("encode", rows=len(df)):
+        X = transformer.transform(df, artifacts.features)
+    with timer("scale", rows=len(df)):
+        X_scaled = apply_scaler(X.copy(), artifacts.scaler) if artifacts.scaler is not None else X
+    return X, X_scaled
@@ -0,0 +1,77 @@
+import threading
+
+import numpy as np
+
+
+# ==========================================================
+# 🔥 COMPILED INFERENCE ENGINE
+# ==========================================================
+#
+# model.predict() builds a data adapter and progress-bar callback on every
+# call, which dominates latency for small uploads. The engine calls the
+# model directly inside a tf.function traced once per batch bucket: inputs
+# are zero-padded up to the nearest bucket (and split at the largest one),
+# so any input size reuses one of a handful of static-shape graphs.
+
+BATCH_BUCKETS = (1, 8, 32, 128, 512, 2048)
+
+
+class InferenceEngine:
+    """Traced, bucketed forward pass for a Keras Sequential churn model."""
+
+    def __init__(self, model, n_features, buckets=BATCH_BUCKETS):
+        import tensorflow as tf
+
+        self._tf = tf
+        self.model = model
+        self.n_features = int(n_features)
+        self.buckets = tuple(sorted(buckets))
+
+        self._forward = tf.function(lambda x: model(x, training=False))
+        self._concrete = {}
+        self._lock = threading.Lock()
+
+    def _graph_for(self, bucket):
+        graph = self._concrete.get(bucket)
+        if graph is None:
+            with self._lock:
+                graph = self._concrete.get(bucket)
+                if graph is None:
+                    spec = self._tf.TensorSpec([bucket, self.n_features], self._tf.float32)
+                    graph = self._forward.get_concrete_function(spec)
+                    self._concrete[bucket] = graph
+        return graph
+
+    def _bucket(self, rows):
+        for bucket in self.buckets:
+            if rows <= bucket:
+                return bucket
+        return self.buckets[-1]
+
+    def predict_proba(self, X):
+        """Return churn probabilities as a flat float32 array."""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(
+                f"❌ Expected {self.n_features} features, got {X.shape[1]}"
+            )
+
+        probs = np.empty(len(X), dtype=np.float32)
+        step = self.buckets[-1]
+
+        for start in range(0, len(X), step):
+            batch = X[start:start + step]
+            rows = len(batch)
+            bucket = self._bucket(rows)
+
+            if rows < bucket:
+                padded = np.zeros((bucket, self.n_features), dtype=np.float32)
+                padded[:rows] = batch
+                batch = padded
+
+            out = self._graph_for(bucket)(self._tf.constant(batch))
+            probs[start:start + rows] = out.numpy().reshape(-1)[:rows]
+
+        return probs
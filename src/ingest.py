@@ -0,0 +1,258 @@
+import csv
+import gzip
+import io
+import os
+from contextlib import contextmanager
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+
+# ==========================================================
+# 🔥 SHARED INGESTION LAYER
+# ==========================================================
+#
+# Every entry point reads customer files through here, whatever their
+# delimiter (the raw datasets are TAB separated, uploads usually comma),
+# compression or format:
+#   - the format comes from the first bytes: Parquet ("PAR1"), gzip
+#     (1f 8b) or plain CSV; the delimiter is sniffed from the first lines
+#   - ``read_header`` returns column names without parsing any rows
+#   - ``read_table`` parses CSV with pyarrow's multithreaded reader
+#     (optional explicit column types), Parquet with pyarrow
+#   - ``iter_frames`` streams bounded chunks: pyarrow's streaming CSV
+#     reader (types inferred from the first block) or Parquet row groups.
+#     If a later CSV block does not fit those types (a text value in a
+#     numeric column), the rest of the file is read with pandas, which
+#     infers types per chunk
+#
+# Sources may be a path, raw bytes or an open binary file (e.g. a Flask
+# upload's stream).
+
+SNIFF_BYTES = 64 * 1024
+SNIFF_LINES = 20
+DELIMITERS = (",", "\t", ";", "|")
+
+PARQUET_MAGIC = b"PAR1"
+GZIP_MAGIC = b"\x1f\x8b"
+
+CSV_BLOCK_BYTES = 4 * 1024 * 1024
+
+# pandas-style dtype names -> Arrow types for explicit CSV column types
+ARROW_TYPES = {
+    "string": pa.string(),
+    "str": pa.string(),
+    "object": pa.string(),
+    "category": pa.dictionary(pa.int32(), pa.string()),
+    "bool": pa.bool_(),
+    "int8": pa.int8(),
+    "int16": pa.int16(),
+    "int32": pa.int32(),
+    "int64": pa.int64(),
+    "float32": pa.float32(),
+    "float64": pa.float64(),
+}
+
+
+@contextmanager
+def _binary(source):
+    """Seekable binary file for a path, bytes or file object (rewound)."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield f
+        return
+
+    f = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else getattr(source, "stream", source)
+    f.seek(0)
+    try:
+        yield f
+    finally:
+        if not f.closed:
+            f.seek(0)
+
+
+def _text_head(f, compression):
+    f.seek(0)
+    if compression == "gzip":
+        with gzip.GzipFile(fileobj=f) as unzipped:
+            head = unzipped.read(SNIFF_BYTES)
+    else:
+        head = f.read(SNIFF_BYTES)
+    f.seek(0)
+
+    text = head.decode("utf-8-sig", errors="replace")
+    lines = text.splitlines()
+    # The last line of a cut-off sample is usually incomplete
+    if len(head) == SNIFF_BYTES and len(lines) > 1:
+        lines = lines[:-1]
+    return [line for line in lines[:SNIFF_LINES] if line.strip()]
+
+
+def sniff_delimiter(lines):
+    """Delimiter that splits the header into most fields, consistently per row."""
+    best, best_score = ",", (0, 0)
+    for delimiter in DELIMITERS:
+        widths = [len(row) for row in csv.reader(lines, delimiter=delimiter)]
+        if not widths or widths[0] < 2:
+            continue
+        consistent = sum(width == widths[0] for width in widths)
+        score = (consistent, widths[0])
+        if score > best_score:
+            best, best_score = delimiter, score
+    return best
+
+
+def inspect(source):
+    """Format, compression and delimiter of a source: a dict."""
+    with _binary(source) as f:
+        magic = f.read(4)
+        if magic == PARQUET_MAGIC:
+            return {"format": "parquet", "compression": None, "delimiter": None}
+
+        compression = "gzip" if magic[:2] == GZIP_MAGIC else None
+        return {
+            "format": "csv",
+            "compression": compression,
+            "delimiter": sniff_delimiter(_text_head(f, compression)),
+        }
+
+
+def _header(f, info):
+    if info["format"] == "parquet":
+        names = pq.read_schema(f).names
+        f.seek(0)
+        return names
+    lines = _text_head(f, info["compression"])
+    return next(csv.reader(lines[:1], delimiter=info["delimiter"])) if lines else []
+
+
+def read_header(source):
+    """Column names of a CSV / gzip CSV / Parquet source, without reading rows."""
+    info = inspect(source)
+    with _binary(source) as f:
+        return _header(f, info)
+
+
+def _select(header, columns):
+    # ``columns`` is a list of names or a predicate (like pandas' usecols)
+    if columns is None:
+        return None
+    if callable(columns):
+        return [c for c in header if columns(c)]
+    wanted = set(columns)
+    return [c for c in header if c in wanted]
+
+
+def _arrow_types(dtypes, header):
+    types = {}
+    for col, dtype in (dtypes or {}).items():
+        arrow_type = ARROW_TYPES.get(str(dtype))
+        if arrow_type is not None and col in header:
+            types[col] = arrow_type
+    return types
+
+
+def _csv_stream(source, f, compression):
+    # Paths are opened (memory-mapped) by Arrow itself; other sources are
+    # handed over as one buffer so the caller's file object stays open
+    if isinstance(source, (str, os.PathLike)):
+        return pa.input_stream(os.fspath(source), compression=compression)
+    stream = pa.BufferReader(f.read())
+    return pa.CompressedInputStream(stream, compression) if compression else stream
+
+
+def read_table(source, columns=None, dtypes=None):
+    """Read a whole source into a DataFrame.
+
+    ``columns`` (names or a predicate) limits what is parsed; ``dtypes``
+    maps columns to "string" / "category" / "int8" / "float32" / ...
+    instead of letting the reader infer them.
+    """
+    info = inspect(source)
+
+    with _binary(source) as f:
+        header = _header(f, info)
+        include = _select(header, columns)
+
+        if info["format"] == "parquet":
+            return pq.read_table(f, columns=include).to_pandas()
+
+        table = pa_csv.read_csv(
+            _csv_stream(source, f, info["compression"]),
+            read_options=pa_csv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_BYTES),
+            parse_options=pa_csv.ParseOptions(delimiter=info["delimiter"]),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=include,
+                column_types=_arrow_types(dtypes, header),
+                strings_can_be_null=True,
+            ),
+        )
+    return table.to_pandas()
+
+
+def _rechunk(batches, chunk_rows):
+    # Arrow batches follow the read block size; regroup them into tables
+    # of exactly ``chunk_rows`` rows (the last one may be shorter)
+    pending, rows = [], 0
+    for batch in batches:
+        pending.append(batch)
+        rows += batch.num_rows
+        while rows >= chunk_rows:
+            table = pa.Table.from_batches(pending)
+            yield table.slice(0, chunk_rows)
+            rest = table.slice(chunk_rows)
+            pending, rows = rest.to_batches(), rest.num_rows
+    if rows:
+        yield pa.Table.from_batches(pending)
+
+
+def _iter_csv(source, f, info, chunk_rows, columns):
+    header = _header(f, info)
+    reader = pa_csv.open_csv(
+        _csv_stream(source, f, info["compression"]),
+        read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_BYTES),
+        parse_options=pa_csv.ParseOptions(delimiter=info["delimiter"]),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=_select(header, columns),
+            strings_can_be_null=True,
+        ),
+    )
+
+    done = 0
+    try:
+        for table in _rechunk(reader, chunk_rows):
+            yield table.to_pandas()
+            done += table.num_rows
+        return
+    except pa.ArrowInvalid as e:
+        print(f"⚠ Column types changed after row {done} ({e}); reading the rest with pandas")
+
+    # Carry on where Arrow stopped, header kept
+    f.seek(0)
+    rest = pd.read_csv(
+        f,
+        sep=info["delimiter"],
+        compression=info["compression"],
+        usecols=columns,
+        skiprows=range(1, done + 1),
+        chunksize=chunk_rows,
+    )
+    with rest:
+        yield from rest
+
+
+def iter_frames(source, chunk_rows, columns=None):
+    """Yield DataFrames of up to ``chunk_rows`` rows (bounded memory)."""
+    info = inspect(source)
+
+    with _binary(source) as f:
+        if info["format"] == "parquet":
+            parquet = pq.ParquetFile(f)
+            include = _select(parquet.schema_arrow.names, columns)
+            for batch in parquet.iter_batches(batch_size=chunk_rows, columns=include):
+                yield batch.to_pandas()
+            return
+
+        yield from _iter_csv(source, f, info, chunk_rows, columns)
@@ -0,0 +1,320 @@
+import bisect
+import contextvars
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+
+# ==========================================================
+# 🔥 HOT-PATH INSTRUMENTATION
+# ==========================================================
+#
+# Timers and counters for the scoring stages (CSV parsing, encoding,
+# scaling, model forward pass, rules, result writes, ledger appends),
+# exported as Prometheus text by app.py's /metrics and summarised in one
+# JSON log line per request / background job.
+#
+#   with timer("parse_csv") as t:       # or @timed("parse_csv")
+#       df = pd.read_csv(...)
+#       t.rows = len(df)
+#
+# Off unless CHURN_METRICS=1: ``timer`` then hands back one shared no-op
+# object, so an instrumented stage costs a function call and a branch.
+# CHURN_TRACE_MEMORY=1 also records peak traced memory per request/job
+# (tracemalloc slows allocation-heavy code; the peak counter is
+# process-wide, so concurrent requests see each other's allocations).
+
+ENABLED = os.environ.get("CHURN_METRICS", "0") == "1"
+TRACE_MEMORY = ENABLED and os.environ.get("CHURN_TRACE_MEMORY", "0") == "1"
+LOG_PATH = os.environ.get("CHURN_METRICS_LOG")
+
+# Latency buckets (seconds) shared by every histogram
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+PREFIX = "churn"
+
+logger = logging.getLogger("churn.metrics")
+
+
+def _setup_logger():
+    if logger.handlers:
+        return
+    handler = logging.FileHandler(LOG_PATH) if LOG_PATH else logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    """Thread-safe counters, gauges and histograms keyed by (name, labels)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.help = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, /, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, /, **labels):
+        with self._lock:
+            self.gauges[self._key(name, labels)] = value
+
+    def observe(self, name, value, /, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def describe(self, name, text):
+        self.help[name] = text
+
+    # -------------------------------
+    # Prometheus text format (0.0.4)
+    # -------------------------------
+
+    @staticmethod
+    def _labels(labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+    def _header(self, lines, name, kind):
+        if name in self.help:
+            lines.append(f"# HELP {name} {self.help[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    def render(self):
+        with self._lock:
+            counters = sorted(self.counters.items())
+            gauges = sorted(self.gauges.items())
+            histograms = sorted(self.histograms.items(), key=lambda item: item[0])
+            snapshot = [(key, list(h.counts), h.sum, h.count) for key, h in histograms]
+
+        lines = []
+        for kind, items in (("counter", counters), ("gauge", gauges)):
+            seen = set()
+            for (name, labels), value in items:
+                if name not in seen:
+                    self._header(lines, name, kind)
+                    seen.add(name)
+                lines.append(f"{name}{self._labels(labels)} {value}")
+
+        seen = set()
+        for (name, labels), counts, total, count in snapshot:
+            if name not in seen:
+                self._header(lines, name, "histogram")
+                seen.add(name)
+            cumulative = 0
+            for bound, bucket in zip(list(BUCKETS) + ["+Inf"], counts):
+                cumulative += bucket
+                lines.append(f"{name}_bucket{self._labels(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{name}_sum{self._labels(labels)} {total}")
+            lines.append(f"{name}_count{self._labels(labels)} {count}")
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+metrics.describe(f"{PREFIX}_stage_seconds", "Latency of one scoring stage")
+metrics.describe(f"{PREFIX}_stage_rows_total", "Rows processed by a scoring stage")
+metrics.describe(f"{PREFIX}_stage_rows_per_second", "Throughput of the last run of a stage")
+metrics.describe(f"{PREFIX}_requests_total", "HTTP requests by endpoint and status")
+metrics.describe(f"{PREFIX}_request_seconds", "HTTP request latency by endpoint")
+metrics.describe(f"{PREFIX}_jobs_total", "Background jobs by name and outcome")
+metrics.describe(f"{PREFIX}_job_seconds", "Background job latency by name and outcome")
+metrics.describe(f"{PREFIX}_peak_memory_bytes", "Peak traced memory of the last request/job")
+metrics.describe(f"{PREFIX}_prediction_cache_hits_total", "Rows answered from the prediction cache")
+metrics.describe(f"{PREFIX}_prediction_cache_misses_total", "Rows the model had to score")
+
+# Stages of the request / job running in this context
+_current_trace = contextvars.ContextVar("churn_trace", default=None)
+
+
+# ==========================================================
+# 🔥 STAGE TIMERS
+# ==========================================================
+
+class _NoopTimer:
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        # Shared by every caller while disabled: ignore ``t.rows = ...``
+        pass
+
+
+_NOOP = _NoopTimer()
+
+
+class _StageTimer:
+    __slots__ = ("stage", "rows", "_start")
+
+    def __init__(self, stage, rows=None):
+        self.stage = stage
+        self.rows = rows
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record_stage(self.stage, time.perf_counter() - self._start, self.rows)
+        return False
+
+
+def record_stage(stage, seconds, rows=None):
+    """Record one finished stage (used by the timers)."""
+    metrics.observe(f"{PREFIX}_stage_seconds", seconds, stage=stage)
+    if rows is not None:
+        metrics.inc(f"{PREFIX}_stage_rows_total", rows, stage=stage)
+        if seconds > 0:
+            metrics.set(f"{PREFIX}_stage_rows_per_second", round(rows / seconds, 1), stage=stage)
+
+    trace = _current_trace.get()
+    if trace is not None:
+        entry = trace["stages"].setdefault(stage, {"seconds": 0.0, "calls": 0})
+        entry["seconds"] += seconds
+        entry["calls"] += 1
+        if rows is not None:
+            entry["rows"] = entry.get("rows", 0) + rows
+
+
+def timer(stage, rows=None):
+    """Context manager timing one stage; set ``.rows`` on it to record throughput."""
+    if not ENABLED:
+        return _NOOP
+    return _StageTimer(stage, rows)
+
+
+def timed(stage):
+    """Decorator form of ``timer`` (no row count)."""
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _StageTimer(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def timed_iter(stage, iterable, rows=len):
+    """Yield from ``iterable``, timing each step (e.g. CSV chunk parsing)."""
+    if not ENABLED:
+        yield from iterable
+        return
+
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        record_stage(stage, time.perf_counter() - start, rows(item) if rows else None)
+        yield item
+
+
+def count(name, value=1, /, **labels):
+    if ENABLED:
+        metrics.inc(f"{PREFIX}_{name}", value, **labels)
+
+
+# ==========================================================
+# 🔥 PER-REQUEST / PER-JOB TRACES
+# ==========================================================
+
+def begin_trace(kind, /, **fields):
+    """Start collecting stages for the current request or job; returns a token."""
+    if not ENABLED:
+        return None
+    if TRACE_MEMORY:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+
+    trace = {
+        "kind": kind,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        **fields,
+        "stages": {},
+        "_start": time.perf_counter(),
+    }
+    return _current_trace.set(trace), trace
+
+
+def end_trace(token, labels=None, **fields):
+    """Finish a trace: count it, log it as one JSON line and return it.
+
+    ``labels`` go on the ``<kind>s_total`` counter and ``<kind>_seconds``
+    histogram (e.g. endpoint + status for requests); ``fields`` only into
+    the log line.
+    """
+    if token is None:
+        return None
+    reset_token, trace = token
+    _current_trace.reset(reset_token)
+
+    labels = labels or {}
+    seconds = time.perf_counter() - trace.pop("_start")
+    metrics.inc(f"{PREFIX}_{trace['kind']}s_total", **labels)
+    metrics.observe(f"{PREFIX}_{trace['kind']}_seconds", seconds, **labels)
+
+    trace.update(labels)
+    trace.update(fields)
+    trace["seconds"] = round(seconds, 6)
+    for entry in trace["stages"].values():
+        entry["seconds"] = round(entry["seconds"], 6)
+        if entry.get("rows") and entry["seconds"] > 0:
+            entry["rows_per_sec"] = round(entry["rows"] / entry["seconds"], 1)
+
+    if TRACE_MEMORY:
+        trace["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        metrics.set(f"{PREFIX}_peak_memory_bytes", trace["peak_memory_bytes"], kind=trace["kind"])
+
+    _setup_logger()
+    logger.info(json.dumps(trace, default=str))
+    return trace
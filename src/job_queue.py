@@ -0,0 +1,169 @@
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from safe_io import write_json_atomic
+from startup import lazy_import
+
+# Loaded on first use, so importing the queue does not pull in pandas / pyarrow
+results_store = lazy_import("results_store")
+
+
+# ==========================================================
+# 🔥 BACKGROUND SCORING QUEUE
+# ==========================================================
+#
+# Uploads are scored on a small thread pool (bounded by CPU cores) instead
+# of inside the request. Each job's status lives in memory and is mirrored
+# to uploads/jobs/<job_id>/status.json; finished jobs are kept for
+# JOB_TTL_SECONDS and then removed with their folder.
+
+STATUS_FILE = "status.json"
+JOB_TTL_SECONDS = 24 * 60 * 60
+CLEANUP_INTERVAL_SECONDS = 10 * 60
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+class JobQueue:
+
+    def __init__(self, max_workers=None, ttl_seconds=JOB_TTL_SECONDS,
+                 jobs_dir=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.ttl_seconds = ttl_seconds
+        self._jobs_dir = jobs_dir
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                        thread_name_prefix="score-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._last_cleanup = 0.0
+
+    @property
+    def jobs_dir(self):
+        # Resolved at call time: defaults to the result store's folder
+        return self._jobs_dir or results_store.JOBS_DIR
+
+    # ------------------------------------------------------
+    # Status
+    # ------------------------------------------------------
+
+    def _save_status(self, status):
+        folder = results_store.job_dir(status["job_id"])
+        os.makedirs(folder, exist_ok=True)
+        write_json_atomic(os.path.join(folder, STATUS_FILE), status)
+
+    def _update(self, job_id, **changes):
+        with self._lock:
+            status = self._jobs[job_id]
+            status.update(changes)
+            snapshot = dict(status)
+        self._save_status(snapshot)
+        return snapshot
+
+    def status(self, job_id):
+        """Current status dict of a job, or None if it is unknown/expired."""
+        with self._lock:
+            if job_id in self._jobs:
+                return dict(self._jobs[job_id])
+        try:
+            path = os.path.join(results_store.job_dir(job_id), STATUS_FILE)
+        except KeyError:
+            return None
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            return json.load(f)
+
+    # ------------------------------------------------------
+    # Submit / run
+    # ------------------------------------------------------
+
+    def submit(self, fn, *args, job_id=None, **meta):
+        """Queue ``fn(job_id, progress, *args)``; returns the job id.
+
+        ``progress(rows)`` should be called once per scored chunk.
+        """
+        self.cleanup()
+
+        job_id = job_id or results_store.new_job_id()
+        status = {
+            "job_id": job_id,
+            "state": QUEUED,
+            "submitted": _now(),
+            "started": None,
+            "finished": None,
+            "chunks_done": 0,
+            "rows_done": 0,
+            "error": None,
+            "result": None,
+            **meta
+        }
+        with self._lock:
+            self._jobs[job_id] = status
+        self._save_status(status)
+
+        self._pool.submit(self._run, job_id, fn, args)
+        return job_id
+
+    def _run(self, job_id, fn, args):
+        self._update(job_id, state=RUNNING, started=_now())
+        started = time.perf_counter()
+
+        def progress(rows):
+            with self._lock:
+                status = self._jobs[job_id]
+                status["chunks_done"] += 1
+                status["rows_done"] += int(rows)
+                snapshot = dict(status)
+            self._save_status(snapshot)
+
+        try:
+            result = fn(job_id, progress, *args)
+        except Exception as e:
+            print(f"❌ Job {job_id} failed:", e)
+            self._update(job_id, state=FAILED, finished=_now(), error=str(e),
+                         seconds=round(time.perf_counter() - started, 3))
+            return
+
+        self._update(job_id, state=DONE, finished=_now(), result=result,
+                     seconds=round(time.perf_counter() - started, 3))
+
+    # ------------------------------------------------------
+    # TTL cleanup
+    # ------------------------------------------------------
+
+    def cleanup(self, force=False):
+        """Remove job folders older than the TTL (at most every few minutes)."""
+        now = time.time()
+        if not force and now - self._last_cleanup < CLEANUP_INTERVAL_SECONDS:
+            return 0
+        self._last_cleanup = now
+
+        if not os.path.isdir(self.jobs_dir):
+            return 0
+
+        with self._lock:
+            active = {job_id for job_id, s in self._jobs.items() if s["state"] in (QUEUED, RUNNING)}
+
+        removed = 0
+        for job_id in os.listdir(self.jobs_dir):
+            folder = os.path.join(self.jobs_dir, job_id)
+            if job_id in active or not os.path.isdir(folder):
+                continue
+            if now - os.path.getmtime(folder) > self.ttl_seconds:
+                shutil.rmtree(folder, ignore_errors=True)
+                with self._lock:
+                    self._jobs.pop(job_id, None)
+                removed += 1
+
+        if removed:
+            print(f"🧹 Removed {removed} expired job(s)")
+        return removed
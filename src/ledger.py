@@ -0,0 +1,299 @@
+import atexit
+import json
+import os
+import struct
+import threading
+import zlib
+
+from safe_io import FileLock
+
+
+# ==========================================================
+# 🔥 LEDGER STORAGE ENGINE
+# ==========================================================
+#
+# Append-only segment log for blockchain records.
+#
+#   ledger.idx            fixed-size index entries (segment, offset, length)
+#   ledger-000000.seg     length-prefixed records: [length][crc32][json payload]
+#
+# Appends only touch the tail of the active segment and the index, so the
+# cost of writing a record no longer depends on the size of the ledger.
+# Any record (including the latest one) is found with a single index read.
+#
+# Writers in different processes (e.g. gunicorn workers) are serialised by
+# an exclusive lock on ledger.lock; readers never take the lock.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LEDGER_DIR = os.path.join(BASE_DIR, "blockchain")
+LEGACY_JSON_PATH = os.path.join(LEDGER_DIR, "ledger.json")
+
+INDEX_FILE = "ledger.idx"
+LOCK_FILE = "ledger.lock"
+SEGMENT_TEMPLATE = "ledger-{:06d}.seg"
+
+RECORD_HEADER = struct.Struct(">II")    # payload length, crc32
+INDEX_ENTRY = struct.Struct(">IQI")     # segment number, offset, payload length
+
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+DEFAULT_SYNC_EVERY = 32
+
+
+def _pread(fd, size, offset):
+    if hasattr(os, "pread"):
+        return os.pread(fd, size, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, size)
+
+
+def _encode(record):
+    return json.dumps(record, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class LedgerLog:
+    """Append-only, indexed ledger stored as length-prefixed JSON records."""
+
+    def __init__(self, directory=LEDGER_DIR, segment_bytes=DEFAULT_SEGMENT_BYTES,
+                 sync_every=DEFAULT_SYNC_EVERY):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.sync_every = max(1, int(sync_every))
+
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = FileLock(os.path.join(directory, LOCK_FILE))
+        self._pending = 0
+        self._readers = {}
+
+        flags = os.O_RDWR | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0)
+        self._index_fd = os.open(os.path.join(directory, INDEX_FILE), flags, 0o644)
+
+        with self._lock:
+            self._recover()
+
+    # ------------------------------------------------------
+    # Files
+    # ------------------------------------------------------
+
+    def _segment_path(self, segment):
+        return os.path.join(self.directory, SEGMENT_TEMPLATE.format(segment))
+
+    def _reader(self, segment):
+        fd = self._readers.get(segment)
+        if fd is None:
+            fd = os.open(self._segment_path(segment), os.O_RDONLY | getattr(os, "O_BINARY", 0))
+            self._readers[segment] = fd
+        return fd
+
+    def _open_active(self, segment):
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0)
+        self._active_segment = segment
+        self._active_fd = os.open(self._segment_path(segment), flags, 0o644)
+        self._active_size = os.fstat(self._active_fd).st_size
+
+    def _sync_tail(self):
+        # Another process may have appended or rolled to a newer segment
+        count = self._index_count()
+        if count:
+            segment = self._entry(count - 1)[0]
+            if segment > self._active_segment:
+                os.close(self._active_fd)
+                self._open_active(segment)
+                return
+        self._active_size = os.fstat(self._active_fd).st_size
+
+    def _index_count(self):
+        return os.fstat(self._index_fd).st_size // INDEX_ENTRY.size
+
+    def _entry(self, height):
+        raw = _pread(self._index_fd, INDEX_ENTRY.size, height * INDEX_ENTRY.size)
+        return INDEX_ENTRY.unpack(raw)
+
+    # ------------------------------------------------------
+    # Crash recovery
+    # ------------------------------------------------------
+
+    def _recover(self):
+        """Drop torn index entries and re-index complete records past the index tail."""
+        index_size = os.fstat(self._index_fd).st_size
+        count = index_size // INDEX_ENTRY.size
+        if index_size % INDEX_ENTRY.size:
+            os.ftruncate(self._index_fd, count * INDEX_ENTRY.size)
+
+        # Index entries pointing past the end of their segment are incomplete
+        while count > 0:
+            segment, offset, length = self._entry(count - 1)
+            path = self._segment_path(segment)
+            end = offset + RECORD_HEADER.size + length
+            if os.path.exists(path) and os.path.getsize(path) >= end:
+                break
+            count -= 1
+            os.ftruncate(self._index_fd, count * INDEX_ENTRY.size)
+
+        if count > 0:
+            segment, offset, length = self._entry(count - 1)
+            scan_from = offset + RECORD_HEADER.size + length
+        else:
+            segment, scan_from = 0, 0
+
+        self._open_active(segment)
+
+        # Records written to the segment but never indexed
+        position = scan_from
+        while position + RECORD_HEADER.size <= self._active_size:
+            length, crc = RECORD_HEADER.unpack(
+                _pread(self._reader(segment), RECORD_HEADER.size, position)
+            )
+            payload = _pread(self._reader(segment), length, position + RECORD_HEADER.size)
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                break
+            os.write(self._index_fd, INDEX_ENTRY.pack(segment, position, length))
+            position += RECORD_HEADER.size + length
+
+        if position < self._active_size:
+            os.ftruncate(self._active_fd, position)
+            self._active_size = position
+
+    # ------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------
+
+    def append(self, record):
+        """Append one record and return its height (0-based position)."""
+        payload = _encode(record)
+        header = RECORD_HEADER.pack(len(payload), zlib.crc32(payload))
+
+        with self._lock:
+            self._sync_tail()
+            if self._active_size and self._active_size + len(header) + len(payload) > self.segment_bytes:
+                self._roll()
+
+            offset = self._active_size
+            os.write(self._active_fd, header + payload)
+            self._active_size += len(header) + len(payload)
+
+            os.write(self._index_fd, INDEX_ENTRY.pack(self._active_segment, offset, len(payload)))
+            height = self._index_count() - 1
+
+            self._pending += 1
+            if self._pending >= self.sync_every:
+                self.flush()
+
+        return height
+
+    def _roll(self):
+        os.fsync(self._active_fd)
+        os.close(self._active_fd)
+        self._open_active(self._active_segment + 1)
+
+    def flush(self):
+        """fsync the active segment and the index (batched by ``sync_every``)."""
+        with self._lock:
+            if self._pending:
+                os.fsync(self._active_fd)
+                os.fsync(self._index_fd)
+                self._pending = 0
+
+    def locked(self):
+        """Exclusive writer lock, for read-then-append sequences (re-entrant)."""
+        return self._lock
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            for fd in self._readers.values():
+                os.close(fd)
+            self._readers.clear()
+            os.close(self._active_fd)
+            os.close(self._index_fd)
+        self._lock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------
+
+    def __len__(self):
+        return self._index_count()
+
+    def read(self, height):
+        """Return the record at ``height`` (negative heights count from the end)."""
+        count = len(self)
+        if height < 0:
+            height += count
+        if not 0 <= height < count:
+            raise IndexError("ledger height out of range")
+
+        segment, offset, length = self._entry(height)
+        payload = _pread(self._reader(segment), length, offset + RECORD_HEADER.size)
+        return json.loads(payload)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self.read(i) for i in range(*key.indices(len(self)))]
+        return self.read(key)
+
+    def __iter__(self):
+        return self.iter_range()
+
+    def iter_range(self, start=0, stop=None):
+        stop = len(self) if stop is None else min(stop, len(self))
+        for height in range(start, stop):
+            yield self.read(height)
+
+    def latest(self):
+        """O(1) access to the newest record, or None for an empty ledger."""
+        return self.read(-1) if len(self) else None
+
+    def tail(self, n):
+        """Return the last ``n`` records in chronological order."""
+        count = len(self)
+        return list(self.iter_range(max(0, count - n), count))
+
+    # ------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------
+
+    def migrate_json(self, json_path):
+        """One-time import of a legacy ``ledger.json`` list into an empty log."""
+        with self._lock:
+            if len(self) or not os.path.exists(json_path):
+                return 0
+
+            with open(json_path, "r") as f:
+                records = json.load(f)
+
+            for record in records:
+                self.append(record)
+            self.flush()
+
+            os.replace(json_path, json_path + ".migrated")
+        print(f"✅ Migrated {len(records)} ledger records from {json_path}")
+        return len(records)
+
+
+# ==========================================================
+# 🔥 SHARED LEDGER HANDLES
+# ==========================================================
+
+_ledgers = {}
+_ledgers_lock = threading.Lock()
+
+
+def open_ledger(directory=LEDGER_DIR, legacy_json=LEGACY_JSON_PATH, **kwargs):
+    """Return the process-wide ledger for ``directory``, migrating legacy JSON once."""
+    key = os.path.abspath(directory)
+    with _ledgers_lock:
+        ledger = _ledgers.get(key)
+        if ledger is None:
+            ledger = LedgerLog(directory, **kwargs)
+            if legacy_json:
+                ledger.migrate_json(legacy_json)
+            atexit.register(ledger.flush)
+            _ledgers[key] = ledger
+    return ledger
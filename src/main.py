@@ -1,11 +1,15 @@
+import argparse
+import json
 import os
-import pandas as pd
+import shutil
 
+from create_combined_dataset import create_combined_dataset
 from preprocess import preprocess_combined
-from feature_selection import select_features
-from train_ann import train_ann_model
+from feature_selection import MI_MODES, select_features
 from blockchain_storage import store_blockchain_record
 from visualize_results import visualize_results
+from artifact_store import ArtifactStore
+from pipeline import Pipeline, Stage
 
 
 # ==========================================================
@@ -19,91 +23,174 @@ DATASET_DIR = os.path.join(PROJECT_DIR, "datasets")
 OUTPUT_DIR = os.path.join(PROJECT_DIR, "outputs")
 MODELS_DIR = os.path.join(PROJECT_DIR, "models")
 
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-os.makedirs(MODELS_DIR, exist_ok=True)
+TIMINGS_PATH = os.path.join(OUTPUT_DIR, "pipeline_timings.json")
 
-print("\n📂 Project Initialized")
-print("Datasets Folder:", DATASET_DIR)
+MODEL_NAME = "multi_domain_ann"
+TOP_K = 25
 
-
-# ==========================================================
-# 🔥 STEP 1 — LOAD COMBINED DATASET
-# ==========================================================
-
-combined_path = os.path.join(DATASET_DIR, "combined_data.csv")
-
-if not os.path.exists(combined_path):
-    print("❌ combined_data.csv NOT FOUND!")
-    print("Run create_combined_dataset.py first.")
-    exit()
-
-print("\n✅ Combined Dataset Found:", combined_path)
-
-
-# ==========================================================
-# 🔥 STEP 2 — PREPROCESS
-# ==========================================================
-
-processed_path = os.path.join(OUTPUT_DIR, "preprocessed_combined.csv")
-
-preprocess_combined(
-    file_path=combined_path,
-    output_path=processed_path
-)
-
-
-# ==========================================================
-# 🔥 STEP 3 — FEATURE SELECTION
-# ==========================================================
-
-selected_path = os.path.join(OUTPUT_DIR, "selected_features.csv")
-
-select_features(
-    file_path=processed_path,
-    output_path=selected_path,
-    top_k=25
-)
-
-
-# ==========================================================
-# 🔥 STEP 4 — TRAIN ANN MODEL (WITH SMOTE + AUTO THRESHOLD)
-# ==========================================================
-
-model = train_ann_model(
-    data_path=selected_path,     # ✅ change here
-    target_column="Churn",
-    model_name="multi_domain_ann",
-    models_folder=MODELS_DIR
-)
+RAW_DATASETS = [
+    os.path.join(DATASET_DIR, "telecom.csv"),
+    os.path.join(DATASET_DIR, "banking.csv"),
+    os.path.join(DATASET_DIR, "ecommerce.csv"),
+]
 
 
 # ==========================================================
-# 🔥 STEP 5 — STORE MODEL RESULT IN BLOCKCHAIN
+# 🔥 STAGES
 # ==========================================================
 
-print("\n🔗 Storing Result in Blockchain...")
-
-blockchain_data = {
-    "model": "Multi Domain ANN",
-    "dataset": "Combined Telecom + Banking + Ecommerce",
-    "status": "Trained Successfully"
-}
-
-store_blockchain_record(blockchain_data)
-
-print("✅ Blockchain Record Stored")
+def combine_stage(inputs, outputs, params):
+    create_combined_dataset(dataset_dir=DATASET_DIR, save_path=outputs["data"])
+
+
+def preprocess_stage(inputs, outputs, params):
+    preprocess_combined(
+        file_path=inputs[0],
+        output_path=outputs["data"],
+        transformer_path=outputs["transformer"]
+    )
+
+
+def feature_selection_stage(inputs, outputs, params):
+    select_features(
+        file_path=inputs[0],
+        output_path=outputs["data"],
+        top_k=params["top_k"],
+        mi_mode=params["mi_mode"],
+        error_budget=params["error_budget"]
+    )
+
+
+def train_stage(inputs, outputs, params):
+    # TensorFlow loads only when training runs, not for cached or partial runs
+    from train_ann import artifact_paths, train_ann_model
+
+    # 🔥 TRAIN ANN MODEL (WITH SMOTE + AUTO THRESHOLD)
+    _, metrics = train_ann_model(
+        data_path=inputs[0],
+        target_column="Churn",
+        model_name=params["model_name"],
+        models_folder=MODELS_DIR,
+        hyperparams=params["hyperparams"]
+    )
+    # Fitted encoder of the model just saved, used at inference time (the
+    # registry's set for that model points at it). Copied only once the
+    # model and its export exist, so a failed run leaves the old pair.
+    shutil.copyfile(inputs[1], artifact_paths(MODELS_DIR, params["model_name"])["transformer"])
+
+    with open(outputs["model"], "w") as f:
+        json.dump({
+            "model_path": os.path.join(MODELS_DIR, params["model_name"] + ".keras"),
+            "threshold": metrics["threshold"],
+            "f1": metrics["f1"],
+        }, f, indent=2)
+
+
+def ledger_stage(inputs, outputs, params):
+    print("\n🔗 Storing Result in Blockchain...")
+
+    blockchain_data = {
+        "model": "Multi Domain ANN",
+        "dataset": "Combined Telecom + Banking + Ecommerce",
+        "status": "Trained Successfully"
+    }
+
+    store_blockchain_record(blockchain_data)
+
+    print("✅ Blockchain Record Stored")
+
+
+def visualize_stage(inputs, outputs, params):
+    with open(inputs[1], "r") as f:
+        model_path = json.load(f)["model_path"]
+
+    visualize_results(
+        model_path=model_path,
+        dataset_path=inputs[0],
+        output_folder=OUTPUT_DIR
+    )
+
+
+def build_pipeline(top_k=TOP_K, model_name=MODEL_NAME, mi_mode="knn", error_budget=None,
+                   hyperparams=None):
+    stages = [
+        Stage("combine", combine_stage,
+              inputs=RAW_DATASETS,
+              outputs={"data": "combined_data.parquet"}),
+        Stage("preprocess", preprocess_stage,
+              inputs=[("combine", "data")],
+              outputs={"data": "preprocessed_combined.parquet", "transformer": "transformer.pkl"}),
+        Stage("feature_selection", feature_selection_stage,
+              inputs=[("preprocess", "data")],
+              outputs={"data": "selected_features.parquet"},
+              params={"top_k": top_k, "mi_mode": mi_mode, "error_budget": error_budget}),
+        Stage("train", train_stage,
+              inputs=[("feature_selection", "data"), ("preprocess", "transformer")],
+              outputs={"model": "model.json"},
+              params={"model_name": model_name, "hyperparams": hyperparams or {}}),
+        # Ledger logging and visualization only depend on training,
+        # so they run concurrently
+        Stage("ledger", ledger_stage,
+              inputs=[("train", "model")]),
+        Stage("visualize", visualize_stage,
+              inputs=[("feature_selection", "data"), ("train", "model")]),
+    ]
+    return Pipeline(stages, store=ArtifactStore(), timings_path=TIMINGS_PATH)
 
 
 # ==========================================================
-# 🔥 STEP 6 — VISUALIZE RESULTS
+# 🔥 RUN
 # ==========================================================
 
-print("\n📊 Generating Visual Reports...")
-
-visualize_results(
-    model_path=os.path.join(MODELS_DIR, "multi_domain_ann.keras"),
-    dataset_path=selected_path
-)
-
-print("\n🎉 PROJECT EXECUTION COMPLETED SUCCESSFULLY 🚀")
-print("Check models / outputs / blockchain folders.")
\ No newline at end of file
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-domain churn training pipeline")
+    parser.add_argument("--from", dest="start_from", default=None,
+                        help="Force this stage and everything downstream to re-run")
+    parser.add_argument("--until", default=None,
+                        help="Stop after this stage (runs only what it needs)")
+    parser.add_argument("--force", action="store_true", help="Ignore all cached stages")
+    parser.add_argument("--top-k", type=int, default=TOP_K)
+    parser.add_argument("--mi-mode", choices=MI_MODES, default="knn",
+                        help="Mutual information estimator for feature selection")
+    parser.add_argument("--mi-error-budget", type=float, default=None,
+                        help="Score MI on growing row subsamples until scores move less than this")
+    parser.add_argument("--epochs", type=int, default=None, help="Max training epochs")
+    parser.add_argument("--batch-size", type=int, default=None, help="Training batch size")
+    parser.add_argument("--learning-rate", type=float, default=None)
+    parser.add_argument("--workers", type=int, default=2,
+                        help="Max stages running concurrently")
+    args = parser.parse_args(argv)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    os.makedirs(MODELS_DIR, exist_ok=True)
+
+    print("\n📂 Project Initialized")
+    print("Datasets Folder:", DATASET_DIR)
+
+    hyperparams = {
+        key: value for key, value in (
+            ("max_epochs", args.epochs),
+            ("batch_size", args.batch_size),
+            ("learning_rate", args.learning_rate),
+        ) if value is not None
+    }
+
+    pipeline = build_pipeline(
+        top_k=args.top_k,
+        mi_mode=args.mi_mode,
+        error_budget=args.mi_error_budget,
+        hyperparams=hyperparams
+    )
+    pipeline.run(
+        start_from=args.start_from,
+        until=args.until,
+        force=args.force,
+        max_workers=args.workers
+    )
+
+    print("\n🎉 PROJECT EXECUTION COMPLETED SUCCESSFULLY 🚀")
+    print("Check models / outputs / blockchain folders.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import hashlib
+import os
+import threading
+from collections import namedtuple
+
+import joblib
+
+from numpy_engine import NumpyEngine, file_digest, npz_path, source_digest
+
+
+# ==========================================================
+# 🔥 MODEL REGISTRY
+# ==========================================================
+#
+# Loads every model / scaler / feature-list artifact once per process and
+# hands the same objects to app.py, predict.py and visualize_results.py.
+# Entries are keyed by absolute path and revalidated with a cheap stat()
+# on each lookup, so a retrained model on disk is hot-reloaded.
+#
+# A model exported with numpy_engine.py (``<model>.npz`` next to the
+# .keras / .h5 file, recording that file's digest) is served instead of
+# the Keras file while the digests match, so scoring never imports
+# TensorFlow. CHURN_NUMPY_ENGINE=0 turns this off.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(BASE_DIR, "models")
+
+ARTIFACT_SETS = {
+    "combined": {
+        "model": "combined_ann.keras",
+        "scaler": "combined_scaler.pkl",
+        "features": "combined_features.pkl",
+        # preprocess_combined fitted on datasets/combined_data.csv, the
+        # encoding combined_ann.keras was trained on
+        "transformer": "combined_transformer.pkl",
+    },
+    # Written by the main.py pipeline (train_ann.train_ann_model)
+    "multi_domain": {
+        "model": "multi_domain_ann.keras",
+        "scaler": "multi_domain_ann_scaler.pkl",
+        "features": "multi_domain_ann_features.pkl",
+        "transformer": "multi_domain_ann_transformer.pkl",
+    },
+    "telecom": {
+        "model": "telecom_ann.h5",
+        "scaler": "telecom_ann_scaler.pkl",
+    },
+    "banking": {
+        "model": "banking_ann.h5",
+        "scaler": "banking_ann_scaler.pkl",
+    },
+    "ecommerce": {
+        "model": "ecommerce_ann.h5",
+        "scaler": "ecommerce_ann_scaler.pkl",
+    },
+}
+
+PREFER_NPZ = os.environ.get("CHURN_NUMPY_ENGINE", "1") != "0"
+
+Artifacts = namedtuple(
+    "Artifacts", ["name", "model", "scaler", "features", "transformer", "fingerprint"]
+)
+
+_Entry = namedtuple("_Entry", ["stat_key", "value", "digest"])
+
+
+def _load_keras(path):
+    # Imported lazily so non-model code paths never pay for TensorFlow
+    from tensorflow.keras.models import load_model
+    return load_model(path)
+
+
+LOADERS = {
+    ".keras": _load_keras,
+    ".h5": _load_keras,
+    ".pkl": joblib.load,
+    ".npz": NumpyEngine.load,
+}
+
+
+def _stat_key(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class ModelRegistry:
+    """Process-wide cache of loaded artifacts with mtime-based hot reload."""
+
+    def __init__(self, models_dir=MODELS_DIR, artifact_sets=ARTIFACT_SETS, prefer_npz=PREFER_NPZ):
+        self.models_dir = models_dir
+        self.artifact_sets = artifact_sets
+        self.prefer_npz = prefer_npz
+        self._entries = {}
+        self._engines = {}
+        self._exports = {}
+        self._lock = threading.RLock()
+
+    def _resolve(self, path):
+        # Bare file names live in models/; other relative paths follow the cwd
+        if not os.path.dirname(path):
+            path = os.path.join(self.models_dir, path)
+        return os.path.abspath(path)
+
+    def model_file(self, name_or_path, prefer_npz=None):
+        """Model file to load for a set name or model path.
+
+        The exported .npz is preferred while the digest it recorded matches
+        the Keras file (mtimes are arbitrary after a checkout); a retrained,
+        not yet exported model wins.
+        """
+        spec = self.artifact_sets.get(name_or_path)
+        path = self._resolve(spec["model"] if spec else name_or_path)
+        if prefer_npz is None:
+            prefer_npz = self.prefer_npz
+
+        exported = npz_path(path)
+        if prefer_npz and exported != path and os.path.exists(exported):
+            if not os.path.exists(path) or self._export_is_current(exported, path):
+                return exported
+        return path
+
+    def _export_is_current(self, exported, source):
+        # Both digests are recomputed only when either file changes
+        stat_key = (_stat_key(exported), _stat_key(source))
+        with self._lock:
+            cached = self._exports.get(exported)
+            if cached is None or cached[0] != stat_key:
+                cached = (stat_key, source_digest(exported) == file_digest(source))
+                self._exports[exported] = cached
+            return cached[1]
+
+    def _entry(self, path):
+        path = self._resolve(path)
+        stat_key = _stat_key(path)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry.stat_key != stat_key:
+                loader = LOADERS.get(os.path.splitext(path)[1].lower())
+                if loader is None:
+                    raise ValueError(f"❌ No loader registered for artifact: {path}")
+
+                print("📦 Loading artifact:", path)
+                entry = _Entry(stat_key, loader(path), file_digest(path))
+                self._entries[path] = entry
+            return entry
+
+    def load(self, path):
+        """Return the loaded object for one artifact file."""
+        return self._entry(path).value
+
+    def digest(self, path):
+        """SHA256 of the artifact content as currently loaded."""
+        return self._entry(path).digest
+
+    def get(self, name):
+        """Return the ``Artifacts`` for a named set from ``ARTIFACT_SETS``."""
+        spec = self.artifact_sets[name]
+
+        loaded = {}
+        digests = []
+        for role in ("model", "scaler", "features", "transformer"):
+            if role not in spec:
+                continue
+            path = self.model_file(name) if role == "model" else spec[role]
+            entry = self._entry(path)
+            loaded[role] = entry.value
+            digests.append(entry.digest)
+
+        fingerprint = hashlib.sha256("".join(digests).encode()).hexdigest()
+        return Artifacts(
+            name,
+            loaded.get("model"),
+            loaded.get("scaler"),
+            loaded.get("features"),
+            loaded.get("transformer"),
+            fingerprint
+        )
+
+    def engine(self, name_or_path, n_features=None):
+        """Return the inference engine for a model set name or model file.
+
+        Exported models load straight into a ``NumpyEngine``; Keras models
+        are wrapped in the compiled ``InferenceEngine``. The engine is
+        rebuilt together with the model when the file changes.
+        """
+        path = self.model_file(name_or_path)
+        entry = self._entry(path)
+        if isinstance(entry.value, NumpyEngine):
+            return entry.value
+
+        with self._lock:
+            cached = self._engines.get(path)
+            if cached is None or cached[0] != entry.stat_key:
+                from inference import InferenceEngine
+
+                model = entry.value
+                if n_features is None:
+                    n_features = model.inputs[0].shape[-1]
+                cached = (entry.stat_key, InferenceEngine(model, n_features))
+                self._engines[path] = cached
+            return cached[1]
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._engines.clear()
+                self._exports.clear()
+            else:
+                self._entries.pop(self._resolve(path), None)
+                self._engines.pop(self._resolve(path), None)
+                self._exports.pop(self._resolve(path), None)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """The single registry shared by every entry point in this process."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+    return _registry
@@ -0,0 +1,187 @@
+import argparse
+import hashlib
+import os
+
+import numpy as np
+
+
+# ==========================================================
+# 🔥 NUMPY INFERENCE ENGINE (NO TENSORFLOW)
+# ==========================================================
+#
+# The churn models are plain Dense stacks (Dropout is a no-op at inference),
+# so serving only needs their weights. ``export_npz`` dumps a trained Keras
+# Sequential model to ``<model>.npz``; ``NumpyEngine`` runs the forward pass
+# with NumPy alone: one matmul per layer into a float32 buffer, with bias
+# and activation applied in place on that buffer. Weights may be stored as float16 to
+# halve the file; they are widened to float32 once at load.
+#
+# .npz layout:
+#   W0, b0, W1, b1, ...   kernels (in, out) and biases per Dense layer
+#   activations           activation name per Dense layer
+#   n_features            input width
+#   source_sha256         digest of the .keras / .h5 file it was exported
+#                         from (the registry serves the export only while
+#                         that file is unchanged)
+
+ACTIVATIONS = ("relu", "sigmoid", "linear")
+SKIPPED_LAYERS = ("Dropout", "InputLayer")
+
+# Rows per forward chunk: bounds the activation buffers for big uploads
+CHUNK_ROWS = 4096
+
+
+def npz_path(model_path):
+    """The .npz file exported next to a .keras / .h5 model."""
+    return os.path.splitext(model_path)[0] + ".npz"
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def source_digest(path):
+    """``source_sha256`` of an export, or None for exports that predate it."""
+    with np.load(path, allow_pickle=False) as data:
+        return str(data["source_sha256"]) if "source_sha256" in data.files else None
+
+
+def export_npz(model, path, float16=False, source_path=None):
+    """Write the Dense weights of a Keras Sequential model to ``path``.
+
+    ``source_path`` is the saved model file ``model`` came from; its
+    digest is stored with the weights.
+    """
+    arrays = {}
+    activations = []
+    dtype = np.float16 if float16 else np.float32
+
+    for layer in model.layers:
+        kind = layer.__class__.__name__
+        if kind in SKIPPED_LAYERS:
+            continue
+        if kind != "Dense":
+            raise ValueError(f"❌ Cannot export layer {layer.name} ({kind}): only Dense/Dropout supported")
+
+        activation = layer.get_config().get("activation", "linear")
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"❌ Unsupported activation in {layer.name}: {activation}")
+
+        kernel, bias = layer.get_weights()
+        i = len(activations)
+        arrays[f"W{i}"] = kernel.astype(dtype)
+        arrays[f"b{i}"] = bias.astype(dtype)
+        activations.append(activation)
+
+    if not activations:
+        raise ValueError("❌ Model has no Dense layers to export")
+
+    n_features = arrays["W0"].shape[0]
+    if source_path:
+        arrays["source_sha256"] = np.array(file_digest(source_path))
+
+    # np.savez appends .npz to names without it, so write through an open file
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, activations=np.array(activations), n_features=np.array(n_features), **arrays)
+    os.replace(tmp_path, path)
+    return path
+
+
+class NumpyEngine:
+    """Forward pass of an exported Dense stack; drop-in for ``InferenceEngine``."""
+
+    def __init__(self, weights, biases, activations):
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.ascontiguousarray(b, dtype=np.float32) for b in biases]
+        self.activations = list(activations)
+        self.n_features = self.weights[0].shape[0]
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            activations = [str(a) for a in data["activations"]]
+            weights = [data[f"W{i}"] for i in range(len(activations))]
+            biases = [data[f"b{i}"] for i in range(len(activations))]
+        return cls(weights, biases, activations)
+
+    def _forward(self, X):
+        out = X
+        for W, b, activation in zip(self.weights, self.biases, self.activations):
+            buf = np.empty((len(out), W.shape[1]), dtype=np.float32)
+            np.matmul(out, W, out=buf)
+            buf += b
+
+            if activation == "relu":
+                np.maximum(buf, 0.0, out=buf)
+            elif activation == "sigmoid":
+                # exp(-|x|) never overflows; fold the sign back in afterwards
+                neg = buf < 0
+                np.exp(-np.abs(buf), out=buf)
+                buf[neg] = buf[neg] / (1.0 + buf[neg])
+                buf[~neg] = 1.0 / (1.0 + buf[~neg])
+            out = buf
+        return out
+
+    def predict_proba(self, X):
+        """Return churn probabilities as a flat float32 array."""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(
+                f"❌ Expected {self.n_features} features, got {X.shape[1]}"
+            )
+
+        probs = np.empty(len(X), dtype=np.float32)
+        for start in range(0, len(X), CHUNK_ROWS):
+            chunk = X[start:start + CHUNK_ROWS]
+            probs[start:start + len(chunk)] = self._forward(chunk).reshape(-1)
+        return probs
+
+
+# ==========================================================
+# 🔥 EXPORT CLI
+# ==========================================================
+
+def export_model_file(model_path, float16=False, check_rows=256):
+    """Export one .keras / .h5 file and check the engine against Keras."""
+    from tensorflow.keras.models import load_model
+
+    model = load_model(model_path, compile=False)
+    path = export_npz(model, npz_path(model_path), float16=float16, source_path=model_path)
+
+    engine = NumpyEngine.load(path)
+    X = np.random.default_rng(0).standard_normal((check_rows, engine.n_features)).astype(np.float32)
+    diff = np.max(np.abs(engine.predict_proba(X) - model(X, training=False).numpy().reshape(-1)))
+
+    print(f"✅ Exported {path} ({os.path.getsize(path) / 1024:.1f} KB, max |Δ| vs Keras {diff:.2e})")
+    return path, diff
+
+
+def main(argv=None):
+    from model_registry import get_registry
+
+    parser = argparse.ArgumentParser(description="Export Keras churn models to NumPy .npz weights")
+    parser.add_argument("models", nargs="*",
+                        help="Model files or registry set names (default: every registry set)")
+    parser.add_argument("--float16", action="store_true", help="Store weights as float16")
+    args = parser.parse_args(argv)
+
+    registry = get_registry()
+    targets = args.models or list(registry.artifact_sets)
+
+    for target in targets:
+        path = registry.model_file(target, prefer_npz=False)
+        if not os.path.exists(path):
+            print("⚠ Skipping missing model:", path)
+            continue
+        export_model_file(path, float16=args.float16)
+
+
+if __name__ == "__main__":
+    main()
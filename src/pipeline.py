@@ -0,0 +1,176 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+
+from artifact_store import ArtifactStore
+
+
+# ==========================================================
+# 🔥 INCREMENTAL PIPELINE RUNNER
+# ==========================================================
+#
+# Stages declare their inputs (files, or outputs of other stages),
+# outputs and parameters. Each stage is fingerprinted through the
+# ArtifactStore, so a stage whose inputs and parameters are unchanged is
+# skipped. Stages whose dependencies are satisfied run concurrently.
+
+
+class Stage:
+    """One pipeline step.
+
+    ``inputs`` items are file paths or ``(stage_name, output_name)`` references.
+    ``fn(inputs, outputs, params)`` gets the resolved input paths (in order),
+    the {name: path} of its outputs and its params.
+    """
+
+    def __init__(self, name, fn, inputs=(), outputs=None, params=None, after=()):
+        self.name = name
+        self.fn = fn
+        self.inputs = list(inputs)
+        self.outputs = outputs or {"done": "done.json"}
+        self.params = params or {}
+        self.deps = {ref[0] for ref in self.inputs if isinstance(ref, tuple)} | set(after)
+
+
+class Pipeline:
+
+    def __init__(self, stages, store=None, timings_path=None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.order = self._topological_order()
+        self.store = store or ArtifactStore()
+        self.timings_path = timings_path
+        self.results = {}
+        self.timings = {}
+
+    def _topological_order(self):
+        order, visiting, done = [], set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"❌ Pipeline cycle at stage: {name}")
+            if name not in self.stages:
+                raise ValueError(f"❌ Unknown stage: {name}")
+            visiting.add(name)
+            for dep in sorted(self.stages[name].deps):
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def _ancestors(self, name):
+        seen, stack = set(), [name]
+        while stack:
+            for dep in self.stages[stack.pop()].deps:
+                if dep not in seen:
+                    seen.add(dep)
+                    stack.append(dep)
+        return seen
+
+    def _descendants(self, name):
+        return {n for n in self.order if name in self._ancestors(n)}
+
+    def _resolve_inputs(self, stage):
+        return [
+            self.results[ref[0]][ref[1]] if isinstance(ref, tuple) else ref
+            for ref in stage.inputs
+        ]
+
+    def _run_stage(self, name, force):
+        stage = self.stages[name]
+        inputs = self._resolve_inputs(stage)
+        start = time.perf_counter()
+
+        def build(outputs):
+            stage.fn(inputs, outputs, stage.params)
+            # Guarantee every declared output exists for the manifest
+            for path in outputs.values():
+                if not os.path.exists(path):
+                    with open(path, "w") as f:
+                        json.dump({"stage": name, "finished": str(datetime.now())}, f)
+
+        key = self.store.key(name, inputs, stage.params)
+        cached = None if force else self.store.lookup(name, key)
+
+        if cached is not None:
+            print(f"⏭ Stage '{name}' unchanged — skipped")
+            outputs, status = cached, "skipped"
+        else:
+            print(f"\n▶ Running stage '{name}'...")
+            try:
+                outputs = self.store.run(name, build, stage.outputs, inputs, stage.params, force=True)
+            except Exception:
+                self.timings[name] = {"status": "failed", "seconds": round(time.perf_counter() - start, 3)}
+                raise
+            status = "ran"
+
+        self.timings[name] = {"status": status, "seconds": round(time.perf_counter() - start, 3)}
+        return outputs
+
+    def run(self, start_from=None, until=None, force=False, max_workers=2):
+        """Run the DAG; ``start_from`` forces that stage and everything downstream."""
+        selected = list(self.order)
+        if until:
+            keep = self._ancestors(until) | {until}
+            selected = [n for n in selected if n in keep]
+
+        forced = set(selected) if force else set()
+        if start_from:
+            forced |= {start_from} | self._descendants(start_from)
+
+        pending = list(selected)
+        running = {}
+        wall_start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while pending or running:
+                for name in list(pending):
+                    if all(dep in self.results for dep in self.stages[name].deps):
+                        pending.remove(name)
+                        running[pool.submit(self._run_stage, name, name in forced)] = name
+
+                if not running:
+                    raise RuntimeError(f"❌ Unresolvable stages: {pending}")
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                try:
+                    for future in finished:
+                        name = running.pop(future)
+                        self.results[name] = future.result()
+                except Exception:
+                    # Let stages already in flight finish, then report what ran
+                    wait(running)
+                    self._report(round(time.perf_counter() - wall_start, 3))
+                    raise
+
+        total = round(time.perf_counter() - wall_start, 3)
+        self._report(total)
+        return self.results
+
+    def _report(self, total):
+        print("\n⏱ Stage Timings")
+        for name in self.order:
+            if name in self.timings:
+                t = self.timings[name]
+                print(f"   {name:<20} {t['status']:<8} {t['seconds']:>9.3f}s")
+        print(f"   {'TOTAL (wall)':<20} {'':<8} {total:>9.3f}s")
+
+        if self.timings_path:
+            history = []
+            if os.path.exists(self.timings_path):
+                with open(self.timings_path, "r") as f:
+                    history = json.load(f)
+            history.append({
+                "timestamp": str(datetime.now()),
+                "total_seconds": total,
+                "stages": self.timings
+            })
+            with open(self.timings_path, "w") as f:
+                json.dump(history, f, indent=4)
@@ -1,79 +1,148 @@
 # predict.py
 
+import argparse
 import pandas as pd
 import numpy as np
-import joblib
 import os
-from tensorflow.keras.models import load_model
 
+from rule_engine import risk_levels
+from model_registry import get_registry
+from feature_transformer import build_model_input
+from domain_router import DomainRouter
+from ingest import iter_frames, read_table
+from prediction_cache import get_prediction_cache, predict_cached
+from results_store import ParquetChunkWriter
 
-MODEL_PATH = "../models/combined_ann.keras"
-SCALER_PATH = "../models/combined_scaler.pkl"
-FEATURE_PATH = "../models/combined_features.pkl"
 
+MODEL_SET = "combined"
 
-def risk_level(prob):
 
-    if prob < 0.3:
-        return "LOW"
-    elif prob < 0.7:
-        return "MEDIUM"
-    else:
-        return "HIGH"
+def score_frame(df, artifacts, engine, threshold=0.5, cache=None):
+    """Align, scale and score one frame; returns features + prediction columns.
 
+    With a ``PredictionCache`` only rows not scored before reach the model.
+    """
 
-def predict_churn(input_file, output_file, threshold=0.5):
+    # Remove target if exists
+    if "Churn" in df.columns:
+        df = df.drop("Churn", axis=1)
 
-    print("\n----------------------------------------")
-    print("📌 Predicting Churn for File:", input_file)
+    # Encode with the fitted training transformer straight into float32
+    # (category -> column maps are fixed, so every chunk aligns identically)
+    X, X_scaled = build_model_input(df, artifacts)
+    df = pd.DataFrame(X, columns=artifacts.features)
+
+    # Predict probability (cached rows are looked up, not rescored)
+    probs = predict_cached(engine, X, X_scaled, artifacts.name, artifacts.fingerprint, cache)
 
-    df = pd.read_csv(input_file)
+    df["Churn_Probability"] = probs
 
-    print("✅ Input File Loaded")
-    print("📊 Input Shape:", df.shape)
+    # Apply threshold
+    df["Churn_Prediction"] = (probs >= threshold).astype(int)
+
+    # Add Risk Level
+    df["Risk_Level"] = risk_levels(probs, bands="predict")
+
+    return df
+
+
+def score_frame_routed(df, router, threshold=0.5):
+    """Score each row with its domain's model; returns input columns + prediction columns."""
 
-    # Remove target if exists
     if "Churn" in df.columns:
         df = df.drop("Churn", axis=1)
 
-    # Load model
-    model = load_model(MODEL_PATH)
-    print("✅ Model Loaded")
+    probs, domains = router.predict_proba(df)
 
-    scaler = joblib.load(SCALER_PATH)
-    print("✅ Scaler Loaded")
+    df = df.copy()
+    df["Scored_Domain"] = pd.Series(domains, index=df.index).fillna(router.fallback).astype(str)
+    df["Churn_Probability"] = probs
+    df["Churn_Prediction"] = (probs >= threshold).astype(int)
+    df["Risk_Level"] = risk_levels(probs, bands="predict")
 
-    feature_list = joblib.load(FEATURE_PATH)
-    print("✅ Training Feature List Loaded")
+    return df
 
-    # One-hot encode
-    df = pd.get_dummies(df, drop_first=True)
 
-    # Align columns
-    print("📌 Aligning features...")
-    for col in feature_list:
-        if col not in df.columns:
-            df[col] = 0
+# Generated by the scorer, so their type is the same in every chunk
+PREDICTION_COLUMNS = ["Scored_Domain", "Churn_Probability", "Churn_Prediction", "Risk_Level"]
 
-    df = df[feature_list]
 
-    # Scale
-    X_scaled = scaler.transform(df)
+class _ResultWriter:
+    """Appends scored chunks to a CSV or Parquet file."""
 
-    # Predict probability
-    probs = model.predict(X_scaled).flatten()
+    def __init__(self, output_file, output_format=None):
+        self.output_file = output_file
+        self.output_format = output_format or (
+            "parquet" if output_file.endswith(".parquet") else "csv"
+        )
+        self._parquet = None
+        self._first = True
 
-    df["Churn_Probability"] = probs
+    def write(self, df):
+        if self.output_format == "parquet":
+            if self._parquet is None:
+                # Chunks are type-inferred one by one: widen to a stable schema
+                self._parquet = ParquetChunkWriter(self.output_file, keep=PREDICTION_COLUMNS,
+                                                   compression="snappy")
+            self._parquet.write(df)
+        else:
+            df.to_csv(self.output_file, mode="w" if self._first else "a",
+                      header=self._first, index=False)
+        self._first = False
 
-    # Apply threshold
-    df["Churn_Prediction"] = (probs >= threshold).astype(int)
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
 
-    # Add Risk Level
-    df["Risk_Level"] = df["Churn_Probability"].apply(risk_level)
 
-    df.to_csv(output_file, index=False)
+def predict_churn(input_file, output_file, threshold=0.5, chunksize=None, output_format=None,
+                  route_domains=False, use_cache=None):
+    """Score ``input_file`` into ``output_file``.
+
+    With ``chunksize`` the input is read, aligned, scaled, scored and written
+    chunk by chunk, so peak memory is bounded by the chunk, not the file.
+    ``output_format`` is "csv" or "parquet" (inferred from the extension).
+    With ``route_domains`` each row is scored by its domain's model
+    (telecom / banking / ecommerce), falling back to the combined model.
+    With the prediction cache (``use_cache``, default CHURN_PREDICTION_CACHE)
+    rows already scored by the same model artifacts are not rescored.
+    """
+
+    print("\n----------------------------------------")
+    print("📌 Predicting Churn for File:", input_file)
 
-    print(f"✅ Prediction Saved Successfully: {output_file}")
+    # Model, scaler and feature list come from the shared registry
+    # (loaded once per process, reloaded only when the files change)
+    registry = get_registry()
+    artifacts = registry.get(MODEL_SET)
+    engine = registry.engine(MODEL_SET)
+    cache = get_prediction_cache(use_cache)
+    router = DomainRouter(registry, fallback=MODEL_SET, cache=cache) if route_domains else None
+    print("✅ Model, Scaler and Training Feature List Ready")
+
+    if chunksize:
+        chunks = iter_frames(input_file, chunksize)
+        print(f"📌 Streaming input in chunks of {chunksize} rows...")
+    else:
+        chunks = [read_table(input_file)]
+        print("✅ Input File Loaded")
+        print("📊 Input Shape:", chunks[0].shape)
+
+    writer = _ResultWriter(output_file, output_format)
+    rows = 0
+
+    try:
+        for chunk in chunks:
+            if router is not None:
+                scored = score_frame_routed(chunk, router, threshold)
+            else:
+                scored = score_frame(chunk, artifacts, engine, threshold, cache)
+            writer.write(scored)
+            rows += len(scored)
+    finally:
+        writer.close()
+
+    print(f"✅ Prediction Saved Successfully: {output_file} ({rows} rows)")
     print("----------------------------------------\n")
 
 
@@ -83,12 +152,31 @@ def predict_churn(input_file, output_file, threshold=0.5):
 
 if __name__ == "__main__":
 
-    os.makedirs("../outputs", exist_ok=True)
+    parser = argparse.ArgumentParser(description="Score a customer file with the combined churn model")
+    parser.add_argument("--input", default="../outputs/selected_features.csv")
+    parser.add_argument("--output", default="../outputs/predicted_combined.csv")
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="Stream the input in chunks of N rows (bounded memory)")
+    parser.add_argument("--format", choices=["csv", "parquet"], default=None,
+                        help="Output format (default: from the output file extension)")
+    parser.add_argument("--route-domains", action="store_true",
+                        help="Score each row with its domain-specific model")
+    parser.add_argument("--cache", action=argparse.BooleanOptionalAction, default=None,
+                        help="Reuse cached probabilities of unchanged rows "
+                             "(default: CHURN_PREDICTION_CACHE)")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
 
     predict_churn(
-        input_file="../outputs/selected_features.csv",
-        output_file="../outputs/predicted_combined.csv",
-        threshold=0.5
+        input_file=args.input,
+        output_file=args.output,
+        threshold=args.threshold,
+        chunksize=args.chunksize,
+        output_format=args.format,
+        route_domains=args.route_domains,
+        use_cache=args.cache
     )
 
-    print("🎉 All Predictions Completed Successfully!")
\ No newline at end of file
+    print("🎉 All Predictions Completed Successfully!")
@@ -1,13 +1,15 @@
 import pandas as pd
-from sklearn.preprocessing import LabelEncoder, StandardScaler
 
+from feature_transformer import FeatureTransformer
+from artifact_store import read_frame, write_frame
 
-def preprocess_combined(file_path, output_path):
+
+def preprocess_combined(file_path, output_path, transformer_path=None):
 
     print("\n📌 Preprocessing Dataset...")
 
-    # ✅ Correct loading
-    df = pd.read_csv(file_path)
+    # ✅ Correct loading (CSV or typed Parquet/Feather/NPY)
+    df = read_frame(file_path)
 
     print("✅ Dataset Loaded")
     print("Original Shape:", df.shape)
@@ -24,28 +26,26 @@ def preprocess_combined(file_path, output_path):
     target = df["Churn"]
     df = df.drop(columns=["Churn"])
 
-    # Encode categorical columns
-    categorical_cols = df.select_dtypes(include=["object"]).columns
-
-    for col in categorical_cols:
-        le = LabelEncoder()
-        df[col] = le.fit_transform(df[col].astype(str))
-
-    print("✅ Categorical Columns Encoded")
-
-    # Scale features
-    scaler = StandardScaler()
+    # Encode categorical columns + scale features in one pass
+    # (the same fitted transformer is reused at inference time)
+    transformer = FeatureTransformer().fit(df)
     df_scaled = pd.DataFrame(
-        scaler.fit_transform(df),
-        columns=df.columns
+        transformer.transform(df),
+        columns=transformer.columns
     )
 
+    print("✅ Categorical Columns Encoded + Features Scaled")
+
+    if transformer_path:
+        transformer.save(transformer_path)
+        print("✅ Feature Transformer Saved:", transformer_path)
+
     # Add target back
     df_scaled["Churn"] = target.values
 
     print("✅ Final Shape After Preprocessing:", df_scaled.shape)
 
-    df_scaled.to_csv(output_path, index=False)
+    write_frame(df_scaled, output_path)
 
     print("✅ Preprocessed Dataset Saved:", output_path)
     print("----------------------------------------")
@@ -0,0 +1,339 @@
+import csv
+import io
+import json
+import os
+import re
+import tempfile
+import uuid
+
+from safe_io import write_json_atomic
+
+# pandas / pyarrow are imported inside the functions that use them, so the
+# job queue and app can import this module without loading either
+
+
+# ==========================================================
+# 🔥 SCORED RESULT STORE
+# ==========================================================
+#
+# Each scored upload is persisted once, under a job ID, as Parquet plus a
+# small summary. Pages, filters and downloads are served from that file,
+# so response size and render time depend on the page size only.
+#
+# Closing a job also writes its display columns pre-sorted, once, into
+# small "view" files; a page is then a read of the row groups it covers.
+#   probability   risk band (High, Medium, Low), then probability desc
+#   id            customer ID
+#   risk_id       risk band, then customer ID
+# Bands are probability ranges, so the first view is also the plain
+# probability order, and every band is a contiguous run whose offset
+# follows from the summary's counts. Numeric IDs sort as numbers.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JOBS_DIR = os.path.join(BASE_DIR, "uploads", "jobs")
+
+RESULT_FILE = "result.parquet"
+SUMMARY_FILE = "summary.json"
+
+RESULT_COLUMNS = ["Probability", "Prediction", "Risk", "Strategy"]
+RISK_VALUES = ["High", "Medium", "Low"]
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+VIEW_FILES = {
+    "probability": "view_probability.parquet",
+    "id": "view_id.parquet",
+    "risk_id": "view_risk_id.parquet",
+}
+VIEW_ROW_GROUP = 1000
+
+_JOB_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+def new_job_id():
+    return uuid.uuid4().hex
+
+
+def job_dir(job_id):
+    # Job IDs are generated server-side; anything else never touches the disk
+    if not _JOB_ID.match(job_id or ""):
+        raise KeyError(job_id)
+    return os.path.join(JOBS_DIR, job_id)
+
+
+class ParquetChunkWriter:
+    """Streams DataFrame chunks into one Parquet file with a stable schema.
+
+    Chunks are type-inferred one by one, so a column can be all null in the
+    first chunk and text in the next, or integer then float. The schema is
+    fixed from the first chunk's columns in a widened form instead:
+      - ``keep`` columns (generated by the scorer) keep their own type
+      - ``text`` columns (IDs), non-numeric columns and columns that are
+        all null in the first chunk -> string
+      - integer / boolean / float columns -> float64
+    Later chunks are cast onto it; text in a numeric column becomes null.
+    """
+
+    def __init__(self, path, keep=(), text=(), compression="zstd"):
+        self.path = path
+        self.keep = set(keep)
+        self.text = set(text)
+        self.compression = compression
+        self.schema = None
+        self._parquet = None
+
+    def _schema(self, df):
+        import pandas as pd
+        import pyarrow as pa
+
+        fields = []
+        inferred = pa.Schema.from_pandas(df, preserve_index=False)
+        for col in df.columns:
+            values = df[col]
+            numeric = pd.api.types.is_numeric_dtype(values.dtype) or pd.api.types.is_bool_dtype(values.dtype)
+            if col in self.keep:
+                arrow_type = inferred.field(str(col)).type
+            elif col in self.text or not numeric or values.isna().all():
+                arrow_type = pa.string()
+            else:
+                arrow_type = pa.float64()
+            fields.append(pa.field(str(col), arrow_type))
+        return pa.schema(fields)
+
+    def _column(self, values, arrow_type):
+        import pandas as pd
+        import pyarrow as pa
+
+        if pa.types.is_string(arrow_type):
+            text = values.astype(object)
+            return text.where(values.isna(), text.astype(str))
+        if pa.types.is_float64(arrow_type):
+            if pd.api.types.is_numeric_dtype(values.dtype) or pd.api.types.is_bool_dtype(values.dtype):
+                return values.astype("float64")
+            return pd.to_numeric(values, errors="coerce").astype("float64")
+        return values
+
+    def write(self, df):
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._parquet is None:
+            self.schema = self._schema(df)
+            self._parquet = pq.ParquetWriter(self.path, self.schema, compression=self.compression)
+
+        frame = pd.DataFrame(
+            {field.name: self._column(df[field.name], field.type) for field in self.schema},
+            index=df.index
+        )
+        self._parquet.write_table(pa.Table.from_pandas(frame, schema=self.schema, preserve_index=False))
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+
+
+class ResultWriter:
+    """Appends scored chunks to a job's Parquet result, counting risk bands."""
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.folder = job_dir(job_id)
+        os.makedirs(self.folder, exist_ok=True)
+        self._parquet = None
+        self._tmp_path = None
+        self.id_column = None
+        self.counts = {risk: 0 for risk in RISK_VALUES}
+        self.rows = 0
+
+    def write(self, df):
+        if self._parquet is None:
+            from dataset_schema import find_id_column
+
+            # Readers only ever see a complete file: write aside, rename on close
+            fd, self._tmp_path = tempfile.mkstemp(dir=self.folder, prefix=".tmp-", suffix=RESULT_FILE)
+            os.close(fd)
+            # Uploads without a known ID spelling keep the old first-column rule
+            self.id_column = str(find_id_column(df.columns) or df.columns[0])
+            # Upload columns are inferred per chunk: widen them to a stable schema
+            self._parquet = ParquetChunkWriter(self._tmp_path, keep=RESULT_COLUMNS,
+                                               text=[self.id_column])
+        self._parquet.write(df)
+
+        for risk, count in df["Risk"].value_counts().items():
+            self.counts[risk] = self.counts.get(risk, 0) + int(count)
+        self.rows += len(df)
+
+    def abort(self):
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+        if self._tmp_path and os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def close(self, filename):
+        """Finish the Parquet file and write the summary; returns the summary dict."""
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+            os.replace(self._tmp_path, os.path.join(self.folder, RESULT_FILE))
+            write_views(self.folder, self.id_column)
+
+        summary = {
+            "job_id": self.job_id,
+            "file": filename,
+            "id_column": self.id_column,
+            "total_customers": self.rows,
+            "high_risk": self.counts["High"],
+            "medium_risk": self.counts["Medium"],
+            "low_risk": self.counts["Low"],
+        }
+        write_json_atomic(os.path.join(self.folder, SUMMARY_FILE), summary)
+
+        return summary
+
+
+def save_result(job_id, df, filename):
+    """Persist a scored frame and its summary in one go."""
+    writer = ResultWriter(job_id)
+    writer.write(df)
+    return writer.close(filename)
+
+
+def load_summary(job_id):
+    path = os.path.join(job_dir(job_id), SUMMARY_FILE)
+    if not os.path.exists(path):
+        raise KeyError(job_id)
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _band_rank(risk):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    # Unknown labels sort after the known bands
+    rank = pc.index_in(risk.cast(pa.string()), value_set=pa.array(RISK_VALUES))
+    return pc.fill_null(rank, len(RISK_VALUES))
+
+
+def _id_key(ids):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    # IDs are stored as text; all-numeric ones sort as numbers ("9" < "10")
+    try:
+        return pc.cast(ids, pa.float64())
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return ids
+
+
+def write_views(folder, id_column):
+    """Write the pre-sorted page views of a finished result (see VIEW_FILES)."""
+    import pyarrow.parquet as pq
+
+    columns = [id_column] + [c for c in RESULT_COLUMNS if c != id_column]
+    table = pq.read_table(os.path.join(folder, RESULT_FILE), columns=columns)
+    keys = table.append_column("_band", _band_rank(table["Risk"])) \
+                .append_column("_id", _id_key(table[id_column]))
+
+    orders = {
+        "probability": [("_band", "ascending"), ("Probability", "descending")],
+        "id": [("_id", "ascending")],
+        "risk_id": [("_band", "ascending"), ("_id", "ascending")],
+    }
+    for view, order in orders.items():
+        sorted_table = keys.sort_by(order).select(columns)
+        fd, tmp = tempfile.mkstemp(dir=folder, prefix=".tmp-", suffix=VIEW_FILES[view])
+        os.close(fd)
+        pq.write_table(sorted_table, tmp, row_group_size=VIEW_ROW_GROUP, compression="zstd")
+        os.replace(tmp, os.path.join(folder, VIEW_FILES[view]))
+
+
+def _read_rows(path, start, stop):
+    """Rows [start, stop) of a Parquet file, reading only the row groups they span."""
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(path)
+    groups, offset, first = [], 0, None
+    for i in range(parquet.metadata.num_row_groups):
+        size = parquet.metadata.row_group(i).num_rows
+        if offset + size > start and offset < stop:
+            groups.append(i)
+            first = offset if first is None else first
+        offset += size
+    if not groups:
+        return parquet.schema_arrow.empty_table()
+    return parquet.read_row_groups(groups).slice(start - first, stop - start)
+
+
+def load_page(job_id, page=1, per_page=PAGE_SIZE, risk=None, sort="probability", order="desc"):
+    """Read one filtered, sorted page from the job's pre-sorted views."""
+    summary = load_summary(job_id)
+    folder = job_dir(job_id)
+
+    risk = risk if risk in RISK_VALUES else None
+    sort = "id" if sort == "id" else "probability"
+    order = "asc" if order == "asc" else "desc"
+
+    view = "risk_id" if sort == "id" and risk else sort
+    path = os.path.join(folder, VIEW_FILES[view])
+    if not os.path.exists(path):
+        # Results stored before the views existed
+        write_views(folder, summary["id_column"])
+
+    # The band (or the whole view) is one contiguous run of rows
+    counts = [summary[f"{band.lower()}_risk"] for band in RISK_VALUES]
+    if risk:
+        band = RISK_VALUES.index(risk)
+        lo, hi = sum(counts[:band]), sum(counts[:band + 1])
+    else:
+        lo, hi = 0, summary["total_customers"]
+
+    per_page = max(1, min(int(per_page), MAX_PAGE_SIZE))
+    total = hi - lo
+    pages = max(1, -(-total // per_page))
+    page = max(1, min(int(page), pages))
+
+    # Views are stored probability-descending / ID-ascending; read the
+    # other direction from the end of the run
+    skip = (page - 1) * per_page
+    reverse = order != ("desc" if sort == "probability" else "asc")
+    if reverse:
+        start, stop = max(lo, hi - skip - per_page), hi - skip
+    else:
+        start, stop = lo + skip, min(hi, lo + skip + per_page)
+
+    rows = _read_rows(path, start, max(start, stop)).to_pylist()
+    if reverse:
+        rows.reverse()
+    return {
+        "summary": summary,
+        "rows": rows,
+        "page": page,
+        "pages": pages,
+        "per_page": per_page,
+        "total": total,
+        "risk": risk,
+        "sort": sort,
+        "order": order,
+    }
+
+
+def iter_csv(job_id, batch_rows=10000):
+    """Stream the stored result back as CSV text, one record batch at a time."""
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(os.path.join(job_dir(job_id), RESULT_FILE))
+    header_written = False
+
+    for batch in parquet.iter_batches(batch_size=batch_rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if not header_written:
+            writer.writerow(batch.schema.names)
+            header_written = True
+        columns = [column.to_pylist() for column in batch.columns]
+        writer.writerows(zip(*columns))
+        yield buffer.getvalue()
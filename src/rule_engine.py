@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+
+
+# ==========================================================
+# 🔥 RISK BANDS (lower bounds are inclusive)
+# ==========================================================
+
+RISK_BANDS = {
+    # app.py: >= 0.7 High, >= 0.4 Medium
+    "app": {"edges": [0.4, 0.7], "labels": ["Low", "Medium", "High"]},
+    # predict.py: < 0.3 LOW, < 0.7 MEDIUM
+    "predict": {"edges": [0.3, 0.7], "labels": ["LOW", "MEDIUM", "HIGH"]},
+}
+
+
+# ==========================================================
+# 🔥 RETENTION STRATEGY RULES
+# ==========================================================
+#
+# Ordered per domain, first match wins. A rule fires when the churn
+# probability is >= ``min_prob`` and (optionally) ``column op value`` holds.
+# Rules on a column that is missing from the upload never fire.
+
+DEFAULT_RETENTION_RULES = [
+    {"min_prob": 0.7, "column": "MonthlyCharges", "op": ">", "value": 80,
+     "strategy": "Offer 25% Discount + Dedicated Support Call"},
+    {"min_prob": 0.7, "column": "Contract", "op": "==", "value": "Month-to-month",
+     "strategy": "Offer 1-Year Contract Upgrade with Discount"},
+    {"min_prob": 0.7, "strategy": "Immediate Retention Team Intervention"},
+    {"min_prob": 0.4, "strategy": "Send Loyalty Points + Targeted Promotion Email"},
+    {"strategy": "Upsell Premium Plan + Appreciation Offer"},
+]
+
+RETENTION_RULES = {
+    "default": DEFAULT_RETENTION_RULES,
+    "Telecom": DEFAULT_RETENTION_RULES,
+    "Banking": [
+        {"min_prob": 0.7, "column": "Balance", "op": ">", "value": 100000,
+         "strategy": "Assign Relationship Manager + Premium Savings Rate"},
+    ] + DEFAULT_RETENTION_RULES,
+    "Ecommerce": [
+        {"min_prob": 0.7, "column": "Complain", "op": "==", "value": 1,
+         "strategy": "Resolve Open Complaint + Cashback Voucher"},
+    ] + DEFAULT_RETENTION_RULES,
+}
+
+
+# ==========================================================
+# 🔥 ALERT MESSAGE RULES
+# ==========================================================
+
+ALERT_RULES = [
+    {"risk": ["high", "critical"],
+     "template": "⚠️ ALERT: Customer at {risk} risk. Suggested Action: {action}"},
+    {"risk": ["medium"],
+     "template": "⚠️ CAUTION: Customer at {risk} risk. Suggested Action: {action}"},
+    {"template": "✅ Customer at {risk} risk. No immediate action needed."},
+]
+
+
+_NUMERIC_OPS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+}
+
+
+def _condition_mask(df, rule):
+    column = rule.get("column")
+    if column is None:
+        return np.ones(len(df), dtype=bool)
+    if column not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+
+    values = df[column]
+    op = rule["op"]
+
+    if op in _NUMERIC_OPS:
+        numeric = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+        with np.errstate(invalid="ignore"):
+            return _NUMERIC_OPS[op](numeric, rule["value"])
+    if op == "==":
+        return (values == rule["value"]).to_numpy()
+    if op == "!=":
+        return (values != rule["value"]).to_numpy()
+    if op == "in":
+        return values.isin(rule["value"]).to_numpy()
+
+    raise ValueError(f"❌ Unknown rule operator: {op}")
+
+
+def risk_levels(probs, bands="app"):
+    """Bucket probabilities into a categorical risk column in one pass."""
+    band = RISK_BANDS[bands]
+    edges = [-np.inf] + list(band["edges"]) + [np.inf]
+    return pd.cut(np.asarray(probs, dtype=float), bins=edges, labels=band["labels"], right=False)
+
+
+def retention_strategies(df, probs, domain=None):
+    """Evaluate the ordered strategy rules as vectorized masks.
+
+    ``domain`` picks a rule set (one name, or one name per row, e.g. from
+    the domain router); without it the ``Domain`` column (if any) routes
+    each row to its domain's rules, otherwise the default set is used.
+    """
+    probs = np.asarray(probs, dtype=float)
+
+    if isinstance(domain, str):
+        row_domains = {domain: np.ones(len(df), dtype=bool)}
+    elif domain is not None:
+        domains = np.array(["default" if d is None else str(d) for d in domain])
+        row_domains = {d: domains == d for d in pd.unique(domains)}
+    elif "Domain" in df.columns:
+        domains = df["Domain"].astype(str).to_numpy()
+        row_domains = {d: domains == d for d in pd.unique(domains)}
+    else:
+        row_domains = {"default": np.ones(len(df), dtype=bool)}
+
+    conditions, choices, strategies = [], [], []
+    for name, domain_mask in row_domains.items():
+        for rule in RETENTION_RULES.get(name, DEFAULT_RETENTION_RULES):
+            mask = domain_mask & _condition_mask(df, rule)
+            if "min_prob" in rule:
+                mask = mask & (probs >= rule["min_prob"])
+            strategy = rule["strategy"]
+            if strategy not in strategies:
+                strategies.append(strategy)
+            conditions.append(mask)
+            choices.append(strategies.index(strategy))
+
+    codes = np.select(conditions, choices, default=-1) if conditions else np.full(len(df), -1)
+    return pd.Categorical.from_codes(codes, categories=strategies)
+
+
+def alert_messages(risk, action):
+    """Build the alert message column, formatting each (risk, action) pair once."""
+    # Formatted like the old per-row f-string: missing values read "nan" /
+    # "None" (pandas' string dtype would keep them missing)
+    pairs = pd.MultiIndex.from_arrays([
+        np.asarray(risk, dtype=object).astype(str),
+        np.asarray(action, dtype=object).astype(str)
+    ])
+    codes, uniques = pairs.factorize()
+
+    messages = []
+    for risk_value, action_value in uniques:
+        for rule in ALERT_RULES:
+            if "risk" not in rule or risk_value.lower() in rule["risk"]:
+                messages.append(rule["template"].format(risk=risk_value, action=action_value))
+                break
+
+    # Categories must be unique; map duplicates onto the first occurrence
+    categories = pd.Index(messages).unique()
+    remap = categories.get_indexer(messages)
+    return pd.Categorical.from_codes(remap[codes], categories=categories)
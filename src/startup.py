@@ -0,0 +1,133 @@
+import importlib.util
+import sys
+import threading
+import time
+import traceback
+import types
+
+
+# ==========================================================
+# 🔥 LAZY IMPORTS + BACKGROUND WARM-UP
+# ==========================================================
+#
+# ``lazy_import`` registers a module whose code runs on first attribute
+# access, so importing app.py does not pay for
+# pandas / pyarrow / scikit-learn up front. ``Warmup`` then loads modules
+# and model artifacts on a background thread once the server is up and
+# records how long each step took; the readiness endpoint reports it.
+
+PENDING = "pending"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+
+
+class _LazyModule(types.ModuleType):
+    """Module whose code runs on first attribute access, once.
+
+    Unlike importlib.util.LazyLoader on Python 3.11, the class is swapped
+    only after the module body ran, under a per-module lock: a request
+    thread touching the module while warm-up loads it waits instead of
+    reading a half-initialised module.
+    """
+
+    def __getattribute__(self, attr):
+        spec = object.__getattribute__(self, "__spec__")
+        state = spec.loader_state
+        with state["lock"]:
+            if object.__getattribute__(self, "__class__") is _LazyModule:
+                if state["loading"]:
+                    # Same thread, while the module body runs
+                    return types.ModuleType.__getattribute__(self, attr)
+                state["loading"] = True
+                try:
+                    spec.loader.exec_module(self)
+                finally:
+                    # A failed import is retried (and raises again) on next access
+                    state["loading"] = False
+                self.__class__ = types.ModuleType
+        return getattr(self, attr)
+
+
+def lazy_import(name):
+    """Return module ``name``, executed on first attribute access.
+
+    Modules already imported are returned as they are. Later plain
+    ``import name`` statements get the same lazy module from sys.modules.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+
+    module = importlib.util.module_from_spec(spec)
+    spec.loader_state = {"lock": threading.RLock(), "loading": False}
+    module.__class__ = _LazyModule
+    sys.modules[name] = module
+    return module
+
+
+class Warmup:
+    """Named warm-up steps run once, in order, on a daemon thread."""
+
+    def __init__(self, steps, started=None):
+        self.steps = list(steps)
+        self.started = started if started is not None else time.perf_counter()
+        self.state = PENDING
+        self.timings = {}
+        self.error = None
+        self.ready_after = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def start(self):
+        """Start the warm-up thread (no-op if it already ran or is running)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+        self._thread.start()
+
+    def run(self):
+        self.state = WARMING
+        began = time.perf_counter()
+
+        try:
+            for name, fn in self.steps:
+                step_start = time.perf_counter()
+                fn()
+                self.timings[name] = round(time.perf_counter() - step_start, 3)
+        except Exception as e:
+            self.error = f"{name}: {e}"
+            self.state = FAILED
+            traceback.print_exc()
+            print("❌ Warm-up failed:", self.error)
+        else:
+            self.state = READY
+            self.ready_after = round(time.perf_counter() - self.started, 3)
+            print(f"🔥 Warm-up finished in {time.perf_counter() - began:.2f}s "
+                  f"(ready {self.ready_after:.2f}s after start) {self.timings}")
+        finally:
+            self._done.set()
+
+    def wait(self, timeout=None):
+        """Block until warm-up finished; True when it succeeded."""
+        self._done.wait(timeout)
+        return self.state == READY
+
+    @property
+    def ready(self):
+        return self.state == READY
+
+    def status(self):
+        return {
+            "ready": self.ready,
+            "state": self.state,
+            "steps": dict(self.timings),
+            "ready_after_seconds": self.ready_after,
+            "error": self.error,
+        }
@@ -0,0 +1,183 @@
+import argparse
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from dataset_schema import DOMAIN_SCHEMAS, ID_COLUMN, TARGET
+from ingest import read_table
+
+
+# ==========================================================
+# 🔥 SYNTHETIC DOMAIN DATASETS
+# ==========================================================
+#
+# Seeded generators that reproduce each raw domain file (same columns,
+# spellings, dtypes and TAB separator) at any row count. A profile is
+# learned from the real file per target class:
+#   - string and low-cardinality integer columns: value frequencies
+#     (Contract, Geography, PreferedOrderCat, SeniorCitizen, ...)
+#   - other numeric columns: 101 quantiles, sampled by inverse CDF,
+#     plus the missing-value rate
+# Rows draw the target first and their features from that class's
+# profile, so churn stays learnable. Each chunk seeds its own generator
+# from (seed, first row), so big files are written in bounded memory and
+# stay reproducible for a given seed and chunk size.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET_DIR = os.path.join(BASE_DIR, "datasets")
+
+SEED = 42
+CHUNK_ROWS = 500_000
+MAX_LEVELS = 32
+QUANTILES = np.linspace(0, 1, 101)
+
+
+def _id_column(domain):
+    raw = [raw for raw, canonical in DOMAIN_SCHEMAS[domain]["columns"].items() if canonical == ID_COLUMN]
+    return raw[0] if raw else None
+
+
+def _target_column(domain):
+    return next(raw for raw, canonical in DOMAIN_SCHEMAS[domain]["columns"].items() if canonical == TARGET)
+
+
+def _column_profile(values):
+    values = values.reset_index(drop=True)
+    numeric = pd.to_numeric(values, errors="coerce")
+
+    # Numbers stored as text (telecom TotalCharges) keep their blank token
+    is_text = not pd.api.types.is_numeric_dtype(values)
+    parsed = numeric.notna() | values.isna()
+    if is_text and parsed.mean() < 0.95:
+        counts = values.astype(object).where(values.notna(), None).value_counts(normalize=True, dropna=False)
+        return {"kind": "levels", "values": counts.index.to_numpy(dtype=object), "probs": counts.to_numpy()}
+
+    if values.nunique(dropna=True) <= MAX_LEVELS:
+        counts = numeric.value_counts(normalize=True, dropna=False)
+        return {"kind": "levels", "values": counts.index.to_numpy(), "probs": counts.to_numpy()}
+
+    present = numeric.dropna()
+    blanks = values[numeric.isna() & values.notna()] if is_text else values.iloc[:0]
+    return {
+        "kind": "quantiles",
+        "quantiles": np.quantile(present, QUANTILES) if len(present) else np.zeros(len(QUANTILES)),
+        "missing": 1 - len(present) / max(len(values), 1),
+        "integer": bool(len(present) and np.all(present == np.round(present))),
+        "blank": blanks.iloc[0] if len(blanks) else None,
+    }
+
+
+@lru_cache(maxsize=None)
+def domain_profile(domain, dataset_dir=DATASET_DIR):
+    """Per-class column profiles of one real domain file."""
+    path = os.path.join(dataset_dir, DOMAIN_SCHEMAS[domain]["file"])
+    raw = read_table(path)
+
+    target = _target_column(domain)
+    id_column = _id_column(domain)
+    labels = raw[target].value_counts(normalize=True)
+
+    classes = {}
+    for label in labels.index:
+        rows = raw[raw[target] == label]
+        classes[label] = {
+            col: _column_profile(rows[col])
+            for col in raw.columns if col not in (target, id_column)
+        }
+
+    return {
+        "columns": list(raw.columns),
+        "dtypes": raw.dtypes.to_dict(),
+        "target": target,
+        "id_column": id_column,
+        "id_numeric": id_column is not None and pd.api.types.is_numeric_dtype(raw[id_column]),
+        "labels": labels.index.to_numpy(dtype=object),
+        "label_probs": labels.to_numpy(),
+        "classes": classes,
+    }
+
+
+def _sample(profile, n, rng):
+    if profile["kind"] == "levels":
+        return profile["values"][rng.choice(len(profile["values"]), size=n, p=profile["probs"])]
+
+    values = np.interp(rng.random(n), QUANTILES, profile["quantiles"])
+    values = np.round(values, 0 if profile["integer"] else 2)
+    missing = rng.random(n) < profile["missing"]
+    if profile["blank"] is not None:
+        values = values.astype(object)
+        values[missing] = profile["blank"]
+    else:
+        values[missing] = np.nan
+    return values
+
+
+def generate_domain(domain, n_rows, seed=SEED, start=0, dataset_dir=DATASET_DIR):
+    """``n_rows`` synthetic raw rows for ``domain`` (row ids from ``start``)."""
+    profile = domain_profile(domain, dataset_dir)
+    rng = np.random.default_rng([seed, start])
+
+    labels = profile["labels"][rng.choice(len(profile["labels"]), size=n_rows, p=profile["label_probs"])]
+    columns = {}
+
+    for label, features in profile["classes"].items():
+        rows = np.flatnonzero(labels == label)
+        for col, col_profile in features.items():
+            if col not in columns:
+                columns[col] = np.empty(n_rows, dtype=object)
+            columns[col][rows] = _sample(col_profile, len(rows), rng)
+
+    ids = np.arange(start + 1, start + n_rows + 1)
+    if profile["id_column"] is not None:
+        columns[profile["id_column"]] = ids if profile["id_numeric"] else [f"SYN-{i:08d}" for i in ids]
+    columns[profile["target"]] = labels
+    if "RowNumber" in columns:
+        columns["RowNumber"] = ids
+
+    df = pd.DataFrame({col: columns[col] for col in profile["columns"]})
+
+    # Back to the real file's dtypes (integers holding NaN stay float)
+    for col, dtype in profile["dtypes"].items():
+        if pd.api.types.is_numeric_dtype(dtype):
+            numeric = pd.to_numeric(df[col], errors="coerce")
+            df[col] = numeric if numeric.isna().any() else numeric.astype(dtype)
+        else:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def write_domain(domain, n_rows, path, seed=SEED, chunk_rows=CHUNK_ROWS, sep="\t",
+                 dataset_dir=DATASET_DIR):
+    """Stream ``n_rows`` synthetic rows to ``path`` in chunks (bounded memory)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    for start in range(0, n_rows, chunk_rows):
+        chunk = generate_domain(domain, min(chunk_rows, n_rows - start), seed, start, dataset_dir)
+        chunk.to_csv(path, sep=sep, index=False, mode="w" if start == 0 else "a", header=start == 0)
+    return path
+
+
+def write_datasets(output_dir, n_rows, seed=SEED, chunk_rows=CHUNK_ROWS):
+    """Write all three domain files (real file names) with ``n_rows`` each."""
+    paths = {}
+    for domain, schema in DOMAIN_SCHEMAS.items():
+        paths[domain] = write_domain(domain, n_rows, os.path.join(output_dir, schema["file"]),
+                                     seed=seed, chunk_rows=chunk_rows)
+        print(f"✅ {domain:<10} {n_rows:,} rows -> {paths[domain]}")
+    return paths
+
+
+# ==========================================================
+# 🔥 RUN
+# ==========================================================
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Write seeded synthetic telecom / banking / ecommerce files")
+    parser.add_argument("--rows", type=int, default=10_000, help="Rows per domain")
+    parser.add_argument("--output", default=os.path.join(BASE_DIR, "outputs", "synthetic"))
+    parser.add_argument("--seed", type=int, default=SEED)
+    args = parser.parse_args()
+
+    write_datasets(args.output, args.rows, seed=args.seed)
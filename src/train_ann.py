@@ -2,50 +2,287 @@
 import pandas as pd
 import numpy as np
 import os
+import json
+import time
+import shutil
+import hashlib
 import joblib
 
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
-from sklearn.feature_selection import mutual_info_classif
+from sklearn.metrics import (
+    accuracy_score, confusion_matrix, f1_score, precision_recall_curve,
+    precision_score, recall_score
+)
 from imblearn.over_sampling import SMOTE
+import tensorflow as tf
 from tensorflow import keras
 from tensorflow.keras import layers
 
+from artifact_store import read_frame
+from numpy_engine import export_npz
+
 
 # ==============================
 # CONFIG
 # ==============================
 
 DATA_PATH = "../outputs/selected_features.csv"  # Combined selected dataset
-MODEL_SAVE_PATH = "../models/combined_ann.keras"
-SCALER_SAVE_PATH = "../models/combined_scaler.pkl"
-FEATURE_SAVE_PATH = "../models/combined_features.pkl"
+MODELS_FOLDER = "../models"
+
+# A standalone run (python train_ann.py) retrains the combined set served by
+# app.py / predict.py, under its original file names. The main.py pipeline
+# trains "multi_domain_ann" instead and writes <model_name>_*.pkl files.
+MODEL_NAME = "combined_ann"
+CHECKPOINT_DIR = "../models/checkpoints/combined_ann"
+
+ARTIFACT_NAMES = {
+    "combined_ann": {
+        "scaler": "combined_scaler.pkl",
+        "features": "combined_features.pkl",
+        "transformer": "combined_transformer.pkl",
+    },
+}
+
+MAX_EPOCHS = 50
+BATCH_SIZE = 256
+PATIENCE = 5
+SEED = 42
+
+DEFAULT_HYPERPARAMS = {
+    "hidden_units": (128, 64, 32),
+    "dropout": 0.3,
+    "learning_rate": 1e-3,
+    "batch_size": BATCH_SIZE,
+    "max_epochs": MAX_EPOCHS,
+    "patience": PATIENCE,
+    "test_size": 0.2,
+    "smote": True,
+    "auto_threshold": True,
+    "seed": SEED,
+}
+
+
+def artifact_paths(models_folder, model_name):
+    """Files written for one trained model."""
+    paths = {
+        "model": os.path.join(models_folder, f"{model_name}.keras"),
+        "weights": os.path.join(models_folder, f"{model_name}.npz"),
+        "scaler": os.path.join(models_folder, f"{model_name}_scaler.pkl"),
+        "features": os.path.join(models_folder, f"{model_name}_features.pkl"),
+        "metrics": os.path.join(models_folder, f"{model_name}_metrics.txt"),
+        # Copied here by the main.py pipeline once the model is trained
+        "transformer": os.path.join(models_folder, f"{model_name}_transformer.pkl"),
+        "checkpoints": os.path.join(models_folder, "checkpoints", model_name),
+    }
+    for role, name in ARTIFACT_NAMES.get(model_name, {}).items():
+        paths[role] = os.path.join(models_folder, name)
+    return paths
+
+
+# ==============================
+# TRAINING ENGINE
+# ==============================
+
+def make_dataset(X, y, batch_size=BATCH_SIZE, shuffle=False, seed=SEED):
+    """tf.data pipeline: cached float32 tensors, reshuffled per epoch, prefetched."""
+    dataset = tf.data.Dataset.from_tensor_slices((
+        np.asarray(X, dtype=np.float32),
+        np.asarray(y, dtype=np.float32)
+    )).cache()
+
+    if shuffle:
+        dataset = dataset.shuffle(len(X), seed=seed, reshuffle_each_iteration=True)
+
+    return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+
+class ThroughputLogger(keras.callbacks.Callback):
+    """Logs wall time and samples/sec per epoch."""
+
+    def __init__(self, n_samples):
+        super().__init__()
+        self.n_samples = n_samples
+        self.epochs = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._start = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        seconds = time.perf_counter() - self._start
+        rate = self.n_samples / seconds if seconds > 0 else 0.0
+        logs = logs or {}
+        self.epochs.append({"epoch": epoch + 1, "seconds": seconds, "samples_per_sec": rate})
+        print(f"⏱ Epoch {epoch + 1}: {seconds:.2f}s, {rate:,.0f} samples/sec, "
+              f"loss {logs.get('loss', float('nan')):.4f}, val_loss {logs.get('val_loss', float('nan')):.4f}")
+
+
+def run_key(X_train, y_train, hyperparams):
+    """Fingerprint of one training run: its exact training data plus hyperparameters."""
+    sha = hashlib.sha256()
+    sha.update(np.ascontiguousarray(X_train, dtype=np.float32).tobytes())
+    sha.update(np.ascontiguousarray(y_train, dtype=np.float32).tobytes())
+    sha.update(json.dumps(hyperparams, sort_keys=True, default=str).encode())
+    return sha.hexdigest()[:16]
+
+
+def fit_with_checkpoints(model, train_ds, val_ds, n_samples, checkpoint_dir=CHECKPOINT_DIR,
+                         max_epochs=MAX_EPOCHS, patience=PATIENCE, key=None):
+    """Fit with early stopping, best-weights restore and resume after interruption.
+
+    ``checkpoint_dir/backup`` holds the last finished epoch (removed once
+    training completes), ``checkpoint_dir/best.weights.h5`` the best one.
+    Both belong to the run ``key`` recorded in ``checkpoint_dir/run.json``:
+    checkpoints of another run (other data, features or hyperparameters)
+    are deleted instead of restored, and the best weights are only kept
+    when resuming.
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    backup_dir = os.path.join(checkpoint_dir, "backup")
+    best_path = os.path.join(checkpoint_dir, "best.weights.h5")
+    run_path = os.path.join(checkpoint_dir, "run.json")
+
+    previous = None
+    if os.path.exists(run_path):
+        with open(run_path, "r") as f:
+            previous = json.load(f).get("key")
+    if previous != key and os.path.isdir(backup_dir):
+        print("🧹 Discarding checkpoints of a different training run:", checkpoint_dir)
+        shutil.rmtree(backup_dir)
+    if not os.path.isdir(backup_dir) and os.path.exists(best_path):
+        # Not resuming: the best weights are from an earlier run
+        os.remove(best_path)
+    with open(run_path, "w") as f:
+        json.dump({"key": key}, f)
+
+    throughput = ThroughputLogger(n_samples)
+
+    callbacks = [
+        # Resumes from the last completed epoch if a previous run was killed
+        keras.callbacks.BackupAndRestore(backup_dir),
+        keras.callbacks.ModelCheckpoint(best_path, monitor="val_loss",
+                                        save_best_only=True, save_weights_only=True),
+        keras.callbacks.EarlyStopping(monitor="val_loss", patience=patience,
+                                      restore_best_weights=True),
+        throughput,
+    ]
+
+    start = time.perf_counter()
+    history = model.fit(
+        train_ds,
+        validation_data=val_ds,
+        epochs=max_epochs,
+        callbacks=callbacks,
+        verbose=2
+    )
+    total = time.perf_counter() - start
+
+    if os.path.exists(best_path):
+        model.load_weights(best_path)
+
+    epochs_run = len(throughput.epochs)
+    if epochs_run:
+        mean_rate = np.mean([e["samples_per_sec"] for e in throughput.epochs])
+        print(f"✅ Trained {epochs_run} epoch(s) in {total:.1f}s "
+              f"(mean {mean_rate:,.0f} samples/sec); best weights restored")
+
+    return history, throughput.epochs
+
+
+# ==============================
+# THRESHOLD + METRICS
+# ==============================
+
+def best_threshold(y_true, probs):
+    """Probability cut-off that maximises F1 on held-out data."""
+    precision, recall, thresholds = precision_recall_curve(y_true, probs)
+    f1 = 2 * precision * recall / np.maximum(precision + recall, 1e-12)
+    # The last precision/recall pair has no threshold
+    return float(thresholds[np.argmax(f1[:-1])])
+
+
+def evaluate(y_true, probs, threshold):
+    preds = (probs >= threshold).astype(int)
+    return {
+        "threshold": float(threshold),
+        "accuracy": accuracy_score(y_true, preds),
+        "precision": precision_score(y_true, preds, zero_division=0),
+        "recall": recall_score(y_true, preds, zero_division=0),
+        "f1": f1_score(y_true, preds, zero_division=0),
+        "confusion_matrix": confusion_matrix(y_true, preds),
+    }
+
+
+def save_metrics(metrics, path):
+    with open(path, "w") as f:
+        f.write(f"Threshold: {metrics['threshold']}\n")
+        f.write(f"Accuracy: {metrics['accuracy']}\n")
+        f.write(f"Precision: {metrics['precision']}\n")
+        f.write(f"Recall: {metrics['recall']}\n")
+        f.write(f"F1 Score: {metrics['f1']}\n")
+        f.write("Confusion Matrix:\n")
+        f.write(f"{metrics['confusion_matrix']}\n")
+
+
+def build_model(n_features, hyperparams):
+    hidden = hyperparams["hidden_units"]
+    stack = [layers.Input(shape=(n_features,))]
+    for i, units in enumerate(hidden):
+        stack.append(layers.Dense(units, activation="relu"))
+        # No dropout right before the output layer (as in the original net)
+        if i < len(hidden) - 1 and hyperparams["dropout"]:
+            stack.append(layers.Dropout(hyperparams["dropout"]))
+    stack.append(layers.Dense(1, activation="sigmoid"))
+
+    model = keras.Sequential(stack)
+    model.compile(
+        optimizer=keras.optimizers.Adam(learning_rate=hyperparams["learning_rate"]),
+        loss="binary_crossentropy",
+        metrics=["accuracy"]
+    )
+    return model
 
 
 # ==============================
 # TRAIN FUNCTION
 # ==============================
 
-def train_ann_model():
+def train_ann_model(data_path=DATA_PATH, target_column="Churn", model_name=MODEL_NAME,
+                    models_folder=MODELS_FOLDER, hyperparams=None):
+    """Train the churn ANN and save it with its scaler, features and metrics.
+
+    Writes ``<model_name>.keras`` (+ its ``.npz`` export), ``<model_name>_scaler.pkl``,
+    ``<model_name>_features.pkl`` and ``<model_name>_metrics.txt`` to
+    ``models_folder`` (``ARTIFACT_NAMES`` keeps the combined set's names).
+    ``hyperparams`` overrides entries of ``DEFAULT_HYPERPARAMS``. Returns
+    ``(model, metrics)``.
+    """
+    params = {**DEFAULT_HYPERPARAMS, **(hyperparams or {})}
+    unknown = set(params) - set(DEFAULT_HYPERPARAMS)
+    if unknown:
+        raise ValueError(f"❌ Unknown hyperparameter(s): {sorted(unknown)}")
+
+    os.makedirs(models_folder, exist_ok=True)
+    paths = artifact_paths(models_folder, model_name)
 
     print("\n------------------------------------")
     print("📌 Loading Dataset for Training")
 
-    df = pd.read_csv(DATA_PATH)
+    df = read_frame(data_path)
 
     print("✅ Dataset Loaded")
     print("📊 Shape:", df.shape)
 
     # Separate target
-    if "Churn" not in df.columns:
-        raise ValueError("❌ Churn column missing!")
+    if target_column not in df.columns:
+        raise ValueError(f"❌ {target_column} column missing!")
 
-    y = df["Churn"]
-    X = df.drop("Churn", axis=1)
+    y = df[target_column].astype(int)
+    X = df.drop(target_column, axis=1)
 
     # Train test split
     X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
+        X, y, test_size=params["test_size"], random_state=params["seed"], stratify=y
     )
 
     print("✅ Data Split Completed")
@@ -54,13 +291,14 @@ def train_ann_model():
     # SMOTE
     # -----------------------
 
-    print("⚖ Applying SMOTE...")
+    if params["smote"]:
+        print("⚖ Applying SMOTE...")
 
-    smote = SMOTE(random_state=42)
-    X_train, y_train = smote.fit_resample(X_train, y_train)
+        smote = SMOTE(random_state=params["seed"])
+        X_train, y_train = smote.fit_resample(X_train, y_train)
 
-    print("✅ SMOTE Applied")
-    print(y_train.value_counts())
+        print("✅ SMOTE Applied")
+        print(y_train.value_counts())
 
     # -----------------------
     # Scaling
@@ -70,13 +308,13 @@ def train_ann_model():
     X_train = scaler.fit_transform(X_train)
     X_test = scaler.transform(X_test)
 
-    joblib.dump(scaler, SCALER_SAVE_PATH)
-    print("✅ Scaler Saved")
+    joblib.dump(scaler, paths["scaler"])
+    print("✅ Scaler Saved:", paths["scaler"])
 
     # Save feature list for prediction alignment
     feature_list = X.columns.tolist()
-    joblib.dump(feature_list, FEATURE_SAVE_PATH)
-    print("✅ Feature List Saved:", FEATURE_SAVE_PATH)
+    joblib.dump(feature_list, paths["features"])
+    print("✅ Feature List Saved:", paths["features"])
 
     # -----------------------
     # ANN MODEL
@@ -84,41 +322,52 @@ def train_ann_model():
 
     print("🚀 Training Model...")
 
-    model = keras.Sequential([
-        layers.Dense(128, activation="relu", input_shape=(X_train.shape[1],)),
-        layers.Dropout(0.3),
-        layers.Dense(64, activation="relu"),
-        layers.Dropout(0.3),
-        layers.Dense(32, activation="relu"),
-        layers.Dense(1, activation="sigmoid")
-    ])
+    keras.utils.set_random_seed(params["seed"])
+    model = build_model(X_train.shape[1], params)
 
-    model.compile(
-        optimizer="adam",
-        loss="binary_crossentropy",
-        metrics=["accuracy"]
-    )
+    train_ds = make_dataset(X_train, y_train, batch_size=params["batch_size"],
+                            shuffle=True, seed=params["seed"])
+    val_ds = make_dataset(X_test, y_test, batch_size=params["batch_size"])
 
-    model.fit(
-        X_train,
-        y_train,
-        validation_data=(X_test, y_test),
-        epochs=50,
-        batch_size=32
+    fit_with_checkpoints(
+        model, train_ds, val_ds, n_samples=len(X_train),
+        checkpoint_dir=paths["checkpoints"],
+        max_epochs=params["max_epochs"],
+        patience=params["patience"],
+        key=run_key(X_train, y_train, params)
     )
 
     # Save Model
-    model.save(MODEL_SAVE_PATH)
+    model.save(paths["model"])
+    print("💾 Model Saved:", paths["model"])
+
+    # TensorFlow-free copy served by app.py / predict.py
+    export_npz(model, paths["weights"], source_path=paths["model"])
+    print("💾 NumPy Weights Saved:", paths["weights"])
+
+    # -----------------------
+    # AUTO THRESHOLD + METRICS
+    # -----------------------
+
+    probs = model.predict(val_ds, verbose=0).ravel()
+    threshold = best_threshold(y_test, probs) if params["auto_threshold"] else 0.5
+    metrics = evaluate(y_test, probs, threshold)
 
-    print("💾 Model Saved:", MODEL_SAVE_PATH)
+    save_metrics(metrics, paths["metrics"])
+
+    print(f"🎯 Threshold: {threshold:.4f}  F1: {metrics['f1']:.4f}  "
+          f"Accuracy: {metrics['accuracy']:.4f}")
+    print("📄 Metrics Saved:", paths["metrics"])
     print("------------------------------------")
     print("🎉 Training Finished Successfully!")
 
+    return model, metrics
+
 
 # ==============================
 # RUN
 # ==============================
 
 if __name__ == "__main__":
-    os.makedirs("../models", exist_ok=True)
-    train_ann_model()
\ No newline at end of file
+    # Defaults: combined_ann.keras / combined_scaler.pkl / combined_features.pkl
+    train_ann_model()
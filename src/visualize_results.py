@@ -1,25 +1,29 @@
 import os
+import matplotlib
+matplotlib.use("Agg")  # file output only; safe off the main thread
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 from sklearn.metrics import confusion_matrix, ConfusionMatrixDisplay
-import tensorflow as tf
+
+from model_registry import get_registry
+from artifact_store import read_frame
 
 
 def visualize_results(model_path, dataset_path, target_column="Churn", output_folder="../outputs"):
     print("\n📊 Generating Visual Reports...")
 
-    # Load trained model
-    model = tf.keras.models.load_model(model_path)
+    # Compiled engine for the trained model (shared registry, no reload if already warm)
+    engine = get_registry().engine(model_path)
 
     # Load dataset
-    df = pd.read_csv(dataset_path)
+    df = read_frame(dataset_path)
 
     X = df.drop(columns=[target_column])
     y = df[target_column]
 
     # Get predictions
-    y_prob = model.predict(X)
+    y_prob = engine.predict_proba(X.to_numpy(dtype=np.float32))
     y_pred = (y_prob > 0.5).astype(int)
 
     # ==========================
@@ -0,0 +1,67 @@
+import json
+
+import pandas as pd
+
+import alert_system
+from alert_system import log_domain_alerts, recorded_blocks, run_alert_pipeline
+from blockchain_storage import Blockchain
+from ledger import LedgerLog
+
+
+def _retention_file(folder, rows=25):
+    path = folder / "retention_telecom.csv"
+    pd.DataFrame({
+        "RowNumber": range(rows),
+        "Risk_Level": ["High", "Medium", "Low", "High", "Low"] * (rows // 5),
+        "Retention_Action": ["Call"] * rows,
+    }).to_csv(path, index=False)
+    return path
+
+
+def test_rerun_reuses_blocks_and_reads_only_new_ones(tmp_path, monkeypatch):
+    retention = _retention_file(tmp_path)
+    ledger_dir = str(tmp_path / "ledger")
+
+    run_alert_pipeline([str(retention)], ledger_dir=ledger_dir, block_size=10)
+    with LedgerLog(ledger_dir) as ledger:
+        height = len(ledger)
+
+    run_alert_pipeline([str(retention)], ledger_dir=ledger_dir, block_size=10)
+
+    reads = []
+    original = LedgerLog.iter_range
+    monkeypatch.setattr(LedgerLog, "iter_range",
+                        lambda self, start=0, stop=None: reads.append(start) or original(self, start, stop))
+    with LedgerLog(ledger_dir) as ledger:
+        assert len(ledger) == height
+        recorded = recorded_blocks(ledger)
+
+    assert reads == [height]
+    assert len(recorded) == 3
+    assert all("transactions" not in block for block in recorded.values())
+
+
+def test_stale_block_index_is_rebuilt(tmp_path):
+    retention = _retention_file(tmp_path)
+    ledger_dir = tmp_path / "ledger"
+    run_alert_pipeline([str(retention)], ledger_dir=str(ledger_dir), block_size=10)
+
+    index_path = ledger_dir / alert_system.BLOCK_INDEX_FILE
+    index = json.loads(index_path.read_text())
+    index["last_hash"] = "0" * 64
+    index["blocks"] = []
+    index_path.write_text(json.dumps(index))
+
+    with LedgerLog(str(ledger_dir)) as ledger:
+        assert len(recorded_blocks(ledger)) == 3
+
+
+def test_missing_columns_keep_the_old_references(tmp_path):
+    retention = tmp_path / "retention_telecom.csv"
+    pd.DataFrame({"RowNumber": [1, 2], "Score": [0.1, 0.9]}).to_csv(retention, index=False)
+    refs = tmp_path / "blockchain_telecom.jsonl"
+    refs.write_text('{"height":0}\n')
+
+    with LedgerLog(str(tmp_path / "ledger")) as ledger:
+        assert log_domain_alerts(str(retention), Blockchain(ledger)) is None
+    assert refs.read_text() == '{"height":0}\n'
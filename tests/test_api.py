@@ -0,0 +1,36 @@
+import os
+
+import pandas as pd
+import pytest
+
+UPLOADS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "uploads")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    import app
+    # Warm-up would open (and migrate) the real ledger; scoring does not need it
+    monkeypatch.setattr(app.warmup, "start", lambda: None)
+    return app.app.test_client()
+
+
+def _records():
+    return pd.read_csv(os.path.join(UPLOADS_DIR, "sample.csv")).head(3).to_dict(orient="records")
+
+
+def test_json_records_id_found_by_name(client):
+    records = _records()
+    # ID key last: the first key is a feature
+    reordered = [{**{k: v for k, v in r.items() if k != "customerID"}, "customerID": r["customerID"]}
+                 for r in records]
+
+    results = client.post("/api/v1/score", json=reordered).get_json()["results"]
+    assert [r["customerID"] for r in results] == [r["customerID"] for r in records]
+    assert "tenure" not in results[0]
+
+
+def test_json_records_without_id_are_numbered(client):
+    records = [{k: v for k, v in r.items() if k != "customerID"} for r in _records()]
+
+    results = client.post("/api/v1/score", json=records).get_json()["results"]
+    assert [r["Row"] for r in results] == [1, 2, 3]
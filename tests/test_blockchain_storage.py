@@ -0,0 +1,62 @@
+import json
+
+from blockchain_storage import GENESIS_HASH, Blockchain, append_record
+
+
+def _chain(checkpoint_path=None, blocks=3):
+    bc = Blockchain(checkpoint_path=checkpoint_path)
+    for b in range(blocks):
+        bc.add_transactions([{"customer": f"{b}-{i}", "risk": "High"} for i in range(3)])
+        bc.create_block(source="test.csv")
+    return bc
+
+
+def test_valid_chain_verifies_and_links():
+    bc = _chain()
+    assert bc.verify()
+    assert bc.chain[0]["previous_hash"] == GENESIS_HASH
+    assert all(bc.chain[i]["previous_hash"] == bc.chain[i - 1]["hash"] for i in range(1, 3))
+
+
+def test_tampered_transaction_breaks_the_merkle_root():
+    bc = _chain()
+    bc.chain[1]["transactions"][0]["risk"] = "Low"
+    assert not bc.verify()
+
+
+def test_tampered_header_breaks_the_hash():
+    bc = _chain()
+    bc.chain[2]["transaction_count"] = 99
+    assert not bc.verify()
+
+
+def test_verification_resumes_from_the_checkpoint(tmp_path):
+    checkpoint = tmp_path / "verified.json"
+    bc = _chain(str(checkpoint))
+    assert bc.verify()
+    assert json.loads(checkpoint.read_text()) == {"height": 3, "hash": bc.chain[-1]["hash"]}
+
+    # Blocks below the checkpoint are not re-hashed; a full pass still sees them
+    bc.chain[0]["transactions"][0]["risk"] = "Low"
+    resumed = Blockchain(bc.chain, checkpoint_path=str(checkpoint))
+    assert resumed.verified_height == 3
+    assert resumed.verify()
+    assert not resumed.verify(full=True)
+
+
+def test_checkpoint_of_another_chain_is_reset(tmp_path):
+    checkpoint = tmp_path / "verified.json"
+    assert _chain(str(checkpoint)).verify()
+
+    # A different chain of the same height: the checkpoint hash does not match
+    other = _chain(blocks=3)
+    other.chain[0]["transactions"][0]["risk"] = "Low"
+    assert not Blockchain(other.chain, checkpoint_path=str(checkpoint)).verify()
+
+
+def test_append_record_chains_onto_the_tip():
+    bc = _chain(blocks=1)
+    record = append_record(bc.chain, {"timestamp": "now", "data": {"model": "ANN"}})
+    assert record["index"] == 1
+    assert record["previous_hash"] == bc.chain[0]["hash"]
+    assert bc.verify()
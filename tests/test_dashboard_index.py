@@ -0,0 +1,46 @@
+import json
+
+from blockchain_storage import append_record
+from dashboard_index import SUMMARY_FILE, DashboardIndex
+from ledger import LedgerLog
+
+
+def _upload(name, high):
+    return {"timestamp": "2026-10-17 10:00:00", "file": name, "total_customers": 10,
+            "high_risk": high, "medium_risk": 0, "low_risk": 10 - high,
+            "high_risk_ids": list(range(high))}
+
+
+def _pipeline():
+    return {"timestamp": "2026-10-17 09:00:00",
+            "data": {"model": "Multi Domain ANN", "dataset": "Combined", "status": "Trained"}}
+
+
+def test_counts_only_upload_records(tmp_path):
+    with LedgerLog(str(tmp_path)) as ledger:
+        index = DashboardIndex(ledger)
+        append_record(ledger, _pipeline())
+        append_record(ledger, _upload("a.csv", 2))
+        append_record(ledger, _pipeline())
+        append_record(ledger, _upload("b.csv", 3))
+
+        summary = index.refresh()
+        assert summary["height"] == 4
+        assert summary["total_uploads"] == 2
+        assert summary["cumulative"]["high_risk"] == 5
+        assert summary["latest"]["file"] == "b.csv"
+
+        # Incremental: a later pipeline record changes nothing but the height
+        append_record(ledger, _pipeline())
+        summary = index.refresh()
+        assert (summary["height"], summary["total_uploads"]) == (5, 2)
+
+
+def test_summary_of_an_older_version_is_rebuilt(tmp_path):
+    with LedgerLog(str(tmp_path)) as ledger:
+        append_record(ledger, _pipeline())
+        append_record(ledger, _upload("a.csv", 1))
+        # Written before pipeline records were told apart from uploads
+        (tmp_path / SUMMARY_FILE).write_text(json.dumps({"height": 2, "total_uploads": 2}))
+
+        assert DashboardIndex(ledger).refresh()["total_uploads"] == 1
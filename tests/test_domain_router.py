@@ -0,0 +1,24 @@
+import os
+
+import numpy as np
+
+from dataset_schema import DOMAIN_SCHEMAS
+from domain_router import DomainRouter
+from ingest import read_table
+
+UPLOADS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "uploads")
+
+
+def test_raw_and_canonical_spellings_score_the_same():
+    # uploads/telecom.csv uses the canonical names (CustomerID, Gender, Tenure)
+    canonical = read_table(os.path.join(UPLOADS_DIR, "telecom.csv")).head(200)
+    to_raw = {c: raw for raw, c in DOMAIN_SCHEMAS["Telecom"]["columns"].items() if raw != c}
+    raw = canonical.rename(columns=to_raw)
+    assert "tenure" in raw.columns and "Tenure" not in raw.columns
+
+    router = DomainRouter()
+    probs_canonical, domains_canonical = router.predict_proba(canonical)
+    probs_raw, domains_raw = router.predict_proba(raw)
+
+    assert list(domains_canonical) == list(domains_raw)
+    np.testing.assert_array_equal(probs_canonical, probs_raw)
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+import feature_selection
+from feature_selection import MutualInfoScorer
+
+
+def _frame(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    y = rng.integers(0, 2, n)
+    X = pd.DataFrame({
+        "signal": y + rng.normal(0, 0.5, n),
+        "level": (y + rng.integers(0, 3, n)).astype(float),
+        "noise": rng.normal(size=n),
+        "flag": rng.integers(0, 2, n).astype(float),
+    })
+    return X, y
+
+
+def test_process_pool_matches_in_process_scores():
+    X, y = _frame()
+    serial = MutualInfoScorer(mode="auto", n_jobs=1, cache_path=None).score(X, y)
+    parallel = MutualInfoScorer(mode="auto", n_jobs=2, cache_path=None).score(X, y)
+    np.testing.assert_allclose(parallel, serial)
+    assert serial[0] > serial[2]
+
+
+def _counting(monkeypatch):
+    scored = []
+    original = feature_selection._score_block
+
+    def score_block(X, y, kinds, seed):
+        scored.append(X.shape[1])
+        return original(X, y, kinds, seed)
+
+    monkeypatch.setattr(feature_selection, "_score_block", score_block)
+    return scored
+
+
+def test_cached_columns_are_not_rescored(tmp_path, monkeypatch):
+    scored = _counting(monkeypatch)
+    cache = str(tmp_path / "mi.json")
+    X, y = _frame()
+
+    first = MutualInfoScorer(mode="auto", n_jobs=1, cache_path=cache).score(X, y)
+    assert scored == [4]
+
+    # A new scorer reads the cache file: nothing left to score
+    again = MutualInfoScorer(mode="auto", n_jobs=1, cache_path=cache).score(X, y)
+    np.testing.assert_array_equal(again, first)
+    assert scored == [4]
+
+    # Only the changed column is scored
+    X["noise"] = X["noise"] * 2 + 1
+    MutualInfoScorer(mode="auto", n_jobs=1, cache_path=cache).score(X, y)
+    assert scored == [4, 1]
+
+
+def test_cache_is_keyed_by_target_and_settings(tmp_path, monkeypatch):
+    scored = _counting(monkeypatch)
+    cache = str(tmp_path / "mi.json")
+    X, y = _frame()
+
+    MutualInfoScorer(mode="auto", n_jobs=1, cache_path=cache).score(X, y)
+    MutualInfoScorer(mode="auto", n_jobs=1, cache_path=cache).score(X, 1 - y)
+    # "binned" shares the exact discrete scores, re-estimates the continuous ones
+    MutualInfoScorer(mode="binned", n_jobs=1, cache_path=cache).score(X, y)
+    MutualInfoScorer(mode="auto", n_jobs=1, cache_path=cache, seed=7).score(X, y)
+    assert scored == [4, 4, 2, 4]
@@ -0,0 +1,18 @@
+import pandas as pd
+import pytest
+
+from feature_transformer import build_model_input
+from model_registry import ModelRegistry
+
+
+def test_combined_set_ships_a_fitted_transformer():
+    artifacts = ModelRegistry(prefer_npz=True).get("combined")
+    assert artifacts.transformer is not None
+    assert artifacts.transformer.category_codes
+    assert set(artifacts.features) <= set(artifacts.transformer.columns)
+
+
+def test_missing_transformer_fails_loudly():
+    artifacts = ModelRegistry(prefer_npz=True).get("combined")._replace(transformer=None)
+    with pytest.raises(ValueError, match="No fitted feature transformer"):
+        build_model_input(pd.DataFrame({"Tenure": [1, 2]}), artifacts)
@@ -0,0 +1,92 @@
+import gzip
+import io
+
+import pandas as pd
+import pytest
+
+import ingest
+from ingest import inspect, iter_frames, read_header, read_table, sniff_delimiter
+
+
+FRAME = pd.DataFrame({
+    "CustomerID": ["a1", "a2", "a3", "a4", "a5"],
+    "Tenure": [1, 2, 3, 4, 5],
+    "Notes": ["x, y", "plain", "z; w", "", "q|r"],
+})
+
+
+def _csv(delimiter=","):
+    return FRAME.to_csv(index=False, sep=delimiter).encode()
+
+
+@pytest.mark.parametrize("delimiter", [",", "\t", ";", "|"])
+def test_sniffs_the_delimiter_despite_quoted_fields(delimiter):
+    lines = _csv(delimiter).decode().splitlines()
+    assert sniff_delimiter(lines) == delimiter
+
+
+def test_single_column_falls_back_to_comma():
+    assert sniff_delimiter(["Tenure", "1", "2"]) == ","
+
+
+def test_inspects_format_and_compression(tmp_path):
+    parquet = tmp_path / "data.parquet"
+    FRAME.to_parquet(parquet)
+
+    assert inspect(_csv("\t")) == {"format": "csv", "compression": None, "delimiter": "\t"}
+    assert inspect(gzip.compress(_csv(";"))) == {"format": "csv", "compression": "gzip", "delimiter": ";"}
+    assert inspect(str(parquet)) == {"format": "parquet", "compression": None, "delimiter": None}
+
+
+def test_sources_read_the_same_way(tmp_path):
+    path = tmp_path / "data.tsv.gz"
+    path.write_bytes(gzip.compress(_csv("\t")))
+    upload = io.BytesIO(_csv("\t"))
+
+    for source in (str(path), _csv("\t"), upload):
+        assert read_header(source) == list(FRAME.columns)
+        df = read_table(source, columns=lambda col: col != "Notes")
+        assert list(df.columns) == ["CustomerID", "Tenure"]
+        assert df["Tenure"].tolist() == [1, 2, 3, 4, 5]
+    # The caller's file object is left open and rewound
+    assert upload.tell() == 0
+
+
+def test_explicit_dtypes():
+    df = read_table(_csv(";"), dtypes={"Tenure": "float32", "CustomerID": "category"})
+    assert str(df["Tenure"].dtype) == "float32"
+    assert isinstance(df["CustomerID"].dtype, pd.CategoricalDtype)
+
+
+@pytest.mark.parametrize("kind", ["csv", "gzip", "parquet"])
+def test_iter_frames_streams_bounded_chunks(tmp_path, kind):
+    if kind == "parquet":
+        source = str(tmp_path / "data.parquet")
+        FRAME.to_parquet(source)
+    else:
+        source = _csv("|") if kind == "csv" else gzip.compress(_csv("|"))
+
+    chunks = list(iter_frames(source, 2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    combined = pd.concat(chunks, ignore_index=True)
+    assert combined["CustomerID"].tolist() == FRAME["CustomerID"].tolist()
+    assert combined["Notes"].fillna("").tolist() == FRAME["Notes"].tolist()
+
+    chunks = list(iter_frames(source, 10, columns=["Tenure"]))
+    assert list(chunks[0].columns) == ["Tenure"]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_late_type_change_finishes_with_pandas(monkeypatch, compress):
+    # Small read blocks: Arrow fixes Tenure as int64 long before "unknown"
+    monkeypatch.setattr(ingest, "CSV_BLOCK_BYTES", 256)
+    lines = ["ID,Tenure,Notes"] + [f'c{i},{i},"a, b"' for i in range(60)]
+    lines += ["c60,unknown,x"] + [f"c{i},{i},y" for i in range(61, 70)]
+    data = ("\n".join(lines) + "\n").encode()
+    source = gzip.compress(data) if compress else data
+
+    chunks = list(iter_frames(source, 25))
+    assert [len(chunk) for chunk in chunks] == [25, 25, 20]
+    combined = pd.concat(chunks, ignore_index=True)
+    assert combined["ID"].tolist() == [f"c{i}" for i in range(70)]
+    assert combined["Tenure"].astype(str).tolist()[59:62] == ["59", "unknown", "61"]
@@ -0,0 +1,84 @@
+import os
+import threading
+import time
+
+import pytest
+
+import results_store
+from job_queue import DONE, FAILED, RUNNING, JobQueue
+
+
+@pytest.fixture
+def jobs_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(results_store, "JOBS_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _wait(queue, job_id, states=(DONE, FAILED)):
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        status = queue.status(job_id)
+        if status and status["state"] in states:
+            return status
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def _age(folder, seconds):
+    past = time.time() - seconds
+    os.utime(folder, (past, past))
+
+
+def test_job_status_and_progress(jobs_dir):
+    queue = JobQueue(max_workers=1)
+
+    def work(job_id, progress, rows):
+        progress(rows)
+        progress(rows)
+        return {"rows": 2 * rows}
+
+    job_id = queue.submit(work, 5, file="upload.csv")
+    status = _wait(queue, job_id)
+
+    assert status["state"] == DONE
+    assert (status["chunks_done"], status["rows_done"]) == (2, 10)
+    assert status["result"] == {"rows": 10}
+    assert status["file"] == "upload.csv"
+    # Mirrored to disk: a new queue (e.g. after a restart) still knows it
+    assert JobQueue(max_workers=1).status(job_id)["state"] == DONE
+
+
+def test_failed_job_keeps_its_error(jobs_dir):
+    queue = JobQueue(max_workers=1)
+
+    def work(job_id, progress):
+        raise ValueError("bad upload")
+
+    status = _wait(queue, queue.submit(work))
+    assert status["state"] == FAILED
+    assert status["error"] == "bad upload"
+
+
+def test_cleanup_removes_only_expired_finished_jobs(jobs_dir):
+    queue = JobQueue(max_workers=1, ttl_seconds=60)
+    release = threading.Event()
+
+    old, fresh = (queue.submit(lambda job_id, progress: None) for _ in range(2))
+    for job_id in (old, fresh):
+        _wait(queue, job_id)
+    running = queue.submit(lambda job_id, progress: release.wait(10))
+    _wait(queue, running, states=(RUNNING,))
+
+    _age(jobs_dir / old, 120)
+    _age(jobs_dir / running, 120)
+
+    assert queue.cleanup() == 0          # throttled: submit() just ran it
+    assert queue.cleanup(force=True) == 1
+
+    assert not (jobs_dir / old).exists()
+    assert queue.status(old) is None
+    assert (jobs_dir / fresh).exists()
+    assert (jobs_dir / running).exists()
+
+    release.set()
+    _wait(queue, running)
@@ -0,0 +1,63 @@
+import json
+import os
+
+from ledger import INDEX_FILE, SEGMENT_TEMPLATE, LedgerLog
+
+
+def test_append_read_and_reopen(tmp_path):
+    with LedgerLog(str(tmp_path), sync_every=2) as ledger:
+        heights = [ledger.append({"n": i}) for i in range(5)]
+        assert heights == [0, 1, 2, 3, 4]
+        assert ledger.read(3) == {"n": 3}
+        assert ledger.latest() == {"n": 4}
+        assert ledger.tail(2) == [{"n": 3}, {"n": 4}]
+
+    with LedgerLog(str(tmp_path)) as ledger:
+        assert [r["n"] for r in ledger] == [0, 1, 2, 3, 4]
+        assert ledger[-1] == {"n": 4}
+
+
+def test_rolls_to_a_new_segment_when_full(tmp_path):
+    with LedgerLog(str(tmp_path), segment_bytes=64) as ledger:
+        for i in range(6):
+            ledger.append({"n": i, "pad": "x" * 20})
+        assert [r["n"] for r in ledger] == list(range(6))
+
+    segments = sorted(f for f in os.listdir(tmp_path) if f.endswith(".seg"))
+    assert len(segments) > 1
+    assert segments[0] == SEGMENT_TEMPLATE.format(0)
+
+    # Reopening appends to the newest segment
+    with LedgerLog(str(tmp_path), segment_bytes=64) as ledger:
+        assert ledger.append({"n": 6}) == 6
+        assert ledger.read(6) == {"n": 6}
+
+
+def test_recovers_torn_writes(tmp_path):
+    with LedgerLog(str(tmp_path)) as ledger:
+        for i in range(3):
+            ledger.append({"n": i})
+
+    # Lost index entry: the record is re-indexed from its segment
+    index = tmp_path / INDEX_FILE
+    index.write_bytes(index.read_bytes()[:-5])
+    # Half-written record at the segment tail: dropped
+    with open(tmp_path / SEGMENT_TEMPLATE.format(0), "ab") as f:
+        f.write(b"\x00\x00\x01\x00garbage")
+
+    with LedgerLog(str(tmp_path)) as ledger:
+        assert [r["n"] for r in ledger] == [0, 1, 2]
+        assert ledger.append({"n": 3}) == 3
+
+
+def test_migrates_legacy_json_once(tmp_path):
+    legacy = tmp_path / "ledger.json"
+    legacy.write_text(json.dumps([{"n": 0}, {"n": 1}]))
+
+    with LedgerLog(str(tmp_path / "log")) as ledger:
+        assert ledger.migrate_json(str(legacy)) == 2
+        assert ledger.migrate_json(str(legacy)) == 0
+        assert [r["n"] for r in ledger] == [0, 1]
+
+    assert not legacy.exists()
+    assert (tmp_path / "ledger.json.migrated").exists()
@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import pytest
+from tensorflow import keras
+from tensorflow.keras import layers
+
+from model_registry import ModelRegistry
+from numpy_engine import NumpyEngine, export_npz
+
+
+def _model(n_features=12):
+    keras.utils.set_random_seed(0)
+    return keras.Sequential([
+        layers.Input(shape=(n_features,)),
+        layers.Dense(16, activation="relu"),
+        layers.Dropout(0.3),
+        layers.Dense(8, activation="relu"),
+        layers.Dense(1, activation="sigmoid"),
+    ])
+
+
+def _inputs(n_features, rows=300, scale=1.0):
+    return (np.random.default_rng(1).standard_normal((rows, n_features)) * scale).astype(np.float32)
+
+
+@pytest.mark.parametrize("float16, tolerance", [(False, 1e-6), (True, 5e-3)])
+def test_exported_engine_matches_keras(tmp_path, float16, tolerance):
+    model = _model()
+    path = export_npz(model, str(tmp_path / "model.npz"), float16=float16)
+    engine = NumpyEngine.load(path)
+
+    # Large inputs drive the sigmoid into both tails
+    for scale in (1.0, 50.0):
+        X = _inputs(12, scale=scale)
+        expected = model(X, training=False).numpy().reshape(-1)
+        np.testing.assert_allclose(engine.predict_proba(X), expected, atol=tolerance)
+
+
+def test_engine_rejects_the_wrong_width(tmp_path):
+    engine = NumpyEngine.load(export_npz(_model(), str(tmp_path / "model.npz")))
+    with pytest.raises(ValueError, match="Expected 12 features"):
+        engine.predict_proba(np.zeros((2, 5), dtype=np.float32))
+
+
+@pytest.mark.parametrize("name", ["combined", "telecom"])
+def test_shipped_exports_match_their_keras_models(name):
+    keras_registry = ModelRegistry(prefer_npz=False)
+    model = keras_registry.load(keras_registry.model_file(name))
+    engine = ModelRegistry(prefer_npz=True).engine(name)
+    assert isinstance(engine, NumpyEngine)
+
+    X = _inputs(engine.n_features)
+    expected = model(X, training=False).numpy().reshape(-1)
+    np.testing.assert_allclose(engine.predict_proba(X), expected, atol=1e-5)
+
+
+def test_export_is_served_only_while_its_source_is_unchanged(tmp_path):
+    model = _model()
+    source = str(tmp_path / "demo.keras")
+    model.save(source)
+    registry = ModelRegistry(models_dir=str(tmp_path), artifact_sets={"demo": {"model": "demo.keras"}},
+                             prefer_npz=True)
+    exported = str(tmp_path / "demo.npz")
+
+    # Exports without a recorded source digest are never trusted
+    export_npz(model, exported)
+    assert registry.model_file("demo") == source
+
+    export_npz(model, exported, source_path=source)
+    assert registry.model_file("demo") == exported
+
+    # Retrained, not yet exported: the Keras file wins, whatever the mtimes
+    model.layers[0].kernel.assign(model.layers[0].kernel * 2)
+    model.save(source)
+    os.utime(source, (0, 0))
+    assert registry.model_file("demo") == source
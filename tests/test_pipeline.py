@@ -0,0 +1,75 @@
+import threading
+
+from artifact_store import ArtifactStore
+from pipeline import Pipeline, Stage
+
+
+def _pipeline(tmp_path, calls, d_param=1):
+    lock = threading.Lock()
+
+    def stage_fn(name):
+        def fn(inputs, outputs, params):
+            with lock:
+                calls.append(name)
+            text = name + "".join(str(v) for v in params.values())
+            text += "".join(open(path).read() for path in inputs)
+            with open(outputs["data"], "w") as f:
+                f.write(text)
+        return fn
+
+    source = tmp_path / "source.txt"
+    if not source.exists():
+        source.write_text("raw")
+
+    # a -> b -> c -> e, a -> d -> e
+    stages = [
+        Stage("a", stage_fn("a"), inputs=[str(source)], outputs={"data": "a.txt"}),
+        Stage("b", stage_fn("b"), inputs=[("a", "data")], outputs={"data": "b.txt"}),
+        Stage("c", stage_fn("c"), inputs=[("b", "data")], outputs={"data": "c.txt"}),
+        Stage("d", stage_fn("d"), inputs=[("a", "data")], outputs={"data": "d.txt"},
+              params={"value": d_param}),
+        Stage("e", stage_fn("e"), inputs=[("c", "data"), ("d", "data")], outputs={"data": "e.txt"}),
+    ]
+    return Pipeline(stages, store=ArtifactStore(str(tmp_path / "cache")))
+
+
+def test_runs_each_stage_after_its_dependencies(tmp_path):
+    calls = []
+    results = _pipeline(tmp_path, calls).run(max_workers=2)
+
+    assert sorted(calls) == ["a", "b", "c", "d", "e"]
+    for stage, deps in {"b": "a", "c": "b", "d": "a", "e": "cd"}.items():
+        assert all(calls.index(dep) < calls.index(stage) for dep in deps)
+    assert open(results["e"]["data"]).read() == "ecbaraw" + "d1araw"
+
+
+def test_unchanged_stages_are_skipped(tmp_path):
+    _pipeline(tmp_path, []).run()
+    calls = []
+    _pipeline(tmp_path, calls).run()
+    assert calls == []
+
+
+def test_changed_outputs_rerun_the_stages_downstream(tmp_path):
+    _pipeline(tmp_path, []).run()
+    calls = []
+    _pipeline(tmp_path, calls, d_param=2).run()
+    assert sorted(calls) == ["d", "e"]
+
+
+def test_from_forces_the_stage_and_everything_downstream(tmp_path):
+    _pipeline(tmp_path, []).run()
+    calls = []
+    _pipeline(tmp_path, calls).run(start_from="b", max_workers=1)
+    assert calls == ["b", "c", "e"]
+
+
+def test_until_runs_only_what_the_stage_needs(tmp_path):
+    calls = []
+    results = _pipeline(tmp_path, calls).run(until="c")
+    assert calls == ["a", "b", "c"]
+    assert set(results) == {"a", "b", "c"}
+
+    calls.clear()
+    _pipeline(tmp_path, calls).run(start_from="a", until="b", max_workers=1)
+    assert calls == ["a", "b"]
@@ -0,0 +1,23 @@
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from predict import predict_churn
+
+UPLOADS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "uploads")
+
+
+def test_parquet_output_with_sparse_column(tmp_path):
+    df = pd.read_csv(os.path.join(UPLOADS_DIR, "sample.csv"))
+    # Empty in the first chunk, text in the second
+    df["Notes"] = [None] * 5 + ["called back"] * (len(df) - 5)
+    source = tmp_path / "upload.csv"
+    df.to_csv(source, index=False)
+
+    output = tmp_path / "scored.parquet"
+    predict_churn(str(source), str(output), chunksize=5, route_domains=True, use_cache=False)
+
+    table = pq.read_table(output)
+    assert table.num_rows == len(df)
+    assert table.column("Notes").to_pylist()[4:6] == [None, "called back"]
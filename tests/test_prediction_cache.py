@@ -0,0 +1,83 @@
+import joblib
+import numpy as np
+
+import prediction_cache
+from model_registry import ModelRegistry
+from prediction_cache import PredictionCache, predict_cached, row_hashes
+
+
+class CountingEngine:
+    def __init__(self):
+        self.rows = 0
+
+    def predict_proba(self, X):
+        self.rows += len(X)
+        return X[:, 0].astype(np.float32) / 10
+
+
+def _cache(tmp_path, **kwargs):
+    return PredictionCache(str(tmp_path / "cache.sqlite3"), **kwargs)
+
+
+def test_row_hashes_are_stable_and_fold_negative_zero():
+    X = np.array([[0.0, 1.5], [-0.0, 1.5], [0.0, 2.5]], dtype=np.float32)
+    hashes = row_hashes(X)
+    assert hashes[0] == hashes[1] != hashes[2]
+    np.testing.assert_array_equal(row_hashes(X.copy()), hashes)
+
+
+def test_only_misses_reach_the_model(tmp_path):
+    cache, engine = _cache(tmp_path), CountingEngine()
+    X = np.arange(12, dtype=np.float32).reshape(6, 2)
+
+    first = predict_cached(engine, X, X, "combined", "fp1", cache)
+    assert engine.rows == 6
+    again = predict_cached(engine, X, X, "combined", "fp1", cache)
+    assert engine.rows == 6
+    np.testing.assert_array_equal(again, first)
+
+    more = np.vstack([X[:3], [[100.0, 1.0]]]).astype(np.float32)
+    predict_cached(engine, more, more, "combined", "fp1", cache)
+    assert engine.rows == 7
+
+
+def test_new_artifacts_invalidate_only_their_own_set(tmp_path):
+    cache = _cache(tmp_path)
+    hashes = row_hashes(np.eye(3, dtype=np.float32))
+    probs = np.array([0.1, 0.2, 0.3], dtype=np.float32)
+    cache.store("combined", "fp1", hashes, probs)
+    cache.store("telecom", "fpT", hashes, probs)
+
+    assert np.isnan(cache.lookup("combined", "fp2", hashes)).all()
+    # The old fingerprint's entries are gone, not just hidden
+    assert np.isnan(cache.lookup("combined", "fp1", hashes)).all()
+    np.testing.assert_array_equal(cache.lookup("telecom", "fpT", hashes), probs)
+
+
+def test_evicts_least_recently_used_rows(tmp_path, monkeypatch):
+    cache = _cache(tmp_path, max_rows=10)
+    clock = iter(range(100))
+    monkeypatch.setattr(prediction_cache, "_now", lambda: next(clock))
+
+    old = np.arange(0, 6, dtype=np.int64)
+    recent = np.arange(6, 12, dtype=np.int64)
+    cache.store("combined", "fp", old, np.full(6, 0.5, dtype=np.float32))
+    cache.lookup("combined", "fp", old[:2])             # touched: recently used again
+    cache.store("combined", "fp", recent, np.full(6, 0.5, dtype=np.float32))
+
+    assert cache.stats()["rows"] == 9                    # EVICT_TO of max_rows
+    survivors = ~np.isnan(cache.lookup("combined", "fp", np.arange(12, dtype=np.int64)))
+    assert survivors[:2].all() and survivors[6:].all()
+    assert survivors[2:6].sum() == 1
+
+
+def test_registry_fingerprint_follows_artifact_content(tmp_path):
+    for role in ("scaler", "features"):
+        joblib.dump([role], tmp_path / f"{role}.pkl")
+    sets = {"demo": {"scaler": "scaler.pkl", "features": "features.pkl"}}
+    registry = ModelRegistry(models_dir=str(tmp_path), artifact_sets=sets)
+
+    before = registry.get("demo").fingerprint
+    assert registry.get("demo").fingerprint == before
+    joblib.dump(["retrained scaler"], tmp_path / "scaler.pkl")
+    assert registry.get("demo").fingerprint != before
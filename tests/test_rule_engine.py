@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from rule_engine import alert_messages, retention_strategies, risk_levels
+
+
+# The per-row rules the engine replaced (app.py, predict.py, alert_system.py)
+
+def old_app_risk(prob):
+    if prob >= 0.7:
+        return "High"
+    elif prob >= 0.4:
+        return "Medium"
+    return "Low"
+
+
+def old_predict_risk(prob):
+    if prob < 0.3:
+        return "LOW"
+    elif prob < 0.7:
+        return "MEDIUM"
+    return "HIGH"
+
+
+def old_strategy(prob, row):
+    if prob >= 0.7:
+        if hasattr(row, "MonthlyCharges") and row.MonthlyCharges > 80:
+            return "Offer 25% Discount + Dedicated Support Call"
+        elif hasattr(row, "Contract") and row.Contract == "Month-to-month":
+            return "Offer 1-Year Contract Upgrade with Discount"
+        return "Immediate Retention Team Intervention"
+    elif prob >= 0.4:
+        return "Send Loyalty Points + Targeted Promotion Email"
+    return "Upsell Premium Plan + Appreciation Offer"
+
+
+def old_alert(risk, action):
+    risk_value = str(risk).lower()
+    if risk_value in ["high", "critical"]:
+        return f"⚠️ ALERT: Customer at {risk} risk. Suggested Action: {action}"
+    elif risk_value in ["medium"]:
+        return f"⚠️ CAUTION: Customer at {risk} risk. Suggested Action: {action}"
+    return f"✅ Customer at {risk} risk. No immediate action needed."
+
+
+PROBS = np.array([0.0, 0.29, 0.3, 0.39, 0.4, 0.69, 0.7, 0.85, 0.95, 1.0, 0.71, 0.75])
+
+
+def test_risk_levels_match_the_per_row_rules():
+    assert list(risk_levels(PROBS, "app")) == [old_app_risk(p) for p in PROBS]
+    assert list(risk_levels(PROBS, "predict")) == [old_predict_risk(p) for p in PROBS]
+
+
+def test_retention_strategies_match_the_per_row_rules():
+    n = len(PROBS)
+    df = pd.DataFrame({
+        "MonthlyCharges": [90, 20, np.nan, 81, 80, 100] * (n // 6),
+        "Contract": ["Month-to-month", "One year"] * (n // 2),
+    })
+    expected = [old_strategy(p, row) for p, row in zip(PROBS, df.itertuples())]
+    assert list(retention_strategies(df, PROBS)) == expected
+
+    # Rules on columns the upload lacks never fire
+    bare = pd.DataFrame({"Tenure": range(n)})
+    expected = [old_strategy(p, row) for p, row in zip(PROBS, bare.itertuples())]
+    assert list(retention_strategies(bare, PROBS)) == expected
+
+
+def test_alert_messages_match_the_per_row_rules():
+    risk = ["High", "CRITICAL", "Medium", "Low", "high", None, "Medium"]
+    action = ["Call", "Call", "Email", "Upsell", "Call", "Upsell", "Call"]
+    assert list(alert_messages(risk, action)) == [old_alert(r, a) for r, a in zip(risk, action)]
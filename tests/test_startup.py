@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from startup import lazy_import
+
+
+def test_failed_lazy_import_is_retried(tmp_path, monkeypatch):
+    module_path = tmp_path / "flaky_module.py"
+    module_path.write_text("raise RuntimeError('model missing')\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "flaky_module", raising=False)
+
+    module = lazy_import("flaky_module")
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="model missing"):
+            module.VALUE
+
+    module_path.write_text("VALUE = 42\n")
+    assert module.VALUE == 42
+
+
+def test_import_app_loads_neither_pandas_nor_pyarrow():
+    # A fresh interpreter: other tests have already imported pandas here
+    src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+    code = (
+        "import sys, app; "
+        "print(sorted(m for m in ('pandas.core', 'pyarrow') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=src, capture_output=True,
+                            text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,47 @@
+import json
+import os
+
+import numpy as np
+
+from model_registry import ARTIFACT_SETS
+from train_ann import (
+    DEFAULT_HYPERPARAMS, MODEL_NAME, artifact_paths, build_model, fit_with_checkpoints,
+    make_dataset
+)
+
+
+def _data(n_features, n=64, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, n_features)).astype(np.float32)
+    y = (X[:, 0] > 0).astype(np.float32)
+    return make_dataset(X, y, batch_size=16), X
+
+
+def _fit(tmp_path, n_features, hidden_units, key):
+    params = {**DEFAULT_HYPERPARAMS, "hidden_units": hidden_units}
+    model = build_model(n_features, params)
+    ds, X = _data(n_features)
+    fit_with_checkpoints(model, ds, ds, n_samples=len(X), checkpoint_dir=str(tmp_path),
+                         max_epochs=1, patience=1, key=key)
+    return model
+
+
+def test_checkpoints_of_another_run_are_discarded(tmp_path):
+    _fit(tmp_path, 6, (8,), key="old")
+    # An interrupted run leaves its last epoch behind
+    os.makedirs(tmp_path / "backup", exist_ok=True)
+    (tmp_path / "backup" / "marker").write_text("old run")
+
+    # Different feature count and layers: restoring the old files would fail
+    model = _fit(tmp_path, 4, (16, 8), key="new")
+
+    assert not (tmp_path / "backup" / "marker").exists()
+    assert json.loads((tmp_path / "run.json").read_text()) == {"key": "new"}
+    model.load_weights(str(tmp_path / "best.weights.h5"))
+
+
+def test_standalone_run_writes_the_served_combined_set():
+    paths = artifact_paths("models", MODEL_NAME)
+    served = ARTIFACT_SETS["combined"]
+    for role in ("model", "scaler", "features", "transformer"):
+        assert os.path.basename(paths[role]) == served[role]